@@ -18,6 +18,7 @@ import io
 import uuid
 import hashlib
 import os
+import tempfile
 import time
 import unicodedata
 from datetime import datetime, timezone
@@ -34,12 +35,16 @@ GOVERNANCE_DB_PATH = "data/velonaut_gov.db"
 ASSET_DB_PATH = "data/velonaut_ledger.db"
 LEDGER_DB_PATH = ASSET_DB_PATH  # Legacy alias für Rückwärtskompatibilität
 KEY_PATH = "data/velonaut_signing.key"
+PENDING_KEY_PATH = KEY_PATH + ".pending"  # Neuer Key während einer laufenden Rotation
+LEDGER_SEGMENT_DIR = "data/segments"  # Cold Segments versiegelter Jahre (read-only, VLA1)
+GENESIS_KEY_PATH = "data/velonaut_genesis.pub"  # Genesis Anchor (bleibt über Key-Rotationen stabil)
+LEDGER_CHECKPOINT_INTERVAL = 1000  # Jeder 1000. Block ist ein signierter CHECKPOINT (Light-Client Sync)
 
 # --- 4. SERVICE & MODULE IMPORTS ---
 from core.auth_service import AuthService
 from core.intake_service import IntakeService
 from core.engine_service import AssetEngine
-from core.commit_guard_service import CommitGuardService
+from core.commit_guard_service import CommitGuardService, SEAL_CERT_COUNT_SQL, SEAL_EXISTS_SQL
 
 # Architektur-Check: Dynamischer Import für optionale Module
 try:
@@ -59,9 +64,10 @@ def get_session_signer():
     if 'private_key' not in st.session_state:
         return None
     
-    signing_key = st.session_state['private_key']
     def signer(msg):
-        return signing_key.sign(msg).signature
+        # Key erst beim Signieren auflösen: nach einer Key-Rotation signiert
+        # auch ein früher erzeugter Signer mit dem nachgeladenen Session-Key
+        return st.session_state['private_key'].sign(msg).signature
     return signer
 
 def render_portfolio_module(ledger_instance):
@@ -129,7 +135,7 @@ def render_portfolio_module(ledger_instance):
         else:
             st.write(f"Found {len(candidates)} un-minted certificates.")
             sel_hash = st.selectbox("Select Certificate", [c['hash'] for c in candidates], format_func=lambda x: f"...{x[-8:]}")
-            if st.button("Mint Asset (PORTFOLIO_CREATE)"):
+            if st.button("Mint Asset (PORTFOLIO_CREATE)", disabled=not ledger_writable):
                 try:
                     custodian.validate_and_write_block("PORTFOLIO_CREATE", {"asset_root_hash": sel_hash}, signer)
                     st.session_state['msg_succ'] = "Asset successfully minted."
@@ -143,7 +149,7 @@ def render_portfolio_module(ledger_instance):
         if action == "Reserve":
             if open_assets:
                 t = st.selectbox("Select OPEN Asset", [r[0] for r in open_assets])
-                if st.button("Execute Reservation"):
+                if st.button("Execute Reservation", disabled=not ledger_writable):
                     try:
                         custodian.validate_and_write_block("PORTFOLIO_RESERVE", {"asset_root_hash": t, "reason": "MANUAL"}, signer)
                         st.session_state['msg_succ'] = "Reserved."
@@ -153,7 +159,7 @@ def render_portfolio_module(ledger_instance):
         elif action == "Release":
             if res_assets:
                 t = st.selectbox("Select RESERVED Asset", [r[0] for r in res_assets])
-                if st.button("Execute Release"):
+                if st.button("Execute Release", disabled=not ledger_writable):
                     try:
                         custodian.validate_and_write_block("PORTFOLIO_RELEASE", {"asset_root_hash": t, "reason": "MANUAL"}, signer)
                         st.session_state['msg_succ'] = "Released."
@@ -225,6 +231,20 @@ def generate_asset_pdf_from_block(block_record):
         ["Reporting Year", str(block_record["reporting_year"])],
         ["Engine Version", payload["calculation"]["engine_version"]]
     ]
+    # Optional: Merkle-Inklusionsbeweis (prüfbar ohne Datenbank, siehe JSON-Zwilling)
+    proof = block_record.get("inclusion_proof")
+    if proof:
+        meta_data += [
+            ["Chain Position", f"SEQ {proof['seq']} of {proof['leaf_count']}"],
+            ["MMR Root", Paragraph(proof["root"], hash_style)],
+            ["Inclusion Proof", f"{len(proof['path'])} path + {len(proof['peaks'])} peak hashes ({proof['version']})"]
+        ]
+    signed_root = block_record.get("signed_root")
+    if signed_root:
+        meta_data += [
+            ["Root Signing Key", Paragraph(signed_root["public_key"], hash_style)],
+            ["Root Signature", Paragraph(signed_root["signature"], hash_style)]
+        ]
     t1 = Table(meta_data, colWidths=[4 * cm, 11 * cm])
     t1.setStyle(TableStyle([('GRID', (0,0), (-1,-1), 0.5, colors.grey), ('BACKGROUND', (0,0), (0,-1), colors.whitesmoke)]))
     elements.append(t1)
@@ -341,9 +361,14 @@ st.markdown("""
 from core.models import Fleet, Vessel, EnergyEvent, State, StrategyMode, InsettingAsset
 from core.engine_fueleu import FuelEUEngine
 from core.engine_ets import ETSEngine
+from core.fleet_arrays import FleetArrays
+from core.engine_vector import VectorFuelEUEngine
+from core.scenarios import evaluate_scenarios
 from core.states import IsolationFirewall
 from core.additionality import AdditionalityEngine
 from core.ledger import VelonautLedger
+from core.background_verify import BackgroundVerifier
+from core.ledger_registry import LedgerRegistry
 
 # ------------------------------------------------------------
 # 🏛 INSTITUTIONAL LEDGER INITIALIZATION (SINGLE SOURCE OF TRUTH)
@@ -386,30 +411,70 @@ def load_or_create_signing_key():
             f.write(key.encode())
         return key
 
+def load_signing_key_for(chain):
+    """
+    Liefert den gespeicherten Signing Key, der die aktive Key-Epoche von chain hält:
+    KEY_PATH oder - bei unterbrochener Rotation - der neue Key in PENDING_KEY_PATH.
+    None, wenn keiner passt.
+    """
+    active_key_hex = chain.get_current_public_key()
+    for path in (KEY_PATH, PENDING_KEY_PATH):
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                key = nacl.signing.SigningKey(f.read())
+            if key.verify_key.encode(nacl.encoding.HexEncoder).decode() == active_key_hex:
+                return key
+    return None
+
+def load_or_create_genesis_anchor(signing_key):
+    """
+    Liefert den Genesis Public Key (Verifikations-Anker der Kette).
+    Nach einer Key-Rotation ist der aktive Signing Key ein anderer -
+    der Anker bleibt der Schlüssel, mit dem Genesis signiert wurde.
+    """
+    if os.path.exists(GENESIS_KEY_PATH):
+        with open(GENESIS_KEY_PATH, "r") as f:
+            return f.read().strip()
+    anchor_hex = signing_key.verify_key.encode(nacl.encoding.HexEncoder).decode()
+    with open(GENESIS_KEY_PATH, "w") as f:
+        f.write(anchor_hex)
+    return anchor_hex
+
+# --- LEDGER REGISTRY (process-wide) ---
+# Ein Ledger (eine Connection, ein Write-Lock) und eine Hintergrund-Verifikation
+# pro DB-Datei für alle Sessions dieses Prozesses - statt einer Instanz pro Session.
+@st.cache_resource
+def get_ledger_registry():
+    return LedgerRegistry()
+
+ledger_registry = get_ledger_registry()
+
 # --- LEDGER INIT & SECURITY CHECK (UPDATED RC1) ---
 if "ledger_bundle" not in st.session_state:
     try:
         # 1. Schlüssel laden oder erstellen
         signing_key = load_or_create_signing_key()
-        verify_key_hex = signing_key.verify_key.encode(nacl.encoding.HexEncoder).decode()
+        verify_key_hex = load_or_create_genesis_anchor(signing_key)
+
+        # 2. Geteilte Ledger Instanz aus der Registry (Mit RC1 Pfad)
+        # 3. GENESIS BOOTSTRAP (Block 3 Integration): die Registry prägt Genesis
+        #    genau einmal pro Prozess, auch wenn mehrere Sessions gleichzeitig starten
+        genesis_minted = []
+        def genesis_signer(msg):
+            genesis_minted.append(True)
+            return signing_key.sign(msg).signature
 
-        # 2. Ledger Instanz erstellen (Mit RC1 Pfad)
-        ledger_instance = VelonautLedger(
+        ledger_instance = ledger_registry.get_ledger(
             institution_id="VELONAUT_LABS",
             db_path=GOVERNANCE_DB_PATH, 
-            public_key_hex=verify_key_hex
+            public_key_hex=verify_key_hex,
+            genesis_signer=genesis_signer,
+            checkpoint_interval=LEDGER_CHECKPOINT_INTERVAL,
+            segment_dir=LEDGER_SEGMENT_DIR
         )
         st.session_state.verify_key_hex = verify_key_hex
 
-        # 3. GENESIS BOOTSTRAP (Block 3 Integration)
-        # Wir nutzen jetzt 'is_initialized' statt 'has_entries' (wegen neuer ledger.py)
-        if not ledger_instance.is_initialized():
-            # Lokaler Signer nur für diesen Moment
-            def genesis_signer(msg): return signing_key.sign(msg).signature
-            
-            # Der neue RC1 Befehl
-            ledger_instance.initialize_genesis(genesis_signer)
-            
+        if genesis_minted:
             # Feedback für dich beim ersten Start
             st.toast("⚓ SYSTEM GENESIS MINTED", icon="✅")
 
@@ -418,8 +483,20 @@ if "ledger_bundle" not in st.session_state:
         # Hinweis: Da initialize_genesis nun 'is_initialized' nutzt, ist dieser Check implizit sicher,
         # aber verify_integrity macht den Rest.
 
-        # 5. Integrität prüfen
-        ledger_instance.verify_integrity()
+        # 5. Fast Startup: nur der letzte signierte Checkpoint wird sofort geprüft (O(1)),
+        #    die volle Verifikation läuft im Hintergrund und speist den Integrity-Badge.
+        #    Nach Erfolg wird ein neuer Checkpoint mit dem Ledger-Key signiert persistiert.
+        #    Ein Replay pro Prozess: weitere Sessions lesen denselben Status.
+        st.session_state.ledger_anchor = ledger_instance.get_trusted_anchor()
+        #    Der Signer wählt bei jedem Checkpoint den Key der aktiven Epoche dieser Chain
+        #    (auch mitten in einer unterbrochenen Rotation); passt keiner, verwirft der
+        #    Ledger den Checkpoint statt ihn mit einem retired Key zu speichern.
+        st.session_state.ledger_verification = ledger_registry.get_verifier(
+            ledger_instance,
+            signer_func=lambda h: (
+                load_signing_key_for(ledger_instance) or load_or_create_signing_key()
+            ).sign(h).signature
+        )
         
         # Alles okay -> Bundle speichern
         st.session_state.ledger_bundle = (ledger_instance, signing_key, True, [])
@@ -431,18 +508,45 @@ if "ledger_bundle" not in st.session_state:
 # Entpacken für die Nutzung in der App
 ledger, signing_key, is_valid, chain_errors = st.session_state.ledger_bundle
 
+# Key-Rotation (auch aus einer anderen Session): der Ledger akzeptiert nur noch den
+# aktiven Key -> Session-Signer nachladen, sobald er nicht mehr passt
+if ledger is not None and signing_key is not None:
+    _active_key_hex = ledger.get_current_public_key()
+    if signing_key.verify_key.encode(nacl.encoding.HexEncoder).decode() != _active_key_hex:
+        _reloaded_key = load_signing_key_for(ledger)
+        if _reloaded_key is not None:
+            signing_key = _reloaded_key
+            st.session_state.ledger_bundle = (ledger, signing_key, is_valid, chain_errors)
+        else:
+            st.warning("SIGNER KEY OUTDATED: the stored signing key does not match the active ledger key. Writes will be rejected.")
+
+# Integritätsstatus aus der Hintergrund-Verifikation (neue Blöcke -> inkrementeller Nachlauf)
+ledger_verification = st.session_state.get("ledger_verification")
+if ledger is not None and ledger_verification is not None:
+    ledger_verification.refresh()
+    _verify_status = ledger_verification.snapshot()
+    if _verify_status["state"] == BackgroundVerifier.BREACH:
+        is_valid, chain_errors = False, [_verify_status["error"]]
+
+# Schreib-Gate: is_valid ist schon mit bestätigtem Anker True, geschrieben wird aber
+# erst, wenn die Hintergrund-Verifikation die volle Kette bestätigt hat (VERIFIED)
+ledger_writable = bool(
+    is_valid and ledger is not None and ledger_verification is not None and ledger_verification.is_trusted()
+)
+
 # certification_service requires VelonautLedger — init after ledger_bundle unpack
 
 
 # asset_ledger: zweite Chain fuer Asset-Zertifikate (Dual Chain Architektur)
 if ledger and signing_key:
-    asset_ledger = VelonautLedger(
+    asset_ledger = ledger_registry.get_ledger(
         institution_id="VELONAUT_LABS_ASSET",
         db_path=ASSET_DB_PATH,
-        public_key_hex=st.session_state.verify_key_hex
+        public_key_hex=st.session_state.verify_key_hex,
+        genesis_signer=lambda h: signing_key.sign(h).signature,
+        checkpoint_interval=LEDGER_CHECKPOINT_INTERVAL,
+        segment_dir=LEDGER_SEGMENT_DIR
     )
-    if not asset_ledger.is_initialized():
-        asset_ledger.initialize_genesis(lambda h: signing_key.sign(h).signature)
     commit_guard = CommitGuardService(ledger, asset_ledger, asset_engine, ASSET_DB_PATH)
 else:
     asset_ledger = None
@@ -576,11 +680,37 @@ with col_h1:
     st.write("**VELONAUT_LABS**")
 with col_h2:
     st.markdown("<p style='font-size: 0.7rem; color: #94a3b8; margin-bottom: 0;'>ACTIVE SIGNER KEY</p>", unsafe_allow_html=True)
-    st.code(st.session_state.verify_key_hex[:32] + "...", language=None)
-with col_h3:
-    status_color = "#3fb950" if is_valid else "#f85149"
+    # Aktiver Key = aktuelle Key-Epoche des Ledgers (nach Rotationen != Genesis-Anker)
+    active_key_hex = ledger.get_current_public_key() if ledger is not None else None
+    st.code((active_key_hex or "N/A")[:32] + "...", language=None)
+    if "verify_key_hex" in st.session_state:
+        st.caption(f"Genesis anchor: {st.session_state.verify_key_hex[:16]}...")
+# Der Badge pollt nur, solange die Verifikation läuft. Erreicht sie VERIFIED oder BREACH,
+# folgt ein App-Rerun (öffnet bzw. sperrt die Schreib-Gates), danach ohne run_every.
+_badge_polling = ledger_verification is not None and not ledger_verification.is_final()
+
+@st.fragment(run_every=2 if _badge_polling else None)
+def render_integrity_badge():
+    """Live-Badge: pollt nur den Status der Hintergrund-Verifikation, kein Replay im UI-Thread."""
+    status = ledger_verification.snapshot() if ledger_verification is not None else None
+    if _badge_polling and ledger_verification.is_final():
+        st.rerun(scope="app")
+
     st.markdown(f"<p style='font-size: 0.7rem; color: #94a3b8; margin-bottom: 0;'>INTEGRITY</p>", unsafe_allow_html=True)
-    st.markdown(f"<span style='color: {status_color}; font-weight: bold;'>{'✓ VERIFIED' if is_valid else '⚠ BREACH'}</span>", unsafe_allow_html=True)
+    if not is_valid:
+        st.markdown("<span style='color: #f85149; font-weight: bold;'>⚠ BREACH</span>", unsafe_allow_html=True)
+    elif status and status["state"] in (BackgroundVerifier.PENDING, BackgroundVerifier.RUNNING):
+        anchor = st.session_state.get("ledger_anchor")
+        st.markdown(
+            f"<span style='color: #d29922; font-weight: bold;'>◐ VERIFYING {status['verified_seq']:,}/{status['target_seq']:,}</span>",
+            unsafe_allow_html=True
+        )
+        st.caption(f"Anchor: signed checkpoint SEQ {anchor['seq']:,}" if anchor else "No signed checkpoint yet")
+    else:
+        st.markdown("<span style='color: #3fb950; font-weight: bold;'>✓ VERIFIED</span>", unsafe_allow_html=True)
+
+with col_h3:
+    render_integrity_badge()
 st.markdown("---")
 # ------------------------------------------------------------
 # 📂 DATA OPERATIONS
@@ -605,6 +735,14 @@ def load_data():
         st.error(f"🚨 Fleet load failed: {e}")
         return Fleet()
 
+def fleet_data_signature():
+    """(mtime_ns, size) von data/fleet.json als Cache-Key für daraus abgeleitete Views."""
+    try:
+        stat = os.stat('data/fleet.json')
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
 def save_data(fleet):
     output_data = []
     for v in fleet.vessels:
@@ -621,17 +759,10 @@ def save_data(fleet):
 # ------------------------------------------------------------
 # 🔍 INTEGRITY CHECK
 # ------------------------------------------------------------
-try:
-    if ledger is not None:
-        ledger.verify_integrity()
-        is_valid = True
-        chain_errors = []
-    else:
-        is_valid = False
-        chain_errors = chain_errors  # Bereits aus Bootstrap befüllt
-except Exception as e:
+# Kein Replay pro Rerun mehr: is_valid / chain_errors kommen aus dem Bootstrap
+# (signierter Checkpoint) und der Hintergrund-Verifikation (siehe oben).
+if ledger is None:
     is_valid = False
-    chain_errors = [str(e)]
 
 # ------------------------------------------------------------
 # IDENTITY & ROLE MANAGEMENT
@@ -699,8 +830,10 @@ with st.container(border=True):
 
     with col3:
         st.subheader("GOVERNANCE & TRUST")
-        if is_valid:
+        if ledger_writable:
             st.success("Ledger: Verified")
+        elif is_valid:
+            st.info("Ledger: Verifying (writes locked)")
         else:
             st.error("Ledger: BREACH")
         
@@ -708,25 +841,56 @@ with st.container(border=True):
 
         # --- DER KEY ROTATION BUTTON ---
         st.markdown("---")
-        if st.button("🔑 Rotate Signing Key", key="btn_rotate_key"):
+        if st.button("🔑 Rotate Signing Key", key="btn_rotate_key", disabled=not ledger_writable):
+            # Reihenfolge: 1. neuer Key dauerhaft in Temp-Datei (fsync), 2. beide Chains
+            # rotieren, 3. erst dann atomar nach KEY_PATH. Bricht eine Rotation ab, bleibt
+            # KEY_PATH beim alten Key; der neue liegt in .pending und der nächste Klick
+            # setzt die Rotation für die noch nicht rotierte Chain fort.
+            pending_key_path = PENDING_KEY_PATH
+            rotation_error = None
             try:
-                new_key = nacl.signing.SigningKey.generate()
+                if ledger is None:
+                    raise Exception("Ledger not initialized.")
+                if os.path.exists(pending_key_path):
+                    with open(pending_key_path, "rb") as f:
+                        new_key = nacl.signing.SigningKey(f.read())
+                else:
+                    new_key = nacl.signing.SigningKey.generate()
+                    with open(pending_key_path, "wb") as f:
+                        f.write(new_key.encode())
+                        f.flush()
+                        os.fsync(f.fileno())
                 new_pub_hex = new_key.verify_key.encode(nacl.encoding.HexEncoder).decode()
-                
-                # Der alte Key beglaubigt den neuen Key im Ledger
-                ledger.rotate_key(lambda h: signing_key.sign(h).signature, new_pub_hex)
-                
-                # Neuen Key lokal speichern
-                with open(KEY_PATH, "wb") as f:
-                    f.write(new_key.encode())
-                
+
+                # Der alte Key beglaubigt den neuen Key im Ledger (beide Chains)
+                for chain_name, chain in (("governance", ledger), ("asset", asset_ledger)):
+                    if chain is None or chain.get_current_public_key() == new_pub_hex:
+                        continue  # bereits rotiert (fortgesetzte Rotation)
+                    try:
+                        # Signer je Chain aus deren aktiver Epoche (nach Teil-Rotation hält
+                        # die Session evtl. schon den neuen Key)
+                        old_key = load_signing_key_for(chain)
+                        if old_key is None:
+                            raise Exception("no stored key holds the active key epoch")
+                        chain.rotate_key(lambda h, k=old_key: k.sign(h).signature, new_pub_hex)
+                    except Exception as e:
+                        rotation_error = f"KEY_ROTATION ABORTED on {chain_name} chain: {e}"
+                        break
+
+                if rotation_error is None:
+                    # Neuen Key atomar aktivieren
+                    os.replace(pending_key_path, KEY_PATH)
+            except Exception as e:
+                rotation_error = f"Fehler: {e}"
+
+            if rotation_error:
+                st.error(f"{rotation_error} — neuer Key bleibt in {pending_key_path}, erneut klicken zum Fortsetzen.")
+            else:
                 # Session leeren für Neustart mit neuem Key
                 del st.session_state.ledger_bundle
                 st.success("Key rotiert! Lädt neu...")
                 time.sleep(1.5)
                 st.rerun()
-            except Exception as e:
-                st.error(f"Fehler: {e}")
 
 # --- PERIOD CLOSURE & YEAR SELECTION ---
 st.sidebar.markdown("---")
@@ -804,7 +968,7 @@ with st.container(border=True):
                 *This action is irreversible and forensic.*
                 """)
                 
-                if st.button(f"✍️ Execute Binding Signature {obs['id']}", key=f"final_sign_{obs['id']}", type="primary"):
+                if st.button(f"✍️ Execute Binding Signature {obs['id']}", key=f"final_sign_{obs['id']}", type="primary", disabled=not ledger_writable):
                     payload = {
                         "meta": {
                             "observation_id": obs['id'],
@@ -1137,7 +1301,8 @@ with sqlite3.connect(LEDGER_DB_PATH) as conn:
             reviewed_by TEXT,
             reviewed_role TEXT,
             reviewed_at TEXT,
-            governance_comment TEXT
+            governance_comment TEXT,
+            reporting_year INTEGER
         )
     ''')
     
@@ -1306,15 +1471,33 @@ with tab_pool:
 st.markdown("---")
 st.write("### Debug: Engine Snapshot Calculation")
 
-# Wir testen hier hart auf 2026 für die Validierung
-test_snapshot = asset_engine.get_fleet_snapshot("2026")
+# Wir testen hier hart auf 2026 für die Validierung.
+# Nur das materialisierte Jahresaggregat (O(1)); der volle Snapshot (Report-Liste)
+# läuft im Commit Guard. Gecacht bis zum nächsten Commit auf der DB: Key ist der
+# Change-Token des Asset-Ledgers (Tip + data_version) und das Jahr.
+@st.cache_data(show_spinner=False)
+def cached_fleet_aggregate(_engine, db_path, reporting_year, change_token):
+    return _engine.get_fleet_aggregate(reporting_year)
 
-if "error" in test_snapshot:
-    st.error(f"Engine Error: {test_snapshot['error']}")
-else:
-    # Zeigt die Datenstruktur und den Fingerprint
+try:
+    if asset_ledger is not None:
+        test_snapshot = cached_fleet_aggregate(
+            asset_engine, LEDGER_DB_PATH, "2026", asset_ledger.get_change_token()
+        )
+    else:
+        test_snapshot = asset_engine.get_fleet_aggregate("2026")
+    # Zeigt die Datenstruktur und den Fingerprint-State
     st.json(test_snapshot)
-    st.info(f"Stable Fingerprint: {test_snapshot['calculation_fingerprint']}")
+    st.info(f"Aggregate Fingerprint ({test_snapshot['fingerprint_scheme']}): {test_snapshot['calculation_fingerprint']}")
+except Exception as e:
+    st.error(f"Engine Error: {e}")
+
+if st.button("Audit Aggregates (Rebuild & Compare)", key="btn_audit_aggregates"):
+    audit = asset_engine.audit_fleet_aggregates()
+    if audit["mismatches"]:
+        st.error(f"AGGREGATE DRIFT: {audit['mismatches']}")
+    else:
+        st.success(f"Aggregates consistent for {', '.join(audit['checked_years']) or 'no years'}.")
 
 
 # ==============================================================================
@@ -1371,7 +1554,9 @@ def generate_json_certificate(block_record):
         "ledger_proof": {
             "block_hash": block_record["block_hash"],
             "signature": block_record["signature"],
-            "public_key": ledger.get_genesis_public_key()
+            "public_key": ledger.get_genesis_public_key(),
+            "inclusion_proof": block_record.get("inclusion_proof"),
+            "signed_root": block_record.get("signed_root")
         },
         "full_audit_payload": payload
     }
@@ -1570,7 +1755,7 @@ else:
                     comment = st.text_input("Certification Statement", key="cert_final_gold_input", placeholder="Purpose of Issuance...")
                     
                     # --- BLOCK C: COMMIT GUARD SERVICE ---
-                    if st.button("EXECUTE INSTITUTIONAL COMMIT", type="primary", width='stretch', key="btn_execute_gold"):
+                    if st.button("EXECUTE INSTITUTIONAL COMMIT", type="primary", width='stretch', key="btn_execute_gold", disabled=not ledger_writable):
                         if not comment:
                             st.warning("Mandatory: Attestation Statement required.")
                         elif not commit_guard:
@@ -1600,6 +1785,12 @@ else:
                                     ).fetchone()
                                 new_block_hash = _row[0]
                                 new_signature  = _row[1]
+                                # O(log n) Merkle-Inklusionsbeweis gegen die Asset Chain, Root vom
+                                # aktiven Key signiert (Bank prüft ohne Datenbank: verify_proof.py)
+                                inclusion_proof = asset_ledger.get_inclusion_proof(guard_result["block_seq"])
+                                signed_root = asset_ledger.get_signed_mmr_root(
+                                    lambda h: signing_key.sign(h).signature, inclusion_proof["leaf_count"]
+                                )
                                 
                                 formatted_payload_for_pdf = {
                                     "header": {"certificate_id": new_block_hash[:12], "rules": {"target_factor": "3.0"}},
@@ -1612,7 +1803,9 @@ else:
                                     "block_hash": new_block_hash,
                                     "signature": new_signature,
                                     "reporting_year": selected_year,
-                                    "payload_json": json.dumps(formatted_payload_for_pdf)
+                                    "payload_json": json.dumps(formatted_payload_for_pdf),
+                                    "inclusion_proof": inclusion_proof,
+                                    "signed_root": signed_root
                                 }
                                 pdf_bytes = generate_asset_pdf_from_block(block_record_sim)
                                 
@@ -1624,7 +1817,14 @@ else:
                                     "payload_fingerprint": guard_result["payload_fingerprint"],
                                     "block_seq": guard_result["block_seq"],
                                     "certified_receipts_locked": guard_result["certified_receipts_locked"],
-                                    "metrics": results["metrics"]
+                                    "metrics": results["metrics"],
+                                    "ledger_proof": {
+                                        "block_hash": new_block_hash,
+                                        "signature": new_signature,
+                                        "public_key": asset_ledger.get_current_public_key(),
+                                        "inclusion_proof": inclusion_proof,
+                                        "signed_root": signed_root
+                                    }
                                 }, indent=2)
                                 st.session_state["msg_commit"] = (
                                     f"Institutional asset committed. Block SEQ: {guard_result['block_seq']} | "
@@ -1678,6 +1878,8 @@ else:
 # ------------------------------------------------------------
 fleet = load_data()
 fueleu_ui = FuelEUEngine(year=selected_year)
+# Spaltenweise Flotte (einmal pro Rerun) für die vektorisierten Engines
+fleet_arrays = FleetArrays.from_fleet(fleet)
 
 
 st.caption("Arithmetic Sovereignty | Cryptographic Signatures | SQLite Backed")
@@ -1692,8 +1894,10 @@ with st.expander("System Documentation & Quick Guide"):
 # --- LEVEL I: DATA INTEGRITY & PROOF LEVEL ---
 
 st.header("DATA INTEGRITY & PROOF LEVEL")
-if is_valid:
+if ledger_writable:
     st.success("AUTHENTICITY VERIFIED: Cryptographic signatures and chain logic are consistent.")
+elif is_valid:
+    st.info("VERIFICATION IN PROGRESS: signed checkpoint confirmed, full replay running. Ledger writes are locked until it completes.")
 else:
     st.error(f"INTEGRITY BREACH DETECTED: {chain_errors[0]}")
 
@@ -1720,7 +1924,7 @@ for v in fleet.vessels:
 # --- LEVEL III: ASSET GENERATION & VALUE LAYER ---
 
 st.header("ASSET GENERATION & VALUE LAYER")
-balance = fueleu_ui.get_compliance_balance(fleet)
+balance = float(VectorFuelEUEngine(selected_year).get_compliance_balance(fleet_arrays)[0])
 
 if balance > 0:
     report = AdditionalityEngine.calculate_surplus(balance, strategy, selected_year)
@@ -1730,7 +1934,7 @@ if balance > 0:
     market_value = Decimal(str(report.net_surplus)) * Decimal(str(eua_price))
     col_c.metric("Est. Market Value (EUA)", f"€ {market_value:,.2f}")
 
-    if st.button("GENERATE REGULATORY ASSET", width='stretch'):
+    if st.button("GENERATE REGULATORY ASSET", width='stretch', disabled=not ledger_writable):
         raw_events = []
         for e in fleet.get_all_events():
             if e.state != State.RAW:
@@ -1778,22 +1982,69 @@ if balance > 0:
 else:
     st.warning("No Surplus available for Level III.")
 
+# --- SCENARIO SENSITIVITY (Batch: Jahre x Strategie x EUA-Preis) ---
+SCENARIO_YEARS = range(2025, 2051)
+SCENARIO_EUA_PRICES = [float(p) for p in range(50, 251, 10)]
+
+# Gecacht pro Flotten-Stand: der Würfel hängt nur an data/fleet.json (nicht am Ledger),
+# Key ist deren (mtime, size) plus das Szenario-Gitter
+@st.cache_data(show_spinner=False)
+def cached_scenario_cube(_fleet_arrays, fleet_signature, years, eua_prices):
+    return evaluate_scenarios(_fleet_arrays, list(years), list(StrategyMode), list(eua_prices))
+
+with st.expander("SCENARIO SENSITIVITY (2025–2050)"):
+    scenario_start = time.perf_counter()
+    cube = cached_scenario_cube(
+        fleet_arrays, fleet_data_signature(), tuple(SCENARIO_YEARS), tuple(SCENARIO_EUA_PRICES)
+    )
+    scenario_ms = (time.perf_counter() - scenario_start) * 1000
+    st.caption(
+        f"{cube.size:,} scenarios ({len(cube.years)} years × {len(cube.modes)} strategies × "
+        f"{len(cube.eua_prices)} EUA prices) in {scenario_ms:.1f} ms | "
+        f"Fleet intensity {cube.fleet_intensity:,.2f} gCO2e/MJ"
+    )
+
+    st.write("**Tradable Net Surplus per Strategy (tCO2e)**")
+    st.line_chart(pd.DataFrame(
+        cube.net_surplus_t, index=cube.years, columns=[m.name for m in cube.modes]
+    ))
+
+    st.write(f"**Net Position (Surplus Value − ETS Cost, €) | {strategy.name}**")
+    mode_idx = cube.modes.index(strategy)
+    st.dataframe(pd.DataFrame(
+        cube.net_position_eur[:, mode_idx, :].round(0),
+        index=cube.years, columns=[f"€{p:.0f}" for p in cube.eua_prices]
+    ), width="stretch")
+
 # --- REGISTRY ---
 st.divider()
 
 # --- TEIL A: GOVERNANCE LAYER (Regierung) ---
 st.subheader("Sovereign Registry (Governance Layer)")
 
+REGISTRY_PAGE_SIZE = 25
+
+# Paginiert: nur die Blöcke der aktuellen Seite werden geladen (neueste zuerst).
+# seq ist lückenlos, daher ist Seite N ein reiner seq-Bereich (PK-Range, kein OFFSET).
+registry_entries = []
+latest_seq = 0
 if ledger is not None and is_valid:
     try:
-        all_entries = ledger.get_all_entries()
+        latest_seq = ledger.get_latest_seq()
+        page_count = max(1, -(-latest_seq // REGISTRY_PAGE_SIZE))
+        page = st.number_input(
+            f"Registry Page (1 = newest, {page_count} total)",
+            min_value=1, max_value=page_count, value=1, step=1,
+            key="registry_page"
+        )
+        to_seq = latest_seq - (page - 1) * REGISTRY_PAGE_SIZE
+        from_seq = max(1, to_seq - REGISTRY_PAGE_SIZE + 1)
+        registry_entries = list(ledger.iter_entries(from_seq, to_seq))[::-1]
     except Exception:
-        all_entries = []
-else:
-    all_entries = []
+        registry_entries = []
 
-if all_entries:
-    for entry in all_entries:
+if registry_entries:
+    for entry in registry_entries:
         payload = json.loads(entry['payload_json'])
         with st.expander(f"GOV SEQ: {entry['seq']} | Block: {entry['block_hash'][:12]}"):
             c1, c2 = st.columns([2, 1])
@@ -1888,31 +2139,39 @@ else:
 
 # --- GROSSER EXPORT BUTTON (Nachdem der Loop fertig ist) ---
 st.markdown("---")
-# WICHTIG: Wir nutzen all_entries direkt, da st.session_state["ledger_entries"] 
+# WICHTIG: Wir lesen direkt aus dem Ledger, da st.session_state["ledger_entries"] 
 # manchmal nach einem Refresh leer sein kann, die Datenbank aber die Wahrheit enthält.
-if all_entries:
-    import json
-    from datetime import datetime, timezone
-
-    full_audit_payload = {
-        "metadata": {
-            "report_type": "FULL_LEDGER_EXPORT",
-            "operator": st.session_state.get("active_user"),
-            "timestamp_utc": datetime.now(timezone.utc).isoformat(),
-            "entry_count": len(all_entries)
-        },
-        "ledger": all_entries
-    }
-    
-    st.download_button(
-        label=" Download Full Institutional Audit Trail",
-        data=json.dumps(full_audit_payload, indent=4),
-        file_name=f"velonaut_full_audit_{datetime.now().strftime('%Y%m%d')}.json",
-        mime="application/json",
-        type="primary",
-        width='stretch',
-        help="Sichert alle versiegelten Einträge in einer einzigen Datei."
-    )    
+# Die volle Kette wird nur auf Anforderung gelesen - nicht bei jedem Rerun - und
+# seitenweise als VLA1-Binärarchiv (core/archive.py) in eine Temp-Datei gestreamt.
+# Pro Session liegt höchstens ein Archiv auf der Platte: ein neuer Export löscht
+# den vorherigen (nichts sammelt sich in data/ an).
+if latest_seq:
+    if st.button("Prepare Full Institutional Audit Trail", width='stretch', key="prepare_full_audit"):
+        previous_export = st.session_state.pop("full_audit_export", None)
+        if previous_export and os.path.exists(previous_export["path"]):
+            os.remove(previous_export["path"])
+        export_fd, export_path = tempfile.mkstemp(prefix="velonaut_full_audit_", suffix=".vla")
+        os.close(export_fd)
+        export_info = ledger.export_archive(export_path)
+        export_info["file_name"] = f"velonaut_full_audit_{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.vla"
+        st.session_state["full_audit_export"] = export_info
+
+if latest_seq and os.path.exists(st.session_state.get("full_audit_export", {}).get("path", "")):
+    export_info = st.session_state["full_audit_export"]
+    st.caption(
+        f"Archive: {export_info['record_count']} blocks (SEQ {export_info['first_seq']}–{export_info['last_seq']}) | "
+        f"{export_info['bytes'] / 1024:.0f} KiB | Tip {export_info['tip_hash'][:16]}..."
+    )
+    with open(export_info["path"], "rb") as export_file:
+        st.download_button(
+            label=" Download Full Institutional Audit Trail",
+            data=export_file,
+            file_name=export_info["file_name"],
+            mime="application/octet-stream",
+            type="primary",
+            width='stretch',
+            help="Sichert alle versiegelten Einträge in einem kompakten Binärarchiv (VLA1, nach dem Export per mmap strukturell geprüft)."
+        )
 
 # ==============================================================================
 # MODULE 10: INSTITUTIONAL CUSTODY & SETTLEMENT
@@ -1981,16 +2240,8 @@ with st.expander(" INSTITUTIONAL AUDIT MONITOR", expanded=False):
 
 # --- BLOCK D: PERIOD SEAL UI ---
 with sqlite3.connect(ASSET_DB_PATH) as _conn:
-    _cert_count = _conn.execute(
-        "SELECT COUNT(*) FROM ledger_entries "
-        "WHERE block_type = 'CERTIFICATION' AND reporting_year = ?",
-        (selected_year,)
-    ).fetchone()[0]
-    _seal_exists = _conn.execute(
-        "SELECT 1 FROM ledger_entries "
-        "WHERE block_type = 'PERIOD_SEAL' AND reporting_year = ?",
-        (selected_year,)
-    ).fetchone()
+    _cert_count = _conn.execute(SEAL_CERT_COUNT_SQL, (selected_year,)).fetchone()[0]
+    _seal_exists = _conn.execute(SEAL_EXISTS_SQL, (selected_year,)).fetchone()
 
 if st.session_state.get("active_role") == "OWNER":
     st.write("---")
@@ -1998,12 +2249,27 @@ if st.session_state.get("active_role") == "OWNER":
     
     if _seal_exists:
         st.success(f"✅ Period {selected_year} is officially sealed and immutable.")
+
+        # Cold Segment: Payloads des versiegelten Jahres aus der Hot-DB auslagern
+        _segment = asset_ledger.get_segment(selected_year)
+        if _segment:
+            st.caption(
+                f"❄️ Cold segment: {_segment['block_count']} blocks (SEQ {_segment['first_seq']}–{_segment['last_seq']}), "
+                f"{_segment['bytes'] / 1024:.0f} KiB · {_segment['path']}"
+            )
+        elif st.button("ARCHIVE SEALED YEAR TO COLD SEGMENT", use_container_width=True, disabled=not ledger_writable,
+                       help="Payloads wandern in eine read-only Segmentdatei; Hashes und Signaturen bleiben im Ledger."):
+            try:
+                _segment = asset_ledger.compact_year(selected_year)
+                st.success(f"✅ {_segment['block_count']} blocks moved to {_segment['path']}")
+            except Exception as e:
+                st.error(f"Segment compaction failed: {e}")
     elif _cert_count == 0:
         st.info(f"ℹ️ No certifications found for {selected_year}. Seal will be available after first commit.")
     else:
         st.warning("⚠️ ATTENTION: A Period Seal is irreversible. It will freeze all data for this year.")
         
-        if st.button("EXECUTE PERIOD SEAL", type="primary", use_container_width=True):
+        if st.button("EXECUTE PERIOD SEAL", type="primary", use_container_width=True, disabled=not ledger_writable):
             auth_context = auth_service.get_commit_context(
                 input_pin=access_pin,
                 role=st.session_state.get("active_role"),
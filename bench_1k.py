@@ -1,32 +1,34 @@
 import os
 import time
-from core.ledger import VelonautLedger
+from core.ledger import VelonautLedger, DURABILITY_PROFILES
 import nacl.signing
 import nacl.encoding
 
 DB_FILE = "bench_1k.sqlite"
-if os.path.exists(DB_FILE): os.remove(DB_FILE)
 
 # Setup
 signing_key = nacl.signing.SigningKey.generate()
 verify_key_hex = signing_key.verify_key.encode(nacl.encoding.HexEncoder).decode()
 def simple_signer(h): return signing_key.sign(h).signature
 
-ledger = VelonautLedger("BENCH_1K", DB_FILE, verify_key_hex)
+for profile in DURABILITY_PROFILES:
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(DB_FILE + suffix): os.remove(DB_FILE + suffix)
+    ledger = VelonautLedger("BENCH_1K", DB_FILE, verify_key_hex, durability=profile)
 
-print(f"🚀 Starte Benchmark: Schreibe 1.000 Blöcke...")
-start_write = time.perf_counter()
+    print(f"🚀 [{profile}] Starte Benchmark: Schreibe 1.000 Blöcke...")
+    start_write = time.perf_counter()
 
-# Genesis + 999 Events
-ledger.add_entry("GENESIS", {"init": True}, 2026, simple_signer)
-for i in range(2, 1001):
-    ledger.add_entry("EVENT", {"index": i, "data": "Performance-Test"}, 2026, simple_signer)
+    # Genesis + 999 Events
+    ledger.initialize_genesis(simple_signer)
+    for i in range(2, 1001):
+        ledger.add_entry("EVENT", {"index": i, "data": "Performance-Test"}, 2026, simple_signer)
 
-end_write = time.perf_counter()
-write_time = end_write - start_write
+    end_write = time.perf_counter()
+    write_time = end_write - start_write
 
-print(f"✅ Schreiben beendet: {write_time:.2f} Sekunden.")
-print(f"   (Das sind ca. {write_time/1000*1000:.2f} ms pro Eintrag)")
+    print(f"✅ [{profile}] Schreiben beendet: {write_time:.2f} Sekunden.")
+    print(f"   (Das sind ca. {write_time/1000*1000:.2f} ms pro Eintrag)")
 
 print("\n🔍 Starte Integritäts-Replay (Vollständige Prüfung)...")
 start_verify = time.perf_counter()
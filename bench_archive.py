@@ -0,0 +1,49 @@
+import os
+import json
+import time
+from core.ledger import VelonautLedger
+from core import archive
+import nacl.signing
+import nacl.encoding
+
+# Full-Audit-Export: eingerücktes JSON (bisheriger Button) vs. VLA1-Binärarchiv
+DB_FILE = "bench_archive.sqlite"
+ARCHIVE_FILE = "bench_archive.vla"
+JSON_FILE = "bench_archive.json"
+BLOCKS = 10000
+
+signing_key = nacl.signing.SigningKey.generate()
+verify_key_hex = signing_key.verify_key.encode(nacl.encoding.HexEncoder).decode()
+def simple_signer(h): return signing_key.sign(h).signature
+
+for suffix in ("", "-wal", "-shm"):
+    if os.path.exists(DB_FILE + suffix): os.remove(DB_FILE + suffix)
+ledger = VelonautLedger("BENCH_ARCHIVE", DB_FILE, verify_key_hex, durability="bench")
+ledger.initialize_genesis(simple_signer)
+ledger.add_entries([
+    ("CERTIFICATION", {"vol": i % 500, "metrics": {"fuel_mt": "1234.5", "emissions_t": "3891.2"}}, 2026)
+    for i in range(BLOCKS - 1)
+], simple_signer)
+
+print(f"📦 Export von {BLOCKS} Blöcken...")
+start = time.perf_counter()
+with open(JSON_FILE, "w") as f:
+    f.write(json.dumps({"ledger": ledger.get_all_entries()}, indent=4))
+json_time = time.perf_counter() - start
+json_bytes = os.path.getsize(JSON_FILE)
+print(f"✅ JSON (indent=4)   {json_bytes / 1024:.0f} KiB in {json_time:.2f} Sekunden")
+
+start = time.perf_counter()
+info = ledger.export_archive(ARCHIVE_FILE)
+archive_time = time.perf_counter() - start
+print(f"✅ VLA1 (Archiv)     {info['bytes'] / 1024:.0f} KiB in {archive_time:.2f} Sekunden (inkl. mmap-Strukturprüfung)")
+print(f"   (Faktor Größe: {json_bytes / info['bytes']:.1f}x kleiner)")
+
+print(f"🔍 Vollprüfung (Hash, Kette, Signatur)...")
+start = time.perf_counter()
+ledger.verify_integrity(full=True)
+db_time = time.perf_counter() - start
+print(f"✅ SQLite (verify_integrity)  {BLOCKS / db_time:.0f} Blöcke/Sekunde")
+
+stats = archive.verify_archive(ARCHIVE_FILE, verify_key_hex)
+print(f"✅ VLA1 (mmap, offline)       {stats['blocks_per_second']:.0f} Blöcke/Sekunde ({stats['mib_per_second']:.1f} MiB/s)")
@@ -0,0 +1,58 @@
+import time
+import random
+import numpy as np
+from core.models import Fleet, Vessel, EnergyEvent, State
+from core.engine_fueleu import FuelEUEngine
+from core.engine_ets import ETSEngine
+from core.fleet_arrays import FleetArrays
+from core.engine_vector import VectorFuelEUEngine, VectorETSEngine
+from core.scenarios import evaluate_scenarios
+
+# Skalar-Engines (pro Jahr, pro Event) vs. vektorisierte Engines (alle Jahre in einem Durchlauf)
+VESSELS = 100_000
+EVENTS_PER_VESSEL = 4
+YEARS = list(range(2025, 2051))
+EUA_PRICES = [65.0, 85.0, 120.0]
+
+random.seed(7)
+print(f"🏗️ Erzeuge Flotte: {VESSELS:,} Schiffe x {EVENTS_PER_VESSEL} Events...")
+fleet = Fleet()
+for v in range(VESSELS):
+    vessel = Vessel(id=f"IMO{9000000 + v}", name=f"V{v}", vessel_type="Bulk")
+    for k in range(EVENTS_PER_VESSEL):
+        vessel.add_event(EnergyEvent(
+            id=f"E{v}-{k}", vessel_id=vessel.id, fuel_type="VLSFO",
+            energy_mj=random.uniform(1e5, 5e6), ghg_intensity=random.uniform(70.0, 95.0),
+            eu_scope_factor=random.choice((0.5, 1.0)), state=random.choice(list(State))
+        ))
+    fleet.vessels.append(vessel)
+
+start = time.perf_counter()
+scalar_balances = [FuelEUEngine(year=y).get_compliance_balance(fleet) for y in YEARS]
+events = fleet.get_all_events()
+scalar_costs = [[sum(ETSEngine(year=y).calculate_cost(e, p) for e in events) for p in EUA_PRICES] for y in YEARS[:2]]
+scalar_time = time.perf_counter() - start
+print(f"✅ Skalar: {len(YEARS)} Bilanzen + ETS ({2} Jahre x {len(EUA_PRICES)} Preise) in {scalar_time:.2f} Sekunden")
+
+start = time.perf_counter()
+arrays = FleetArrays.from_fleet(fleet)
+build_time = time.perf_counter() - start
+
+start = time.perf_counter()
+balances = VectorFuelEUEngine(YEARS).get_compliance_balance(arrays)
+costs = VectorETSEngine(YEARS).calculate_costs(arrays, EUA_PRICES)
+vessel_balances = VectorFuelEUEngine(YEARS).get_vessel_balances(arrays)
+vector_time = time.perf_counter() - start
+print(f"✅ Vektor: FleetArrays in {build_time:.2f} Sekunden (einmalig), "
+      f"{len(YEARS)} Bilanzen + ETS ({len(YEARS)} x {len(EUA_PRICES)}) + Pro-Schiff-Matrix "
+      f"{vessel_balances.shape} in {vector_time * 1000:.1f} ms")
+
+assert np.allclose(balances, scalar_balances, rtol=1e-9)
+assert np.allclose(costs[:2], scalar_costs, rtol=1e-9)
+assert np.allclose(vessel_balances.sum(axis=0), balances, rtol=1e-9)
+print("✅ Ergebnisse identisch (rtol 1e-9).")
+
+start = time.perf_counter()
+cube = evaluate_scenarios(arrays, YEARS, eua_prices=[float(p) for p in range(50, 251, 10)])
+cube_time = time.perf_counter() - start
+print(f"✅ Szenario-Würfel {cube.shape} ({cube.size:,} Szenarien) in {cube_time * 1000:.1f} ms")
@@ -0,0 +1,64 @@
+import os
+import time
+import asyncio
+from core.ledger import VelonautLedger
+from core.signer import ThreadPoolSigner, RemoteSignerStub
+import nacl.signing
+import nacl.encoding
+
+# Signatur-Pipeline: Inline-Signer vs. Thread-Pool vs. simuliertes HSM (Round-Trip-Latenz)
+DB_FILE = "bench_signing.sqlite"
+BLOCKS = 1000
+BATCH_SIZE = 100
+HSM_LATENCY = 0.002  # 2 ms pro Signatur-Round-Trip
+
+signing_key = nacl.signing.SigningKey.generate()
+verify_key_hex = signing_key.verify_key.encode(nacl.encoding.HexEncoder).decode()
+def simple_signer(h): return signing_key.sign(h).signature
+
+def slow_inline_signer(h):
+    # Gleiche Latenz wie RemoteSignerStub, aber blockierend im Writer
+    time.sleep(HSM_LATENCY)
+    return signing_key.sign(h).signature
+
+def fresh_ledger():
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(DB_FILE + suffix): os.remove(DB_FILE + suffix)
+    ledger = VelonautLedger("BENCH_SIGN", DB_FILE, verify_key_hex, durability="bench")
+    ledger.initialize_genesis(simple_signer)
+    return ledger
+
+def report(label, ledger, duration):
+    ledger.verify_integrity(full=True)
+    print(f"✅ {label:<34} {BLOCKS} Blöcke in {duration:.2f} Sekunden ({BLOCKS/duration:.0f} Blöcke/Sekunde), Kette lückenlos")
+
+SIGNERS = [
+    ("Inline (lokal)", lambda: simple_signer),
+    ("Thread-Pool (lokal)", lambda: ThreadPoolSigner(simple_signer)),
+    (f"Inline HSM ({HSM_LATENCY*1000:.0f} ms)", lambda: slow_inline_signer),
+    (f"Remote-Stub HSM ({HSM_LATENCY*1000:.0f} ms)", lambda: RemoteSignerStub(simple_signer, latency=HSM_LATENCY)),
+]
+
+print(f"🚀 add_entries: {BLOCKS} Blöcke in Batches à {BATCH_SIZE}...")
+for label, make_signer in SIGNERS:
+    ledger, signer = fresh_ledger(), make_signer()
+    start = time.perf_counter()
+    for offset in range(0, BLOCKS, BATCH_SIZE):
+        ledger.add_entries([("EVENT", {"index": i}, 2026) for i in range(offset, offset + BATCH_SIZE)], signer)
+    report(label, ledger, time.perf_counter() - start)
+    if hasattr(signer, "close"): signer.close()
+
+print(f"🚀 async_add_entry: {BLOCKS} gleichzeitige Coroutines...")
+async def write_all(ledger, signer):
+    return await asyncio.gather(*[
+        ledger.async_add_entry("EVENT", {"index": i}, 2026, signer) for i in range(BLOCKS)
+    ])
+
+for label, make_signer in SIGNERS:
+    ledger, signer = fresh_ledger(), make_signer()
+    start = time.perf_counter()
+    seqs = asyncio.run(write_all(ledger, signer))
+    duration = time.perf_counter() - start
+    assert seqs == sorted(seqs), "Commit-Reihenfolge verletzt"
+    report(label, ledger, duration)
+    if hasattr(signer, "close"): signer.close()
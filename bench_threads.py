@@ -1,44 +1,61 @@
 import os
 import threading
 import time
-from core.ledger import VelonautLedger
+from core.ledger import VelonautLedger, DURABILITY_PROFILES
+from core.write_queue import LedgerWriteQueue
 import nacl.signing
 import nacl.encoding
 
 DB_FILE = "bench_threads.sqlite"
-if os.path.exists(DB_FILE): os.remove(DB_FILE)
+THREADS = 5
+ENTRIES_PER_THREAD = 200
 
 signing_key = nacl.signing.SigningKey.generate()
 verify_key_hex = signing_key.verify_key.encode(nacl.encoding.HexEncoder).decode()
 def simple_signer(h): return signing_key.sign(h).signature
 
-ledger = VelonautLedger("THREAD_TEST", DB_FILE, verify_key_hex)
-ledger.add_entry("GENESIS", {"msg": "Initial"}, 2026, simple_signer)
-
-def worker(start_index):
-    # Jeder Thread bekommt seine eigene Connection zum selben Ledger-Pfad
-    # Das simuliert mehrere App-Instanzen
-    local_ledger = VelonautLedger("THREAD_TEST", DB_FILE, verify_key_hex)
-    for i in range(50):
-        local_ledger.add_entry("EVENT", {"data": f"Thread-Tx {start_index + i}"}, 2026, simple_signer)
-        ledger.add_entry("GENESIS", {"msg": "Initial"}, 2026, simple_signer)
-
-print("🚀 Starte Concurrency-Test: 5 Threads schreiben gleichzeitig...")
-threads = []
-for i in range(5):
-    t = threading.Thread(target=worker, args=(i * 100,))
-    threads.append(t)
-
-start = time.perf_counter()
-for t in threads: t.start()
-for t in threads: t.join()
-duration = time.perf_counter() - start
-
-print(f"✅ 250 parallele Einträge geschrieben in {duration:.2f} Sekunden.")
-
-print("🔍 Prüfe Ledger-Konsistenz nach dem Stress...")
-try:
-    ledger.verify_integrity()
-    print("✅ INTEGRITÄT GEPRÜFT: Keine Kollisionen, Kette ist lückenlos!")
-except Exception as e:
-    print(f"❌ FEHLER: Integrität verletzt! {e}")
\ No newline at end of file
+def fresh_ledger(durability):
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(DB_FILE + suffix): os.remove(DB_FILE + suffix)
+    ledger = VelonautLedger("THREAD_TEST", DB_FILE, verify_key_hex, durability=durability)
+    ledger.initialize_genesis(simple_signer)
+    return ledger
+
+def run_threads(worker):
+    threads = [threading.Thread(target=worker, args=(i * 1000,)) for i in range(THREADS)]
+    start = time.perf_counter()
+    for t in threads: t.start()
+    for t in threads: t.join()
+    return time.perf_counter() - start
+
+def check(ledger, label, duration):
+    total = THREADS * ENTRIES_PER_THREAD
+    try:
+        ledger.verify_integrity(full=True)
+        print(f"✅ {label:<34} {total} Einträge in {duration:.2f} Sekunden ({total/duration:.0f} Einträge/Sekunde), Kette lückenlos")
+    except Exception as e:
+        print(f"❌ {label:<34} Integrität verletzt! {e}")
+
+print(f"🚀 Concurrency-Test: {THREADS} Threads x {ENTRIES_PER_THREAD} Einträge...")
+
+# A) Jeder Thread mit eigener Connection (simuliert mehrere App-Instanzen):
+#    BEGIN IMMEDIATE serialisiert korrekt, aber jeder Eintrag zahlt Lock + Commit.
+# B) Group Commit: alle Threads submitten in eine Queue, ein Writer-Thread committet
+for profile in DURABILITY_PROFILES:
+    ledger = fresh_ledger(profile)
+    def direct_worker(start_index):
+        local_ledger = VelonautLedger("THREAD_TEST", DB_FILE, verify_key_hex, durability=profile)
+        for i in range(ENTRIES_PER_THREAD):
+            local_ledger.add_entry("EVENT", {"data": f"Thread-Tx {start_index + i}"}, 2026, simple_signer)
+    check(ledger, f"[{profile}] Direkt (1 Tx/Eintrag)", run_threads(direct_worker))
+
+    ledger = fresh_ledger(profile)
+    with LedgerWriteQueue(ledger, simple_signer) as write_queue:
+        def queued_worker(start_index):
+            futures = [
+                write_queue.submit("EVENT", {"data": f"Thread-Tx {start_index + i}"}, 2026)
+                for i in range(ENTRIES_PER_THREAD)
+            ]
+            for f in futures: f.result()
+        duration = run_threads(queued_worker)
+    check(ledger, f"[{profile}] Group Commit", duration)
@@ -0,0 +1,33 @@
+import os
+import time
+from core.ledger import VelonautLedger, _body_bytes
+import nacl.signing
+import nacl.encoding
+
+# Gleiche Kette wie bench_10k.py: Genesis + 9.999 EVENT-Blöcke
+DB_FILE = "bench_10k.sqlite"
+for suffix in ("", "-wal", "-shm"):
+    if os.path.exists(DB_FILE + suffix): os.remove(DB_FILE + suffix)
+
+signing_key = nacl.signing.SigningKey.generate()
+verify_key_hex = signing_key.verify_key.encode(nacl.encoding.HexEncoder).decode()
+def simple_signer(h): return signing_key.sign(h).signature
+
+ledger = VelonautLedger("BENCH_10K", DB_FILE, verify_key_hex)
+ledger.initialize_genesis(simple_signer)
+ledger.add_entries([("EVENT", {"index": i}, 2026) for i in range(2, 10001)], simple_signer)
+
+print("🔍 Full Replay, 10.000 Blöcke...")
+start_verify = time.perf_counter()
+ledger.verify_integrity(full=True)
+verify_time = time.perf_counter() - start_verify
+print(f"✅ verify_integrity {verify_time:.4f} Sekunden ({10000/verify_time:.0f} Blöcke/Sekunde)")
+
+# Hash-Body-Rekonstruktion: kanonischer Fast-Path vs. Legacy json.loads/json.dumps
+rows = [r for page in ledger._iter_pages() for r in page]
+legacy_rows = [r[:10] + (0,) for r in rows]
+for label, sample in (("canonical", rows), ("legacy", legacy_rows)):
+    start_body = time.perf_counter()
+    for r in sample: _body_bytes(r)
+    body_time = time.perf_counter() - start_body
+    print(f"🧱 body {label:<10} {body_time:.4f} Sekunden ({len(sample)/body_time:.0f} Blöcke/Sekunde)")
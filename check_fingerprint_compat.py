@@ -0,0 +1,111 @@
+import os
+import sys
+import json
+import sqlite3
+import hashlib
+import tempfile
+from decimal import Decimal
+from core.intake_service import IntakeService
+from core.engine_service import AssetEngine, FINGERPRINT_V1, FINGERPRINT_V2, DEFAULT_FINGERPRINT_SCHEME
+
+# Prüft, dass bestehende v1-Zertifikate (vor reporting_year / Fingerprint v2)
+# ihren calculation_fingerprint weiterhin exakt reproduzieren - auch für Reports,
+# deren reporting_period in einem anderen Jahr liegt als received_at.
+YEAR = "2026"
+
+tmp_dir = tempfile.TemporaryDirectory()
+DB_FILE = os.path.join(tmp_dir.name, "test_fingerprint_compat.sqlite")
+
+print("🏗️ Vorbereitung: Telemetrie mit Jahreswechsel-Reports (Periode 2025, Eingang 2026)...")
+IntakeService(DB_FILE)
+reports = []
+for i in range(300):
+    period_year = 2025 if i % 4 == 0 else 2026
+    received_year = 2026 if i % 5 else 2025
+    engine_input = {
+        "reporting_period": {"start": f"{period_year}-12-01", "end": f"{period_year}-12-31"},
+        "fuel_mt": round(10 + i * 0.37, 2),
+        "co2_emissions_t": round(31 + i * 1.13, 2),
+    }
+    reports.append((
+        f"R{i}", json.dumps(engine_input), f"{received_year}-01-0{1 + i % 9}T00:00:00Z",
+        hashlib.sha256(f"receipt-{i}".encode()).hexdigest(), "ELIGIBLE", period_year
+    ))
+with sqlite3.connect(DB_FILE) as conn:
+    conn.executemany(
+        "INSERT INTO telemetry_reports (report_id, engine_input, received_at, receipt_hash, status, reporting_year) "
+        "VALUES (?, ?, ?, ?, ?, ?)", reports
+    )
+conn.close()
+
+# "Gespeichertes" v1-Zertifikat: Original-Berechnung (received_at LIKE, SHA256-Kette
+# über die BINARY-sortierten receipt_hashes, Decimal-Summen aus engine_input)
+selected = sorted((r for r in reports if r[2].startswith(YEAR)), key=lambda r: r[3].encode("utf-8"))
+chain = hashlib.sha256()
+fuel, co2 = Decimal("0.0"), Decimal("0.0")
+for r in selected:
+    chain.update(r[3].encode("utf-8"))
+    data = json.loads(r[1])
+    fuel += Decimal(str(data["fuel_mt"]))
+    co2 += Decimal(str(data["co2_emissions_t"]))
+stored_certificate = {
+    "reporting_year": int(YEAR),
+    "fleet_report_count": len(selected),
+    "verified_fuel_mt": float(fuel),
+    "co2_emissions_t": float(co2),
+    "calculation_fingerprint": chain.hexdigest(),
+    "involved_receipt_hashes": sorted(r[3] for r in selected),
+}
+
+print("🔍 Rechne v1-Zertifikat über AssetEngine nach...")
+engine = AssetEngine(DB_FILE)
+snapshot = engine.get_fleet_snapshot(YEAR, fingerprint_scheme=FINGERPRINT_V1)
+checks = {
+    "fingerprint": snapshot["calculation_fingerprint"] == stored_certificate["calculation_fingerprint"],
+    "count": snapshot["count"] == stored_certificate["fleet_report_count"],
+    "fuel_mt": snapshot["verified_fuel_mt"] == stored_certificate["verified_fuel_mt"],
+    "co2_emissions_t": snapshot["co2_emissions_t"] == stored_certificate["co2_emissions_t"],
+    "reports": snapshot["involved_reports"] == [r[0] for r in selected],
+}
+
+# v2 selektiert dagegen nach reporting_year (andere Menge bei Jahreswechsel-Reports)
+v2 = engine.get_fleet_snapshot(YEAR, fingerprint_scheme=FINGERPRINT_V2)
+checks["v2 by reporting_year"] = v2["count"] == sum(1 for r in reports if r[5] == int(YEAR))
+
+# Default bleibt v1 (keine Migration nötig für implizite Aufrufer)
+checks["default scheme v1"] = (
+    DEFAULT_FINGERPRINT_SCHEME == FINGERPRINT_V1
+    and engine.get_fleet_snapshot(YEAR)["calculation_fingerprint"] == stored_certificate["calculation_fingerprint"]
+)
+
+# Prüfung gegen das gespeicherte Schema: altes Zertifikat ohne fingerprint_scheme,
+# neues v2-Zertifikat mit Feld, Zertifikat nur mit involved_reports, Manipulation
+checks["verify stored v1"] = engine.verify_certificate_fingerprint(stored_certificate)["valid"]
+v2_certificate = {
+    "reporting_year": int(YEAR),
+    "fingerprint_scheme": v2["fingerprint_scheme"],
+    "calculation_fingerprint": v2["calculation_fingerprint"],
+    "involved_receipt_hashes": sorted(r[3] for r in reports if r[5] == int(YEAR)),
+}
+checks["verify stored v2"] = engine.verify_certificate_fingerprint(v2_certificate)["valid"]
+checks["verify by involved_reports"] = engine.verify_certificate_fingerprint({
+    "reporting_year": int(YEAR),
+    "calculation_fingerprint": stored_certificate["calculation_fingerprint"],
+    "involved_reports": [r[0] for r in selected],
+})["valid"]
+checks["reject scheme mismatch"] = not engine.verify_certificate_fingerprint(
+    dict(v2_certificate, fingerprint_scheme=FINGERPRINT_V1)
+)["valid"]
+checks["reject tampered set"] = not engine.verify_certificate_fingerprint(
+    dict(stored_certificate, involved_receipt_hashes=stored_certificate["involved_receipt_hashes"][1:])
+)["valid"]
+
+tmp_dir.cleanup()
+
+failures = [name for name, ok in checks.items() if not ok]
+for name, ok in checks.items():
+    print(f"{'✅' if ok else '❌'} {name}")
+if failures:
+    print(f"❌ FEHLER: v1-Zertifikat nicht reproduzierbar ({', '.join(failures)})")
+    sys.exit(1)
+print("✅ ERFOLG: Bestehende v1-Zertifikate reproduzieren ihren Fingerprint.")
@@ -0,0 +1,84 @@
+import os
+import sys
+import sqlite3
+import tempfile
+from core.ledger import VelonautLedger
+from core.intake_service import IntakeService
+from core.engine_service import FLEET_SNAPSHOT_SQL
+from core.commit_guard_service import (
+    SEAL_UNCERTIFIED_SQL, SEAL_CERT_COUNT_SQL, SEAL_EXISTS_SQL, SEAL_LAST_CERT_HASH_SQL
+)
+import nacl.signing
+import nacl.encoding
+
+# Prüft per EXPLAIN QUERY PLAN, dass keine Hot-Query auf ledger_entries
+# auf einen Full Table Scan (oder einen temporären Sort) zurückfällt.
+# Die SQL-Texte kommen aus den Modulen, die sie ausführen (keine Kopien).
+HOT_QUERIES = {
+    # CommitGuardService.execute_period_seal (Schloss 3) + Period-Seal-Sidebar in app.py
+    "seal_cert_count": (SEAL_CERT_COUNT_SQL, (2026,)),
+    "seal_exists": (SEAL_EXISTS_SQL, (2026,)),
+    "seal_last_cert_hash": (SEAL_LAST_CERT_HASH_SQL, (2026,)),
+    # VelonautLedger.get_entry
+    "block_by_seq": (VelonautLedger._ENTRY_SQL, (2,)),
+    # VelonautLedger._get_tip
+    "chain_tip": (VelonautLedger._TIP_SQL, ()),
+    # VelonautLedger._load_key_epochs
+    "key_epochs": (VelonautLedger._KEY_EPOCHS_SQL, (0,)),
+    # VelonautLedger.iter_entries(block_type=...)
+    "typed_range": (VelonautLedger._iter_entries_sql("CERTIFICATION", 1000), (1, "CERTIFICATION", 1000, 500)),
+    # AssetEngine.get_fleet_snapshot (Range-Scan in receipt_hash-Reihenfolge, kein Sort)
+    "fleet_snapshot": (FLEET_SNAPSHOT_SQL, (2026,)),
+    # CommitGuardService.execute_period_seal (Schloss 2, Completion Check)
+    "seal_uncertified": (SEAL_UNCERTIFIED_SQL, (2026,)),
+}
+
+# Ausnahme: "SCAN" in seq-Reihenfolge (Primary Key) mit LIMIT liest nur die ersten
+# Zeilen vom Ende des B-Trees - kein Full Table Scan.
+PK_ORDERED_LIMIT = {"chain_tip"}
+
+signing_key = nacl.signing.SigningKey.generate()
+verify_key_hex = signing_key.verify_key.encode(nacl.encoding.HexEncoder).decode()
+def simple_signer(h): return signing_key.sign(h).signature
+
+print("🏗️ Vorbereitung: Erstelle Test-Ledger mit gemischten Blocktypen...")
+# Test-DB im Temp-Verzeichnis (wird am Ende entfernt, nichts bleibt im cwd liegen)
+tmp_dir = tempfile.TemporaryDirectory()
+DB_FILE = os.path.join(tmp_dir.name, "test_query_plans.sqlite")
+ledger = VelonautLedger("PLAN_TEST", DB_FILE, verify_key_hex, durability="bench")
+ledger.initialize_genesis(simple_signer)
+ledger.add_entries(
+    [("CERTIFICATION" if i % 5 == 0 else "EVENT", {"index": i}, 2025 + i % 2) for i in range(2, 2001)],
+    simple_signer
+)
+ledger.close()
+# Telemetrie-Tabelle (gleiche DB wie in app.py) mit gemischten Status/Jahren
+IntakeService(DB_FILE)
+with sqlite3.connect(DB_FILE) as conn:
+    conn.executemany(
+        "INSERT INTO telemetry_reports (report_id, received_at, receipt_hash, status, reporting_year) "
+        "VALUES (?, ?, ?, ?, ?)",
+        [(f"R{i}", "2026-01-01T00:00:00Z", f"{i:064x}", ("ELIGIBLE", "CERTIFIED", "RECEIVED")[i % 3], 2025 + i % 2)
+         for i in range(2000)]
+    )
+
+print("🔍 Prüfe Query-Pläne...")
+failures = 0
+with sqlite3.connect(DB_FILE) as conn:
+    conn.execute("ANALYZE")
+    for name, (sql, params) in HOT_QUERIES.items():
+        plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+        bad = [step for step in plan if "TEMP B-TREE" in step
+               or (step.startswith("SCAN") and name not in PK_ORDERED_LIMIT)]
+        if bad:
+            failures += 1
+            print(f"❌ {name}: {' | '.join(plan)}")
+        else:
+            print(f"✅ {name}: {' | '.join(plan)}")
+conn.close()
+tmp_dir.cleanup()
+
+if failures:
+    print(f"❌ FEHLER: {failures} Hot-Query(s) ohne Index-Zugriff!")
+    sys.exit(1)
+print("✅ ERFOLG: Alle Hot-Queries laufen über Index oder Primary Key.")
@@ -1,18 +1,20 @@
+import numpy as np
 from core.models import StrategyMode, AdditionalitySurplus
 
+# Risiko-Puffer Logik: Sicherheitsmarge je Strategie
+BUFFER_FACTORS = {
+    StrategyMode.CONSERVATIVE: 0.30,  # 30% Sicherheitsmarge
+    StrategyMode.BALANCED: 0.15,      # 15% Sicherheitsmarge
+    StrategyMode.AGRESSIVE: 0.05,     # 5% Sicherheitsmarge (Aggressive)
+}
+
 class AdditionalityEngine:
     @staticmethod
     def calculate_surplus(compliance_balance: float, mode: StrategyMode, year: int) -> AdditionalitySurplus:
         """
         Berechnet den handelbaren Überschuss basierend auf der gewählten Risikostrategie.
         """
-        # Risiko-Puffer Logik
-        if mode == StrategyMode.CONSERVATIVE:
-            buffer_factor = 0.30  # 30% Sicherheitsmarge
-        elif mode == StrategyMode.BALANCED:
-            buffer_factor = 0.15  # 15% Sicherheitsmarge
-        else:
-            buffer_factor = 0.05  # 5% Sicherheitsmarge (Aggressive)
+        buffer_factor = BUFFER_FACTORS.get(mode, BUFFER_FACTORS[StrategyMode.AGRESSIVE])
 
         gross_surplus = compliance_balance
         risk_buffer = gross_surplus * buffer_factor
@@ -23,4 +25,16 @@ class AdditionalityEngine:
             gross_surplus=float(gross_surplus),
             risk_buffer=float(risk_buffer),
             net_surplus=float(net_surplus)
-        )
\ No newline at end of file
+        )
+
+    @staticmethod
+    def calculate_surplus_batch(compliance_balances, modes):
+        """
+        Vektorisiert calculate_surplus für Bilanzen (Länge Y) x Strategien (Länge M).
+        Returns (gross, risk_buffer, net) als Arrays der Shape (Y, M) - elementweise
+        dieselben Operationen wie die Einzelberechnung.
+        """
+        gross = np.broadcast_to(np.asarray(compliance_balances, dtype=np.float64)[:, None], (len(compliance_balances), len(modes)))
+        factors = np.array([BUFFER_FACTORS.get(m, BUFFER_FACTORS[StrategyMode.AGRESSIVE]) for m in modes], dtype=np.float64)
+        risk_buffer = gross * factors
+        return gross, risk_buffer, gross - risk_buffer
\ No newline at end of file
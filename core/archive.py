@@ -0,0 +1,428 @@
+import os
+import json
+import mmap
+import time
+import struct
+import hashlib
+from binascii import hexlify
+from json.encoder import encode_basestring_ascii as _encode_str
+from core import merkle
+from core.verifier import first_invalid_signature
+
+# --- VELONAUT LEDGER ARCHIVE (VLA1) ---
+# Compact, append-only binary image of ledger_entries. Little endian.
+#
+#   Header   magic "VELOARC1" | u16 version | u16 flags | 32B genesis verify key
+#            | u16 len + institution_id (utf-8)
+#            flags bit 0 (FLAG_SPARSE): per-year segment, seqs ascending but not
+#            contiguous - records are hydrated via the ledger, not chained here
+#   Record   u32 body_len | u64 seq | i64 reporting_year
+#            | 32B prev_hash | 32B current_hash | 64B signature
+#            | u8 len block_type | u8 len timestamp_utc | u16 len institution_id
+#            | u16 len reg_hash (0xFFFF = NULL) | u32 len payload
+#            | block_type | timestamp_utc | institution_id | reg_hash | payload
+#   Footer   u32 0 | magic "VLAFOOT1" | u64 record_count | u64 first_seq | u64 last_seq
+#            | 32B anchor prev_hash (of first_seq) | 32B tip hash (of last_seq)
+#
+# Hashes and signatures are stored raw (fixed width), the payload in canonical
+# JSON - exactly the bytes inside the hashed block body. Records convert back
+# into ledger_entries row tuples, so every ledger check runs on archives as-is.
+
+MAGIC = b"VELOARC1"
+FOOTER_MAGIC = b"VLAFOOT1"
+VERSION = 1
+FLAG_SPARSE = 0x1
+
+_HEADER = struct.Struct("<8sHH32sH")
+_RECORD = struct.Struct("<IQq32s32s64sBBHHI")
+_FOOTER = struct.Struct("<I8sQQQ32s32s")
+_NULL_LEN = 0xFFFF
+
+
+class ArchiveError(Exception):
+    pass
+
+
+def _raw_hex(value, width, field, seq):
+    """Hex string -> raw bytes; must round-trip exactly (it is part of the hashed body)."""
+    try:
+        raw = bytes.fromhex(value)
+    except (TypeError, ValueError):
+        raw = None
+    if raw is None or len(raw) != width or raw.hex() != value:
+        raise ArchiveError(f"ARCHIVE_FIELD_INVALID at SEQ {seq}: {field}")
+    return raw
+
+
+def encode_record(row):
+    """ledger_entries row tuple (SELECT * order) -> record bytes."""
+    seq, institution_id, block_type, reporting_year, prev_hash, reg_hash, payload_json, current_hash, signature = row[:9]
+    timestamp_utc = row[9]
+    canonical = row[10] if len(row) > 10 else 0
+
+    if not canonical:
+        # Legacy row: re-serialize canonically (identical to the hashed payload bytes)
+        payload_json = json.dumps(json.loads(payload_json), sort_keys=True, separators=(',', ':'))
+
+    block_type_b = block_type.encode("utf-8")
+    timestamp_b = timestamp_utc.encode("utf-8")
+    institution_b = institution_id.encode("utf-8")
+    reg_b = b"" if reg_hash is None else reg_hash.encode("utf-8")
+    payload_b = payload_json.encode("utf-8")
+    if len(block_type_b) > 255 or len(timestamp_b) > 255 or len(institution_b) >= _NULL_LEN or len(reg_b) >= _NULL_LEN:
+        raise ArchiveError(f"ARCHIVE_FIELD_INVALID at SEQ {seq}: field too long")
+
+    tail = block_type_b + timestamp_b + institution_b + reg_b + payload_b
+    head = _RECORD.pack(
+        _RECORD.size - 4 + len(tail), seq, reporting_year,
+        _raw_hex(prev_hash, 32, "prev_hash", seq),
+        _raw_hex(current_hash, 32, "current_hash", seq),
+        _raw_hex(signature, 64, "signature", seq),
+        len(block_type_b), len(timestamp_b), len(institution_b),
+        _NULL_LEN if reg_hash is None else len(reg_b), len(payload_b)
+    )
+    return head + tail
+
+
+def decode_record(buf, offset):
+    """Record at offset -> (row tuple in SELECT * order, next offset)."""
+    (body_len, seq, reporting_year, prev_raw, curr_raw, sig_raw,
+     type_len, ts_len, inst_len, reg_len, payload_len) = _RECORD.unpack_from(buf, offset)
+
+    pos = offset + _RECORD.size
+    block_type = bytes(buf[pos:pos + type_len]).decode("utf-8"); pos += type_len
+    timestamp_utc = bytes(buf[pos:pos + ts_len]).decode("utf-8"); pos += ts_len
+    institution_id = bytes(buf[pos:pos + inst_len]).decode("utf-8"); pos += inst_len
+    reg_hash = None
+    if reg_len != _NULL_LEN:
+        reg_hash = bytes(buf[pos:pos + reg_len]).decode("utf-8"); pos += reg_len
+    payload_json = bytes(buf[pos:pos + payload_len]).decode("utf-8"); pos += payload_len
+
+    if pos != offset + 4 + body_len:
+        raise ArchiveError(f"ARCHIVE_CORRUPT at SEQ {seq}: record length mismatch")
+
+    row = (seq, institution_id, block_type, reporting_year, prev_raw.hex(), reg_hash,
+           payload_json, curr_raw.hex(), sig_raw.hex(), timestamp_utc, 1, None)
+    return row, pos
+
+
+class ArchiveWriter:
+    """
+    Streams records to disk. append=True reopens an existing archive, drops its
+    footer and continues after the last record (records are never rewritten).
+    sparse=True writes a segment (FLAG_SPARSE): seqs must ascend, no chain check.
+    """
+
+    def __init__(self, path, institution_id, genesis_key_hex, append=False, sparse=False):
+        self.path = path
+        self.sparse = sparse
+        self.count, self.first_seq, self.last_seq = 0, None, None
+        self.anchor_hash, self.tip_hash = None, None
+
+        if append and os.path.exists(path):
+            info = read_footer(path)
+            self._file = open(path, "r+b")
+            self._file.seek(info["footer_offset"])
+            self._file.truncate()
+            self.count, self.first_seq, self.last_seq = info["record_count"], info["first_seq"], info["last_seq"]
+            self.anchor_hash, self.tip_hash = info["anchor_hash"], info["tip_hash"]
+        else:
+            institution_b = institution_id.encode("utf-8")
+            self._file = open(path, "wb")
+            flags = FLAG_SPARSE if sparse else 0
+            self._file.write(_HEADER.pack(MAGIC, VERSION, flags, bytes.fromhex(genesis_key_hex), len(institution_b)))
+            self._file.write(institution_b)
+
+    def write_row(self, row):
+        """Appends one row; returns the record offset (random access via ArchiveReader.read_row)."""
+        if self.sparse:
+            if self.last_seq is not None and row[0] <= self.last_seq:
+                raise ArchiveError(f"ARCHIVE_GAP at SEQ {row[0]}: not after {self.last_seq}")
+        else:
+            if self.last_seq is not None and row[0] != self.last_seq + 1:
+                raise ArchiveError(f"ARCHIVE_GAP at SEQ {row[0]}: expected {self.last_seq + 1}")
+            if self.tip_hash is not None and row[4] != self.tip_hash:
+                raise ArchiveError(f"ARCHIVE_CHAIN_BREAK at SEQ {row[0]}")
+        offset = self._file.tell()
+        self._file.write(encode_record(row))
+        if self.first_seq is None:
+            self.first_seq, self.anchor_hash = row[0], row[4]
+        self.last_seq, self.tip_hash = row[0], row[7]
+        self.count += 1
+        return offset
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.write(_FOOTER.pack(
+            0, FOOTER_MAGIC, self.count, self.first_seq or 0, self.last_seq or 0,
+            bytes.fromhex(self.anchor_hash or "0" * 64), bytes.fromhex(self.tip_hash or "0" * 64)
+        ))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+
+
+def read_footer(path):
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size < _HEADER.size + _FOOTER.size:
+            raise ArchiveError("ARCHIVE_CORRUPT: file too small")
+        f.seek(size - _FOOTER.size)
+        marker, magic, count, first_seq, last_seq, anchor, tip = _FOOTER.unpack(f.read(_FOOTER.size))
+    if marker != 0 or magic != FOOTER_MAGIC:
+        raise ArchiveError("ARCHIVE_CORRUPT: footer missing (incomplete export?)")
+    return {
+        "footer_offset": size - _FOOTER.size,
+        "record_count": count,
+        "first_seq": first_seq or None,
+        "last_seq": last_seq or None,
+        "anchor_hash": anchor.hex() if count else None,
+        "tip_hash": tip.hex() if count else None
+    }
+
+
+class ArchiveReader:
+    """Memory-mapped read access; records are decoded straight from the mapping."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, flags, key_raw, inst_len = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ArchiveError("ARCHIVE_CORRUPT: not a VLA1 archive")
+        self.sparse = bool(flags & FLAG_SPARSE)
+        self.genesis_key_hex = key_raw.hex()
+        self.institution_id = bytes(self._map[_HEADER.size:_HEADER.size + inst_len]).decode("utf-8")
+        self.records_offset = _HEADER.size + inst_len
+        self.footer = read_footer(path)
+
+    def iter_rows(self):
+        offset, end = self.records_offset, self.footer["footer_offset"]
+        while offset < end:
+            try:
+                row, offset = decode_record(self._map, offset)
+            except (struct.error, UnicodeDecodeError) as e:
+                raise ArchiveError(f"ARCHIVE_CORRUPT at offset {offset}: {e}")
+            yield row
+        if offset != end:
+            raise ArchiveError("ARCHIVE_CORRUPT: record overruns footer")
+
+    def read_row(self, offset):
+        """Single record at a known offset (segment hydration)."""
+        if not self.records_offset <= offset < self.footer["footer_offset"]:
+            raise ArchiveError(f"ARCHIVE_CORRUPT: offset {offset} outside the record area")
+        try:
+            row, end = decode_record(self._map, offset)
+        except (struct.error, UnicodeDecodeError) as e:
+            raise ArchiveError(f"ARCHIVE_CORRUPT at offset {offset}: {e}")
+        if end > self.footer["footer_offset"]:
+            raise ArchiveError("ARCHIVE_CORRUPT: record overruns footer")
+        return row
+
+    def iter_pages(self, page_size=2000):
+        page = []
+        for row in self.iter_rows():
+            page.append(row)
+            if len(page) == page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def check_archive(path):
+    """
+    Structural check via mmap: header, record framing, seq continuity,
+    PrevHash linkage and footer totals. (Hashes/signatures: verify_ledger.py.)
+    Sparse segments: ascending seqs and footer totals only.
+    """
+    with ArchiveReader(path) as reader:
+        footer = reader.footer
+        count, expected_seq, expected_prev = 0, footer["first_seq"], footer["anchor_hash"]
+        for row in reader.iter_rows():
+            if reader.sparse:
+                if (count == 0 and row[0] != expected_seq) or row[0] < expected_seq:
+                    raise ArchiveError(f"ARCHIVE_GAP at SEQ {row[0]}")
+            elif row[0] != expected_seq or row[4] != expected_prev:
+                raise ArchiveError(f"ARCHIVE_CHAIN_BREAK at SEQ {row[0]}")
+            expected_seq, expected_prev = row[0] + 1, row[7]
+            count += 1
+        if count != footer["record_count"] or (count and expected_prev != footer["tip_hash"]):
+            raise ArchiveError("ARCHIVE_CORRUPT: footer does not match records")
+        return {
+            "path": path,
+            "bytes": os.path.getsize(path),
+            "record_count": count,
+            "first_seq": footer["first_seq"],
+            "last_seq": footer["last_seq"],
+            "tip_hash": footer["tip_hash"],
+            "sparse": reader.sparse
+        }
+
+
+def _json_str(raw, cache=None):
+    """utf-8 field bytes -> JSON string literal bytes (low-cardinality fields are cached)."""
+    if cache is None:
+        return _encode_str(raw.decode("utf-8")).encode("ascii")
+    encoded = cache.get(raw)
+    if encoded is None:
+        encoded = _encode_str(raw.decode("utf-8")).encode("ascii")
+        if len(cache) < 1024:
+            cache[raw] = encoded
+    return encoded
+
+
+def verify_archive(path, verify_key_hex, page_size=2000, progress=None):
+    """
+    Offline replay straight on the mapping: hash, PrevHash linkage, signature,
+    key epochs and (for archives starting at genesis) CHECKPOINT blocks.
+
+    Works on the fixed-width fields as raw bytes - hashes are compared as
+    32-byte digests, the payload goes from the mapping into SHA-256 unchanged
+    and no row tuples, hex strings or dicts are built per block. Only KEY_ROTATION / CHECKPOINT payloads are parsed.
+    progress(stats) is called after every page of page_size records.
+    """
+    started = time.perf_counter()
+
+    with ArchiveReader(path) as reader:
+        if reader.sparse:
+            raise ArchiveError("ARCHIVE_SPARSE: segment files are verified through the ledger (verify_integrity)")
+        buf, footer = reader._map, reader.footer
+        offset, end = reader.records_offset, footer["footer_offset"]
+        expected_seq = footer["first_seq"]
+        expected_prev = bytes.fromhex(footer["anchor_hash"]) if footer["record_count"] else None
+        prev_hex = hexlify(expected_prev) if expected_prev else None
+
+        # Checkpoints are only checkable with the full MMR history (archive from genesis)
+        mmr = merkle.MMRAppender(None, 0) if expected_seq == 1 else None
+        counts, cache = {}, {}
+        items, count = [], 0
+        unpack_record, record_size, sha256 = _RECORD.unpack_from, _RECORD.size, hashlib.sha256
+
+        def flush():
+            failed = first_invalid_signature(verify_key_hex, items)
+            if failed is not None:
+                raise ArchiveError(f"INVALID_SIGNATURE at SEQ {failed}")
+            items.clear()
+
+        def stats():
+            elapsed = max(time.perf_counter() - started, 1e-9)
+            consumed = offset - reader.records_offset
+            return {
+                "record_count": count,
+                "last_seq": expected_seq - 1 if count else None,
+                "seconds": elapsed,
+                "blocks_per_second": count / elapsed,
+                "mib_per_second": consumed / elapsed / 2**20
+            }
+
+        while offset < end:
+            try:
+                (body_len, seq, year, prev_raw, curr_raw, sig_raw,
+                 type_len, ts_len, inst_len, reg_len, payload_len) = unpack_record(buf, offset)
+            except struct.error as e:
+                raise ArchiveError(f"ARCHIVE_CORRUPT at offset {offset}: {e}")
+
+            # 1. Framing + Verkettung (raw 32-byte compare)
+            if seq != expected_seq:
+                raise ArchiveError(f"ARCHIVE_GAP at SEQ {seq}: expected {expected_seq}")
+            if prev_raw != expected_prev:
+                raise ArchiveError(f"CHAIN_BREAK at SEQ {seq}")
+            pos = offset + record_size
+            type_raw = buf[pos:pos + type_len]; pos += type_len + ts_len
+            inst_raw = buf[pos:pos + inst_len]; pos += inst_len
+            reg_raw = None
+            if reg_len != _NULL_LEN:
+                reg_raw = buf[pos:pos + reg_len]; pos += reg_len
+            payload = buf[pos:pos + payload_len]; pos += payload_len
+            next_offset = offset + 4 + body_len
+            if pos != next_offset or next_offset > end:
+                raise ArchiveError(f"ARCHIVE_CORRUPT at SEQ {seq}: record length mismatch")
+
+            # 2. Hash: Body-Bytes in kanonischer Schlüsselreihenfolge, direkt aus dem Mapping
+            try:
+                h = sha256(b'{"block_type":' + _json_str(type_raw, cache) +
+                           b',"institution_id":' + _json_str(inst_raw, cache) + b',"payload":')
+                reg_json = b"null" if reg_raw is None else _json_str(reg_raw)
+            except UnicodeDecodeError as e:
+                raise ArchiveError(f"ARCHIVE_CORRUPT at SEQ {seq}: {e}")
+            h.update(payload)
+            h.update(b',"prev_hash":"' + prev_hex + b'","reg_hash":' + reg_json +
+                     b',"reporting_year":%d,"seq":%d}' % (year, seq))
+            if h.digest() != curr_raw:
+                raise ArchiveError(f"HASH_MISMATCH at SEQ {seq}")
+            curr_hex = hexlify(curr_raw)
+
+            # 3. Signatur (signiert ist der Hex-Hash), gesammelt pro Seite
+            items.append((seq, curr_hex, sig_raw))
+
+            # 4. Key-Epoche / Checkpoint: nur diese Payloads werden geparst
+            if type_raw == b"KEY_ROTATION":
+                flush()
+                rotation = json.loads(payload)
+                if rotation.get("previous_verify_key") != verify_key_hex:
+                    raise ArchiveError(f"KEY_EPOCH_BROKEN at SEQ {seq}")
+                verify_key_hex = rotation["new_verify_key"]
+            elif type_raw == b"CHECKPOINT" and mmr is not None:
+                checkpoint = json.loads(payload)
+                if checkpoint.get("upto_seq") != seq - 1 or mmr.leaf_count != seq - 1:
+                    raise ArchiveError(f"CHECKPOINT_INVALID at SEQ {seq}")
+                if (checkpoint.get("mmr_peaks") != [p.hex() for p in mmr.peaks()]
+                        or checkpoint.get("mmr_root") != mmr.root().hex()):
+                    raise ArchiveError(f"CHECKPOINT_MMR_MISMATCH at SEQ {seq}")
+                if checkpoint.get("block_counts") != counts:
+                    raise ArchiveError(f"CHECKPOINT_COUNT_MISMATCH at SEQ {seq}")
+            if mmr is not None:
+                mmr.push(seq, curr_hex.decode("ascii"))
+                block_type = type_raw.decode("utf-8")
+                counts[block_type] = counts.get(block_type, 0) + 1
+
+            expected_seq, expected_prev, prev_hex = seq + 1, curr_raw, curr_hex
+            offset = next_offset
+            count += 1
+            if len(items) >= page_size:
+                flush()
+            if count % page_size == 0:
+                if mmr is not None:
+                    mmr.compact()
+                if progress:
+                    progress(stats())
+
+        flush()
+        if count != footer["record_count"] or (count and expected_prev.hex() != footer["tip_hash"]):
+            raise ArchiveError("ARCHIVE_CORRUPT: footer does not match records")
+
+        result = stats()
+    result.update({
+        "path": path,
+        "bytes": os.path.getsize(path),
+        "first_seq": footer["first_seq"],
+        "tip_hash": footer["tip_hash"],
+        "verify_key": verify_key_hex,
+        "mmr_root": mmr.root().hex() if mmr is not None else None
+    })
+    return result
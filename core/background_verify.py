@@ -0,0 +1,112 @@
+import time
+import threading
+
+
+class BackgroundVerifier:
+    """
+    Runs verify_integrity() off the UI thread and exposes its progress as a
+    status snapshot (for the integrity badge). The replay uses its own ledger
+    instance (ledger.open_reader()), i.e. its own SQLite connection - it never
+    reads inside a write transaction of the UI connection.
+
+    States: PENDING -> RUNNING -> VERIFIED | BREACH.
+    is_trusted() gates writes: only after a completed full replay.
+    """
+
+    PENDING, RUNNING, VERIFIED, BREACH = "PENDING", "RUNNING", "VERIFIED", "BREACH"
+
+    def __init__(self, ledger, signer_func=None, workers=None):
+        self._ledger = ledger
+        self._signer = signer_func
+        self._workers = workers
+        self._lock = threading.Lock()
+        self._thread = None
+        self._reader = None
+        # A full replay succeeded and no breach since (incremental re-runs keep it)
+        self._trusted = False
+        self._status = {
+            "state": self.PENDING,
+            "full": None,
+            "verified_seq": 0,
+            "target_seq": 0,
+            "blocks": 0,
+            "blocks_per_second": 0.0,
+            "error": None,
+            "started_at": None,
+            "finished_at": None,
+        }
+
+    def start(self, full=True):
+        """Starts a replay unless one is running. Returns False if already running."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return False
+            self._status.update({
+                "state": self.RUNNING, "full": full, "blocks": 0, "blocks_per_second": 0.0,
+                "target_seq": self._ledger.get_latest_seq(), "error": None,
+                "started_at": time.time(), "finished_at": None
+            })
+            self._thread = threading.Thread(
+                target=self._run, args=(full,), name="ledger-verify", daemon=True
+            )
+            self._thread.start()
+            return True
+
+    def refresh(self):
+        """Incremental re-run once new blocks were appended after a successful replay."""
+        status = self.snapshot()
+        if status["state"] == self.VERIFIED and self._ledger.get_latest_seq() > status["verified_seq"]:
+            return self.start(full=False)
+        return False
+
+    def _run(self, full):
+        def progress(blocks, last_seq, elapsed):
+            with self._lock:
+                self._status.update({
+                    "verified_seq": last_seq, "blocks": blocks,
+                    "blocks_per_second": blocks / elapsed if elapsed else 0.0
+                })
+
+        try:
+            if self._reader is None:
+                self._reader = self._ledger.open_reader()
+            self._reader.verify_integrity(
+                full=full, signer_func=self._signer, progress_callback=progress, workers=self._workers
+            )
+            anchor = self._reader.get_trusted_anchor()
+            with self._lock:
+                self._status["state"] = self.VERIFIED
+                self._status["verified_seq"] = anchor["seq"] if anchor else 0
+                if full:
+                    self._trusted = True
+        except Exception as e:
+            with self._lock:
+                self._status.update({"state": self.BREACH, "error": str(e)})
+                self._trusted = False
+        finally:
+            with self._lock:
+                self._status["finished_at"] = time.time()
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._status)
+
+    def is_trusted(self):
+        """
+        True once a full replay reached VERIFIED. PENDING and the first RUNNING
+        replay are untrusted; an incremental re-run (new blocks after a verified
+        prefix) keeps trust, a BREACH revokes it.
+        """
+        with self._lock:
+            return self._trusted and self._status["state"] != self.BREACH
+
+    def is_final(self):
+        """VERIFIED or BREACH: nothing left to poll for."""
+        with self._lock:
+            return self._status["state"] in (self.VERIFIED, self.BREACH)
+
+    def wait(self, timeout=None):
+        thread = self._thread
+        if thread:
+            thread.join(timeout)
+        return self.snapshot()
@@ -1,5 +1,6 @@
 import hashlib
 from datetime import datetime, timezone
+from core.engine_service import CERTIFICATION_FINGERPRINT_SCHEME
 
 class CertificationService:
     def __init__(self, ledger_instance, engine_instance):
@@ -13,7 +14,7 @@ class CertificationService:
         """
 
         # 1. Re-Calculation Pflicht
-        snapshot = self.engine.get_fleet_snapshot(reporting_year)
+        snapshot = self.engine.get_fleet_snapshot(reporting_year, fingerprint_scheme=CERTIFICATION_FINGERPRINT_SCHEME)
 
         if "error" in snapshot:
             return {"status": "ERROR", "message": snapshot["error"]}
@@ -36,6 +37,7 @@ class CertificationService:
             "verified_fuel_mt": snapshot["verified_fuel_mt"],
             "co2_emissions_t": snapshot["co2_emissions_t"],
             "calculation_fingerprint": snapshot["calculation_fingerprint"],
+            "fingerprint_scheme": snapshot["fingerprint_scheme"],
             "snapshot_freeze_hash": freeze_hash,
             "involved_reports": snapshot["involved_reports"],
             "certified_at_utc": datetime.now(timezone.utc).isoformat()
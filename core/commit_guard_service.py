@@ -16,6 +16,34 @@ import json
 import hashlib
 import unicodedata
 from datetime import datetime, timezone
+from core.engine_service import apply_eligibility_change, CERTIFICATION_FINGERPRINT_SCHEME
+
+# Period-Seal-Queries (execute_period_seal, Seal-Sidebar in app.py) - geteilt mit
+# check_query_plans.py, damit der EXPLAIN-Guard genau diese Queries prüft.
+# Schloss 2: zwei Index-Range-Scans über (status, reporting_year) - kein JSON pro
+# Report. reporting_year IS NULL = nicht ableitbar (Formatfehler) blockiert jeden Seal.
+SEAL_UNCERTIFIED_SQL = (
+    "SELECT report_id FROM telemetry_reports "
+    "WHERE status = 'ELIGIBLE' AND reporting_year = ? "
+    "AND receipt_hash NOT IN (SELECT receipt_hash FROM certified_receipts) "
+    "UNION ALL "
+    "SELECT report_id FROM telemetry_reports "
+    "WHERE status = 'ELIGIBLE' AND reporting_year IS NULL "
+    "AND receipt_hash NOT IN (SELECT receipt_hash FROM certified_receipts)"
+)
+SEAL_CERT_COUNT_SQL = (
+    "SELECT COUNT(*) FROM ledger_entries "
+    "WHERE block_type = 'CERTIFICATION' AND reporting_year = ?"
+)
+SEAL_EXISTS_SQL = (
+    "SELECT current_hash FROM ledger_entries "
+    "WHERE block_type = 'PERIOD_SEAL' AND reporting_year = ?"
+)
+SEAL_LAST_CERT_HASH_SQL = (
+    "SELECT current_hash FROM ledger_entries "
+    "WHERE block_type = 'CERTIFICATION' AND reporting_year = ? "
+    "ORDER BY seq DESC LIMIT 1"
+)
 
 
 class CommitGuardService:
@@ -81,7 +109,10 @@ class CommitGuardService:
         # ==================================================================
         # SCHLOSS 2 – FRESH SNAPSHOT & FREEZE HASH
         # ==================================================================
-        snapshot = self.engine.get_fleet_snapshot(str(reporting_year))
+        # Neue Zertifikate: explizites Schema, wird im Payload mitgespeichert
+        snapshot = self.engine.get_fleet_snapshot(
+            str(reporting_year), fingerprint_scheme=CERTIFICATION_FINGERPRINT_SCHEME
+        )
 
         if "error" in snapshot:
             return {
@@ -174,6 +205,7 @@ class CommitGuardService:
             "verified_fuel_mt": snapshot["verified_fuel_mt"],
             "co2_emissions_t": snapshot["co2_emissions_t"],
             "calculation_fingerprint": snapshot["calculation_fingerprint"],
+            "fingerprint_scheme": snapshot["fingerprint_scheme"],
             "snapshot_freeze_hash": freeze_hash,
             "involved_receipt_hashes": sorted(receipt_hashes),  # stabil sortiert
             "committed_at_utc": datetime.now(timezone.utc).isoformat()
@@ -223,13 +255,19 @@ class CommitGuardService:
                     [(rh, written_block_hash) for rh in receipt_hashes]
                 )
 
-                # Status auf CERTIFIED setzen
+                # Status auf CERTIFIED setzen (Reports verlassen ELIGIBLE -> Jahresaggregat fortschreiben)
                 rh_placeholders = ",".join(["?"] * len(receipt_hashes))
+                leaving_ids = [r[0] for r in conn.execute(
+                    f"SELECT report_id FROM telemetry_reports "
+                    f"WHERE status = 'ELIGIBLE' AND receipt_hash IN ({rh_placeholders})",
+                    receipt_hashes
+                ).fetchall()]
                 conn.execute(
                     f"UPDATE telemetry_reports SET status='CERTIFIED' "
                     f"WHERE receipt_hash IN ({rh_placeholders})",
                     receipt_hashes
                 )
+                apply_eligibility_change(conn, leaving_ids, -1)
                 conn.commit()
 
         except Exception as e:
@@ -248,7 +286,7 @@ class CommitGuardService:
         # POST-COMMIT INTEGRITY CHECK – BEIDE CHAINS
         # ==================================================================
         try:
-            self.asset_ledger.verify_integrity()
+            self.asset_ledger.verify_integrity(signer_func=signer_func)
         except Exception as e:
             return {
                 "status": "ERROR",
@@ -256,7 +294,7 @@ class CommitGuardService:
             }
 
         try:
-            self.gov_ledger.verify_integrity()
+            self.gov_ledger.verify_integrity(signer_func=signer_func)
         except Exception as e:
             return {
                 "status": "ERROR",
@@ -319,7 +357,7 @@ class CommitGuardService:
             res = conn.execute(query, (actor, role, now, now)).fetchone()
             return res is not None
         
-def execute_period_seal(
+    def execute_period_seal(
         self,
         reporting_year: int,
         auth_context: dict,
@@ -350,26 +388,12 @@ def execute_period_seal(
         # ==================================================================
         try:
             with sqlite3.connect(self.asset_db_path) as conn:
-                # Uncertified Reports: status ELIGIBLE und nicht in certified_receipts
-                rows = conn.execute(
-                    "SELECT report_id, engine_input, receipt_hash FROM telemetry_reports "
-                    "WHERE status = 'ELIGIBLE' "
-                    "AND receipt_hash NOT IN (SELECT receipt_hash FROM certified_receipts)"
-                ).fetchall()
-
-                year_str = str(reporting_year)
-                uncertified_in_year = []
-
-                for r_id, engine_json, r_hash in rows:
-                    try:
-                        period_start = json.loads(engine_json).get(
-                            "reporting_period", {}
-                        ).get("start", "")
-                        if period_start.startswith(year_str):
-                            uncertified_in_year.append(r_id)
-                    except Exception:
-                        # Im Zweifel (Formatfehler) blockieren wir zur Sicherheit
-                        uncertified_in_year.append(r_id)
+                # Uncertified Reports: status ELIGIBLE und nicht in certified_receipts.
+                # reporting_year IS NULL (nicht ableitbar): im Zweifel blockieren wir
+                # zur Sicherheit jeden Seal.
+                uncertified_in_year = [r[0] for r in conn.execute(
+                    SEAL_UNCERTIFIED_SQL, (int(reporting_year),)
+                )]
 
                 if uncertified_in_year:
                     return {
@@ -388,11 +412,7 @@ def execute_period_seal(
         try:
             with sqlite3.connect(self.asset_db_path) as conn:
                 # Prüfen, ob mindestens eine Zertifizierung existiert
-                cert_count = conn.execute(
-                    "SELECT COUNT(*) FROM ledger_entries "
-                    "WHERE block_type = 'CERTIFICATION' AND reporting_year = ?",
-                    (reporting_year,)
-                ).fetchone()[0]
+                cert_count = conn.execute(SEAL_CERT_COUNT_SQL, (reporting_year,)).fetchone()[0]
 
                 if cert_count == 0:
                     return {
@@ -401,11 +421,7 @@ def execute_period_seal(
                     }
 
                 # Idempotenz: Ist bereits ein Siegel vorhanden?
-                existing_seal = conn.execute(
-                    "SELECT current_hash FROM ledger_entries "
-                    "WHERE block_type = 'PERIOD_SEAL' AND reporting_year = ?",
-                    (reporting_year,)
-                ).fetchone()
+                existing_seal = conn.execute(SEAL_EXISTS_SQL, (reporting_year,)).fetchone()
 
                 if existing_seal:
                     return {
@@ -414,12 +430,7 @@ def execute_period_seal(
                     }
 
                 # Den Hash der letzten Zertifizierung für das spätere Freeze-Binding holen
-                last_cert_hash = conn.execute(
-                    "SELECT current_hash FROM ledger_entries "
-                    "WHERE block_type = 'CERTIFICATION' AND reporting_year = ? "
-                    "ORDER BY seq DESC LIMIT 1",
-                    (reporting_year,)
-                ).fetchone()[0]
+                last_cert_hash = conn.execute(SEAL_LAST_CERT_HASH_SQL, (reporting_year,)).fetchone()[0]
 
         except Exception as e:
             return {"status": "ERROR", "message": f"DB_ERROR in certification check: {str(e)}"}
@@ -478,12 +489,12 @@ def execute_period_seal(
 
         # Sofortige forensische Verifizierung beider Chains
         try:
-            self.asset_ledger.verify_integrity()
+            self.asset_ledger.verify_integrity(signer_func=signer_func)
         except Exception as e:
             return {"status": "ERROR", "message": f"ASSET_CHAIN_INTEGRITY_FAILURE after seal: {str(e)}"}
 
         try:
-            self.gov_ledger.verify_integrity()
+            self.gov_ledger.verify_integrity(signer_func=signer_func)
         except Exception as e:
             return {"status": "ERROR", "message": f"GOV_CHAIN_INTEGRITY_FAILURE after seal: {str(e)}"}
 
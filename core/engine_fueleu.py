@@ -34,18 +34,25 @@ class FuelEUEngine:
             y: _resolve_target(y) for y in range(2020, 2051)
         }
 
+    @staticmethod
+    def _fleet_totals(fleet: Fleet):
+        # Ein Durchlauf über die Events: (Energie MJ, Emissionen g)
+        total_energy = 0.0
+        total_emissions_g = 0.0
+        for e in fleet.get_all_events():
+            total_energy += e.energy_mj
+            total_emissions_g += e.energy_mj * e.ghg_intensity
+        return total_energy, total_emissions_g
+
     def calculate_fleet_intensity(self, fleet: Fleet) -> float:
-        events = fleet.get_all_events()
-        if not events:
+        total_energy, total_emissions_g = self._fleet_totals(fleet)
+        if not total_energy:
             return 0.0
-        total_energy = sum(e.energy_mj for e in events)
-        total_emissions_g = sum((e.energy_mj * e.ghg_intensity) for e in events)
         return total_emissions_g / total_energy
 
     def get_compliance_balance(self, fleet: Fleet) -> float:
         target = _resolve_target(self.year)
-        actual_intensity = self.calculate_fleet_intensity(fleet)
-        events = fleet.get_all_events()
-        total_energy = sum(e.energy_mj for e in events)
+        total_energy, total_emissions_g = self._fleet_totals(fleet)
+        actual_intensity = total_emissions_g / total_energy if total_energy else 0.0
         balance_g = (target - actual_intensity) * total_energy
         return balance_g / 1_000_000
\ No newline at end of file
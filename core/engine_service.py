@@ -2,66 +2,488 @@ import sqlite3
 import json
 import hashlib
 from decimal import Decimal
+from datetime import datetime, timezone
+
+# ------------------------------------------------------------------------------
+# FLEET YEAR AGGREGATES (materialisiert)
+# Pro Jahr: Anzahl, Decimal-Summen (als TEXT, exakt) und ein rollierender
+# Fingerprint-State der ELIGIBLE Reports. Jeder Statuswechsel nach/aus ELIGIBLE
+# ruft apply_eligibility_change() in DERSELBEN Transaktion auf (Intake, Review,
+# Commit Guard). Der State ist eine Multiset-Summe (mod 2^256) über
+# H(receipt_hash) - reihenfolgeunabhängig, daher inkrementell add/remove-fähig.
+# Er dient nur als Drift-Prüfsumme (billig, aber nicht kollisionsresistent).
+# audit_fleet_aggregates() rechnet alles aus telemetry_reports nach.
+# ------------------------------------------------------------------------------
+_FP_MODULUS = 2 ** 256
+_FP_DOMAIN = b"VELONAUT-FLEET-FP|"
+
+
+def _fp_term(receipt_hash: str) -> int:
+    return int.from_bytes(hashlib.sha256(_FP_DOMAIN + receipt_hash.encode("utf-8")).digest(), "big")
+
+
+# ------------------------------------------------------------------------------
+# CALCULATION FINGERPRINT (versioniert)
+# v1 (Legacy, bestehende Zertifikate): SHA256 über alle receipt_hashes in
+#     BINARY-Sortierung - erfordert Sortieren + Rehash der ganzen Menge.
+# v2: MSet-Mu-Hash (Bellare/Micciancio) - Produkt von H(receipt_hash) in der
+#     Untergruppe der Quadrate mod p (RFC 3526, 2048-bit MODP). Reihenfolge-
+#     unabhängig, pro Add/Remove O(1) fortschreibbar (Remove = Inverses),
+#     kollisionsresistent unter der DL-Annahme. Der Zustand liegt im
+#     Jahresaggregat; Fingerprint = "v2:" + SHA256(Domain|Jahr|Anzahl|State).
+# Das Präfix macht das Schema am Fingerprint selbst erkennbar (und bindet es in
+# den Freeze-Hash); v1-Fingerprints sind reines Hex ohne Präfix.
+# Default bleibt v1 (Aufrufer ohne explizites Schema rechnen wie bisher); neue
+# Zertifikate nutzen CERTIFICATION_FINGERPRINT_SCHEME und speichern das Schema im
+# Payload (fingerprint_scheme). Geprüft wird immer gegen das gespeicherte Schema:
+# AssetEngine.verify_certificate_fingerprint().
+# ------------------------------------------------------------------------------
+FINGERPRINT_V1 = "v1"
+FINGERPRINT_V2 = "v2"
+DEFAULT_FINGERPRINT_SCHEME = FINGERPRINT_V1
+CERTIFICATION_FINGERPRINT_SCHEME = FINGERPRINT_V2
+
+_MSET_PRIME = int(
+    "FFFFFFFFFFFFFFFFC90FDAA22168C234C4C6628B80DC1CD129024E088A67CC74"
+    "020BBEA63B139B22514A08798E3404DDEF9519B3CD3A431B302B0A6DF25F1437"
+    "4FE1356D6D51C245E485B576625E7EC6F44C42E9A637ED6B0BFF5CB6F406B7ED"
+    "EE386BFB5A899FA5AE9F24117C4B1FE649286651ECE45B3DC2007CB8A163BF05"
+    "98DA48361C55D39A69163FA8FD24CF5F83655D23DCA3AD961C62F356208552BB"
+    "9ED529077096966D670C354E4ABC9804F1746C08CA18217C32905E462E36CE3B"
+    "E39E772C180E86039B2783A2EC07A28FB5C55DF06F4C52C9DE2BCBF695581718"
+    "3995497CEA956AE515D2261898FA051015728E5A8AACAA68FFFFFFFFFFFFFFFF", 16)
+_MSET_BYTES = 256
+_MSET_DOMAIN = b"VELONAUT-FLEET-MSET-v2|"
+_FP_V2_DOMAIN = b"VELONAUT-FLEET-FP-v2|"
+
+
+def _mset_term(receipt_hash: str) -> int:
+    # 16 Byte Überhang gegen Modulo-Bias, Quadrieren -> Untergruppe primer Ordnung
+    x = int.from_bytes(
+        hashlib.shake_256(_MSET_DOMAIN + receipt_hash.encode("utf-8")).digest(_MSET_BYTES + 16), "big"
+    ) % _MSET_PRIME
+    return x * x % _MSET_PRIME
+
+
+def _mset_product(receipt_hashes) -> int:
+    state = 1
+    for receipt_hash in receipt_hashes:
+        state = state * _mset_term(receipt_hash) % _MSET_PRIME
+    return state
+
+
+def _fingerprint_v2(reporting_year: str, count: int, mset_state: int) -> str:
+    digest = hashlib.sha256(
+        _FP_V2_DOMAIN + f"{reporting_year}|{count}|".encode("utf-8")
+        + mset_state.to_bytes(_MSET_BYTES, "big")
+    ).hexdigest()
+    return f"{FINGERPRINT_V2}:{digest}"
+
+
+def fleet_fingerprint(receipt_hashes: list, reporting_year: str, scheme: str = DEFAULT_FINGERPRINT_SCHEME) -> str:
+    """
+    Referenzberechnung aus einer receipt_hash-Liste (z.B. involved_receipt_hashes
+    eines Zertifikats), unabhängig von der DB. Für bestehende Zertifikate ist das
+    Schema am Fingerprint ablesbar: fingerprint_scheme_of().
+    """
+    if scheme == FINGERPRINT_V1:
+        hash_accumulator = hashlib.sha256()
+        for receipt_hash in sorted(receipt_hashes):
+            hash_accumulator.update(receipt_hash.encode("utf-8"))
+        return hash_accumulator.hexdigest()
+    if scheme == FINGERPRINT_V2:
+        return _fingerprint_v2(str(reporting_year), len(receipt_hashes), _mset_product(receipt_hashes))
+    raise ValueError(f"FINGERPRINT_SCHEME_UNKNOWN: {scheme}")
+
+
+def fingerprint_scheme_of(calculation_fingerprint: str) -> str:
+    return calculation_fingerprint.split(":", 1)[0] if ":" in calculation_fingerprint else FINGERPRINT_V1
+
+
+def derive_reporting_year(engine_json: str, received_at: str):
+    """
+    Berichtsjahr eines Reports (telemetry_reports.reporting_year): Jahr aus
+    engine_input.reporting_period.start, ohne Periode das Jahr von received_at.
+    None, wenn nicht ableitbar (Formatfehler) - solche Reports blockieren jeden Seal.
+    """
+    if engine_json:
+        try:
+            period = json.loads(engine_json).get("reporting_period") or {}
+            start = str(period.get("start") or "")
+        except Exception:
+            return None
+        if start:
+            return int(start[:4]) if start[:4].isdigit() else None
+    stamp = (received_at or "")[:4]
+    return int(stamp) if stamp.isdigit() else None
+
+
+def ensure_reporting_year(conn):
+    """
+    Idempotente Migration: Spalte telemetry_reports.reporting_year (einmaliger
+    Backfill, einmal json.loads pro Bestandszeile) und Index
+    (status, reporting_year, receipt_hash) - Snapshot und Seal-Completion-Check
+    werden damit Index-Range-Scans ohne JSON. report_id hängt als letzte Spalte
+    mit drin (covering für den Snapshot).
+    Beim Backfill wird fleet_year_aggregates verworfen (bisher nach received_at
+    geschlüsselt) und von ensure_fleet_aggregates() neu aufgebaut.
+    """
+    columns = [info[1] for info in conn.execute("PRAGMA table_info(telemetry_reports)").fetchall()]
+    if not columns:
+        return
+    if "reporting_year" not in columns:
+        conn.execute("ALTER TABLE telemetry_reports ADD COLUMN reporting_year INTEGER")
+        rows = conn.execute("SELECT report_id, engine_input, received_at FROM telemetry_reports").fetchall()
+        conn.executemany(
+            "UPDATE telemetry_reports SET reporting_year = ? WHERE report_id = ?",
+            [(derive_reporting_year(engine_json, received_at), r_id) for r_id, engine_json, received_at in rows]
+        )
+        conn.execute("DROP TABLE IF EXISTS fleet_year_aggregates")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_telemetry_status_year_receipt "
+        "ON telemetry_reports (status, reporting_year, receipt_hash, report_id)"
+    )
+
+
+# Snapshot-Query (AssetEngine.get_fleet_snapshot): Range-Scan über
+# idx_telemetry_status_year_receipt in receipt_hash-Reihenfolge, kein Sort.
+# ORDER BY COLLATE BINARY stellt sicher, dass die Sortierung unabhängig vom System-Locale ist
+FLEET_SNAPSHOT_SQL = (
+    "SELECT report_id, receipt_hash FROM telemetry_reports "
+    "WHERE status = 'ELIGIBLE' AND reporting_year = ? "
+    "ORDER BY receipt_hash COLLATE BINARY ASC"
+)
+# v1-Snapshot: Original-Selektion über das received_at-Präfix (nicht reporting_year),
+# damit bestehende v1-Zertifikate ihre Report-Menge exakt reproduzieren. Kein Hot Path.
+FLEET_SNAPSHOT_V1_SQL = (
+    "SELECT report_id, engine_input, receipt_hash FROM telemetry_reports "
+    "WHERE status = 'ELIGIBLE' AND received_at LIKE ? "
+    "ORDER BY receipt_hash COLLATE BINARY ASC"
+)
+
+
+def _report_contribution(engine_json: str):
+    """(fuel_mt, co2_t) eines Reports als Decimal - identisch zur bisherigen Snapshot-Aggregation."""
+    data = json.loads(engine_json) if engine_json else {}
+    return Decimal(str(data.get('fuel_mt', 0))), Decimal(str(data.get('co2_emissions_t', 0)))
+
+
+def ensure_fleet_aggregates(conn):
+    """
+    Idempotent: legt fleet_year_aggregates an; beim ersten Anlegen Backfill aus
+    telemetry_reports. Returns True, wenn die Tabelle gerade neu aufgebaut wurde.
+    Aggregate ohne mset_state (vor Fingerprint v2) werden verworfen und neu aufgebaut.
+    """
+    columns = [info[1] for info in conn.execute("PRAGMA table_info(fleet_year_aggregates)").fetchall()]
+    if "mset_state" in columns:
+        return False
+    if columns:
+        conn.execute("DROP TABLE fleet_year_aggregates")
+    has_reports = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'telemetry_reports'"
+    ).fetchone()
+    if has_reports:
+        ensure_reporting_year(conn)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS fleet_year_aggregates (
+            reporting_year TEXT PRIMARY KEY,
+            report_count INTEGER NOT NULL,
+            fuel_mt TEXT NOT NULL,
+            co2_emissions_t TEXT NOT NULL,
+            fingerprint_state TEXT NOT NULL,
+            mset_state TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+    ''')
+    if has_reports:
+        for aggregate in _rebuild_aggregates(conn).values():
+            _store_aggregate(conn, aggregate)
+    return True
+
+
+def _empty_aggregate(reporting_year: str) -> dict:
+    return {"reporting_year": reporting_year, "count": 0, "fuel_mt": Decimal('0.0'),
+            "co2_emissions_t": Decimal('0.0'), "fingerprint_state": 0, "mset_state": 1}
+
+
+def _load_aggregate(conn, reporting_year: str) -> dict:
+    row = conn.execute(
+        "SELECT report_count, fuel_mt, co2_emissions_t, fingerprint_state, mset_state "
+        "FROM fleet_year_aggregates WHERE reporting_year = ?", (reporting_year,)
+    ).fetchone()
+    if not row:
+        return _empty_aggregate(reporting_year)
+    return {"reporting_year": reporting_year, "count": row[0], "fuel_mt": Decimal(row[1]),
+            "co2_emissions_t": Decimal(row[2]), "fingerprint_state": int(row[3], 16),
+            "mset_state": int(row[4], 16)}
+
+
+def _store_aggregate(conn, aggregate: dict):
+    conn.execute('''
+        INSERT OR REPLACE INTO fleet_year_aggregates
+        (reporting_year, report_count, fuel_mt, co2_emissions_t, fingerprint_state, mset_state, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', (
+        aggregate["reporting_year"], aggregate["count"], str(aggregate["fuel_mt"]),
+        str(aggregate["co2_emissions_t"]), f"{aggregate['fingerprint_state']:064x}",
+        f"{aggregate['mset_state']:0{2 * _MSET_BYTES}x}",
+        datetime.now(timezone.utc).isoformat()
+    ))
+
+
+def _rebuild_aggregates(conn, reporting_year: str = None) -> dict:
+    """Volle Neuberechnung aus telemetry_reports (O(n) JSON) - Backfill und Audit."""
+    sql = ("SELECT reporting_year, engine_input, receipt_hash FROM telemetry_reports "
+           "WHERE status = 'ELIGIBLE' AND reporting_year IS NOT NULL")
+    params = ()
+    if reporting_year is not None:
+        sql += " AND reporting_year = ?"
+        params = (int(reporting_year),)
+    aggregates = {}
+    if reporting_year is not None:
+        aggregates[str(reporting_year)] = _empty_aggregate(str(reporting_year))
+    for row_year, engine_json, receipt_hash in conn.execute(sql, params):
+        year = str(row_year)
+        aggregate = aggregates.setdefault(year, _empty_aggregate(year))
+        fuel, co2 = _report_contribution(engine_json)
+        aggregate["count"] += 1
+        aggregate["fuel_mt"] += fuel
+        aggregate["co2_emissions_t"] += co2
+        aggregate["fingerprint_state"] = (aggregate["fingerprint_state"] + _fp_term(receipt_hash)) % _FP_MODULUS
+        aggregate["mset_state"] = aggregate["mset_state"] * _mset_term(receipt_hash) % _MSET_PRIME
+    return aggregates
+
+
+def apply_eligibility_change(conn, report_ids: list, delta: int):
+    """
+    Fortschreibung im Transaktionskontext des Aufrufers (kein commit hier),
+    aufzurufen NACH dem Statuswechsel.
+    delta=+1: report_ids sind gerade ELIGIBLE geworden, delta=-1: haben ELIGIBLE verlassen.
+    """
+    if not report_ids:
+        return
+    if ensure_fleet_aggregates(conn):
+        return  # Frischer Backfill enthält den Statuswechsel bereits
+    placeholders = ",".join(["?"] * len(report_ids))
+    rows = conn.execute(
+        f"SELECT reporting_year, engine_input, receipt_hash FROM telemetry_reports "
+        f"WHERE report_id IN ({placeholders}) AND reporting_year IS NOT NULL",
+        list(report_ids)
+    ).fetchall()
+
+    touched = {}
+    mset_delta = {}
+    for row_year, engine_json, receipt_hash in rows:
+        year = str(row_year)
+        if year not in touched:
+            touched[year] = _load_aggregate(conn, year)
+            mset_delta[year] = 1
+        aggregate = touched[year]
+        fuel, co2 = _report_contribution(engine_json)
+        aggregate["count"] += delta
+        aggregate["fuel_mt"] += delta * fuel
+        aggregate["co2_emissions_t"] += delta * co2
+        aggregate["fingerprint_state"] = (aggregate["fingerprint_state"] + delta * _fp_term(receipt_hash)) % _FP_MODULUS
+        mset_delta[year] = mset_delta[year] * _mset_term(receipt_hash) % _MSET_PRIME
+    for year, aggregate in touched.items():
+        # Remove: ein modulares Inverses pro Jahr und Aufruf, nicht pro Report
+        factor = mset_delta[year] if delta > 0 else pow(mset_delta[year], -1, _MSET_PRIME)
+        aggregate["mset_state"] = aggregate["mset_state"] * factor % _MSET_PRIME
+        _store_aggregate(conn, aggregate)
+
 
 class AssetEngine:
     def __init__(self, db_path: str):
         self.db_path = db_path
+        with sqlite3.connect(self.db_path) as conn:
+            ensure_reporting_year(conn)
+            ensure_fleet_aggregates(conn)
 
-    def get_fleet_snapshot(self, reporting_year: str) -> dict:
+    def get_fleet_aggregate(self, reporting_year: str) -> dict:
         """
-        Aggregiert alle ELIGIBLE Reports eines Jahres zu einem deterministischen Snapshot.
-        Stabile Sortierung via receipt_hash COLLATE BINARY garantiert identische Fingerprints.
+        O(1): materialisierter Jahresstand (eine Zeile), ohne Report-Liste und ohne JSON.
+        calculation_fingerprint ist der v2-Fingerprint der aktuellen ELIGIBLE-Menge.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            aggregate = _load_aggregate(conn, str(reporting_year))
+        return {
+            "reporting_year": str(reporting_year),
+            "count": aggregate["count"],
+            "verified_fuel_mt": float(aggregate["fuel_mt"]),
+            "co2_emissions_t": float(aggregate["co2_emissions_t"]),
+            "fingerprint_state": f"{aggregate['fingerprint_state']:064x}",
+            "fingerprint_scheme": FINGERPRINT_V2,
+            "calculation_fingerprint": (
+                _fingerprint_v2(str(reporting_year), aggregate["count"], aggregate["mset_state"])
+                if aggregate["count"] else None
+            )
+        }
+
+    def get_fleet_snapshot(self, reporting_year: str, fingerprint_scheme: str = DEFAULT_FINGERPRINT_SCHEME) -> dict:
+        """
+        Aggregiert alle ELIGIBLE Reports eines Berichtsjahres (reporting_year) zu einem
+        deterministischen Snapshot. Stabile Sortierung via receipt_hash COLLATE BINARY
+        garantiert identische Fingerprints; die Reihenfolge liefert der Index
+        idx_telemetry_status_year_receipt (Range-Scan, kein Sort).
+        Summen kommen aus fleet_year_aggregates (kein json.loads pro Report); gelesen
+        werden nur report_id/receipt_hash. Weicht der Fingerprint-State der gelesenen
+        Reports vom materialisierten ab, wird das Jahr neu aufgebaut.
+        fingerprint_scheme: v2 (neue Zertifikate) kommt O(1) aus dem Aggregat; v1
+        (Default, Nachrechnen bestehender Zertifikate) läuft komplett mit der
+        Original-Logik (_legacy_snapshot_v1: Selektion nach received_at, Summen per JSON).
         """
         try:
+            if fingerprint_scheme not in (FINGERPRINT_V1, FINGERPRINT_V2):
+                raise ValueError(f"FINGERPRINT_SCHEME_UNKNOWN: {fingerprint_scheme}")
+            if fingerprint_scheme == FINGERPRINT_V1:
+                return self._legacy_snapshot_v1(reporting_year)
+
             with sqlite3.connect(self.db_path) as conn:
-                # ORDER BY COLLATE BINARY stellt sicher, dass die Sortierung unabhängig vom System-Locale ist
-                cursor = conn.execute('''
-                    SELECT report_id, engine_input, receipt_hash 
-                    FROM telemetry_reports 
-                    WHERE status = 'ELIGIBLE' 
-                    AND received_at LIKE ?
-                    ORDER BY receipt_hash COLLATE BINARY ASC
-                ''', (f"{reporting_year}%",))
+                cursor = conn.execute(FLEET_SNAPSHOT_SQL, (int(reporting_year),))
                 
                 rows = cursor.fetchall()
+                aggregate = _load_aggregate(conn, str(reporting_year))
+
+                report_ids = []
+                state = 0
+                for r_id, r_hash in rows:
+                    state = (state + _fp_term(r_hash)) % _FP_MODULUS
+                    report_ids.append(r_id)
+
+                # Drift-Schutz: Aggregat muss exakt diese Report-Menge beschreiben
+                if aggregate["count"] != len(rows) or aggregate["fingerprint_state"] != state:
+                    aggregate = _rebuild_aggregates(conn, str(reporting_year))[str(reporting_year)]
+                    _store_aggregate(conn, aggregate)
 
             if not rows:
-                return {
-                    "count": 0,
-                    "verified_fuel_mt": 0.0,
-                    "co2_emissions_t": 0.0,
-                    "compliance_balance_t": None,
-                    "calculation_fingerprint": None
-                }
-
-            total_fuel = Decimal('0.0')
-            total_co2 = Decimal('0.0')
-            report_ids = []
-            hash_accumulator = hashlib.sha256()
-
-            for r_id, engine_json, r_hash in rows:
-                data = json.loads(engine_json)
-                
-                # Aggregation via Decimal zur Vermeidung von Float-Leaks
-                total_fuel += Decimal(str(data.get('fuel_mt', 0)))
-                total_co2 += Decimal(str(data.get('co2_emissions_t', 0)))
-                
-                # Deterministische Hash-Verkettung basierend auf receipt_hash
-                hash_accumulator.update(r_hash.encode('utf-8'))
-                report_ids.append(r_id)
+                return self._empty_snapshot(FINGERPRINT_V2)
 
             return {
                 "reporting_year": reporting_year,
                 "count": len(rows),
-                "verified_fuel_mt": float(total_fuel),
-                "co2_emissions_t": float(total_co2),
+                "verified_fuel_mt": float(aggregate["fuel_mt"]),
+                "co2_emissions_t": float(aggregate["co2_emissions_t"]),
                 "compliance_balance_t": None,
-                "calculation_fingerprint": hash_accumulator.hexdigest(),
+                "calculation_fingerprint": _fingerprint_v2(str(reporting_year), len(rows), aggregate["mset_state"]),
+                "fingerprint_scheme": FINGERPRINT_V2,
                 "involved_reports": report_ids
             }
 
         except Exception as e:
             return {"error": str(e)}
+
+    def verify_certificate_fingerprint(self, certificate: dict) -> dict:
+        """
+        Rechnet den calculation_fingerprint eines gespeicherten Zertifikats-Payloads
+        mit DESSEN Schema nach: fingerprint_scheme aus dem Payload, bei älteren
+        Zertifikaten ohne Feld am Fingerprint abgelesen (reines Hex = v1). Basis ist
+        die im Zertifikat festgeschriebene Report-Menge (involved_receipt_hashes,
+        sonst involved_reports über die DB aufgelöst), nicht der aktuelle ELIGIBLE-Stand.
+        """
+        stored = certificate.get("calculation_fingerprint")
+        if not stored:
+            return {"valid": False, "error": "FINGERPRINT_MISSING"}
+        scheme = certificate.get("fingerprint_scheme") or fingerprint_scheme_of(stored)
+        if fingerprint_scheme_of(stored) != scheme:
+            return {
+                "valid": False, "scheme": scheme, "stored": stored,
+                "error": f"FINGERPRINT_SCHEME_MISMATCH: payload says {scheme}, fingerprint is {fingerprint_scheme_of(stored)}"
+            }
+
+        receipt_hashes = certificate.get("involved_receipt_hashes")
+        if receipt_hashes is None:
+            report_ids = certificate.get("involved_reports") or []
+            with sqlite3.connect(self.db_path) as conn:
+                placeholders = ",".join(["?"] * len(report_ids))
+                receipt_hashes = [r[0] for r in conn.execute(
+                    f"SELECT receipt_hash FROM telemetry_reports WHERE report_id IN ({placeholders})",
+                    report_ids
+                )]
+            if len(receipt_hashes) != len(report_ids):
+                return {"valid": False, "scheme": scheme, "stored": stored, "error": "CERTIFICATE_REPORTS_MISSING"}
+
+        try:
+            expected = fleet_fingerprint(receipt_hashes, str(certificate.get("reporting_year")), scheme)
+        except ValueError as e:
+            return {"valid": False, "scheme": scheme, "stored": stored, "error": str(e)}
+        return {"valid": expected == stored, "scheme": scheme, "stored": stored, "expected": expected}
+
+    @staticmethod
+    def _empty_snapshot(fingerprint_scheme: str) -> dict:
+        return {
+            "count": 0,
+            "verified_fuel_mt": 0.0,
+            "co2_emissions_t": 0.0,
+            "compliance_balance_t": None,
+            "calculation_fingerprint": None,
+            "fingerprint_scheme": fingerprint_scheme
+        }
+
+    def _legacy_snapshot_v1(self, reporting_year: str) -> dict:
+        """
+        v1-Snapshot exakt wie vor reporting_year/Aggregaten: Jahr = received_at-Präfix,
+        Decimal-Summen per json.loads pro Report, SHA256-Kette über die sortierten
+        receipt_hashes. Nur so reproduziert ein bestehendes v1-Zertifikat seinen
+        Fingerprint (Reports mit abweichender reporting_period inklusive).
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(FLEET_SNAPSHOT_V1_SQL, (f"{reporting_year}%",)).fetchall()
+
+        if not rows:
+            return self._empty_snapshot(FINGERPRINT_V1)
+
+        total_fuel = Decimal('0.0')
+        total_co2 = Decimal('0.0')
+        report_ids = []
+        hash_accumulator = hashlib.sha256()
+        for r_id, engine_json, r_hash in rows:
+            fuel_mt, co2_t = _report_contribution(engine_json)
+            total_fuel += fuel_mt
+            total_co2 += co2_t
+            # Deterministische Hash-Verkettung basierend auf receipt_hash
+            hash_accumulator.update(r_hash.encode('utf-8'))
+            report_ids.append(r_id)
+
+        return {
+            "reporting_year": reporting_year,
+            "count": len(rows),
+            "verified_fuel_mt": float(total_fuel),
+            "co2_emissions_t": float(total_co2),
+            "compliance_balance_t": None,
+            "calculation_fingerprint": hash_accumulator.hexdigest(),
+            "fingerprint_scheme": FINGERPRINT_V1,
+            "involved_reports": report_ids
+        }
+
+    def audit_fleet_aggregates(self, reporting_year: str = None, repair: bool = False) -> dict:
+        """
+        Audit-Modus: baut die Aggregate aus telemetry_reports neu auf und vergleicht
+        mit dem materialisierten Stand (alle Jahre oder eines). repair=True
+        überschreibt abweichende Jahre mit dem Neuaufbau.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            rebuilt = _rebuild_aggregates(conn, reporting_year)
+            stored_years = [r[0] for r in conn.execute("SELECT reporting_year FROM fleet_year_aggregates")]
+            years = sorted(set(rebuilt) | ({str(reporting_year)} if reporting_year is not None else set(stored_years)))
+
+            mismatches = []
+            for year in years:
+                stored = _load_aggregate(conn, year)
+                fresh = rebuilt.get(year, _empty_aggregate(year))
+                if stored != fresh:
+                    mismatches.append({
+                        "reporting_year": year,
+                        "stored": {"count": stored["count"], "fuel_mt": str(stored["fuel_mt"]),
+                                   "co2_emissions_t": str(stored["co2_emissions_t"])},
+                        "rebuilt": {"count": fresh["count"], "fuel_mt": str(fresh["fuel_mt"]),
+                                    "co2_emissions_t": str(fresh["co2_emissions_t"])}
+                    })
+                    if repair:
+                        _store_aggregate(conn, fresh)
+            if repair:
+                conn.commit()
+
+        return {"checked_years": years, "mismatches": mismatches, "repaired": repair and bool(mismatches)}
         
     @staticmethod
     def log_market_price(db_path, price_data): # Hier db_path hinzufügen
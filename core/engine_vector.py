@@ -0,0 +1,87 @@
+import numpy as np
+from core.fleet_arrays import FleetArrays
+from core.engine_fueleu import _FUELEU_STEPS
+from core.config import ETS_PHASE_IN, DEFAULT_EUA_PRICE
+
+# Vektorisierte Gegenstücke zu FuelEUEngine / ETSEngine über FleetArrays.
+# Gleiche Formeln, aber: Flotten-Summen einmal pro Aufruf (np.dot statt
+# Generator-Summen über Dataclasses) und alle Jahre per Broadcasting in einem
+# Durchlauf. Rechnet in float64; Summenreihenfolge (numpy pairwise) weicht von
+# der sequentiellen sum() der Skalar-Engines nur in den letzten Bits ab.
+
+_STEP_YEARS = np.array([y for y, _ in _FUELEU_STEPS], dtype=np.int64)
+_STEP_VALUES = np.array([91.16] + [v for _, v in _FUELEU_STEPS], dtype=np.float64)
+
+
+def resolve_targets(years) -> np.ndarray:
+    """Vektorisiertes _resolve_target: Zielwert (gCO2e/MJ) je Jahr."""
+    years = np.asarray(years, dtype=np.int64)
+    return _STEP_VALUES[np.searchsorted(_STEP_YEARS, years, side="right")]
+
+
+def resolve_phase_in(years) -> np.ndarray:
+    """ETS Phase-in je Jahr (wie ETSEngine: nicht gelistete Jahre = 1.0)."""
+    return np.array([ETS_PHASE_IN.get(int(y), 1.0) for y in np.atleast_1d(years)], dtype=np.float64)
+
+
+def _masked(values: np.ndarray, mask):
+    return values if mask is None else values[mask]
+
+
+def _fleet_totals(arrays: FleetArrays, mask=None):
+    """(Energie MJ, Emissionen g) der (maskierten) Flotte - ein Durchlauf."""
+    energy = _masked(arrays.energy_mj, mask)
+    return float(energy.sum()), float(np.dot(energy, _masked(arrays.ghg_intensity, mask)))
+
+
+class VectorFuelEUEngine:
+    def __init__(self, years):
+        self.years = np.atleast_1d(np.asarray(years, dtype=np.int64))
+        self.targets = resolve_targets(self.years)
+
+    def calculate_fleet_intensity(self, arrays: FleetArrays, mask=None) -> float:
+        total_energy, total_emissions_g = _fleet_totals(arrays, mask)
+        if not total_energy:
+            return 0.0
+        return total_emissions_g / total_energy
+
+    def get_compliance_balance(self, arrays: FleetArrays, mask=None) -> np.ndarray:
+        """Flotten-Bilanz (t) je Jahr in self.years - Formel wie FuelEUEngine."""
+        total_energy, total_emissions_g = _fleet_totals(arrays, mask)
+        actual_intensity = total_emissions_g / total_energy if total_energy else 0.0
+        return (self.targets - actual_intensity) * total_energy / 1_000_000
+
+    def get_vessel_balances(self, arrays: FleetArrays, mask=None) -> np.ndarray:
+        """
+        Bilanz (t) pro Schiff und Jahr, Shape (vessel_count, len(years)).
+        (target - intensity) * energy == target * energy - emissions, daher ohne Division.
+        """
+        energy, emissions = arrays.energy_mj, arrays.emissions_g
+        if mask is not None:
+            energy, emissions = np.where(mask, energy, 0.0), np.where(mask, emissions, 0.0)
+        energy = np.bincount(arrays.vessel_index, energy, minlength=arrays.vessel_count)
+        emissions = np.bincount(arrays.vessel_index, emissions, minlength=arrays.vessel_count)
+        return (np.outer(energy, self.targets) - emissions[:, None]) / 1_000_000
+
+
+class VectorETSEngine:
+    def __init__(self, years):
+        self.years = np.atleast_1d(np.asarray(years, dtype=np.int64))
+        self.phase_in_factors = resolve_phase_in(self.years)
+
+    @staticmethod
+    def taxable_base_t(arrays: FleetArrays, mask=None) -> float:
+        """Emissionen (t) * Fahrtgebiet-Faktor, summiert - vor Phase-in."""
+        emissions_t = _masked(arrays.emissions_g, mask) / 1_000_000
+        return float(np.dot(emissions_t, _masked(arrays.eu_scope_factor, mask)))
+
+    def calculate_costs(self, arrays: FleetArrays, eua_prices=DEFAULT_EUA_PRICE, mask=None) -> np.ndarray:
+        """ETS-Kosten der Flotte, Shape (len(years), len(eua_prices))."""
+        prices = np.atleast_1d(np.asarray(eua_prices, dtype=np.float64))
+        taxable_t = self.taxable_base_t(arrays, mask) * self.phase_in_factors
+        return np.outer(taxable_t, prices)
+
+    def calculate_event_costs(self, arrays: FleetArrays, eua_price: float = DEFAULT_EUA_PRICE) -> np.ndarray:
+        """ETS-Kosten pro Event und Jahr, Shape (len(arrays), len(years)) - wie ETSEngine.calculate_cost."""
+        taxable_t = arrays.emissions_g / 1_000_000 * arrays.eu_scope_factor
+        return np.outer(taxable_t, self.phase_in_factors * eua_price)
@@ -0,0 +1,63 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+import numpy as np
+from core.models import Fleet, State
+
+# State als int8-Code (Spalte "state"); Reihenfolge = Definitionsreihenfolge in models.State
+STATE_CODES = {state: code for code, state in enumerate(State)}
+
+
+@dataclass
+class FleetArrays:
+    """
+    Spaltenweise Flotte: ein Eintrag pro EnergyEvent, gleiche Reihenfolge wie
+    Fleet.get_all_events(). vessel_index zeigt in vessel_ids (für Pro-Schiff-
+    Summen via np.bincount). Wird einmal pro Flotte gebaut und von den
+    vektorisierten Engines (core.engine_vector) beliebig oft gelesen.
+    """
+    energy_mj: np.ndarray
+    ghg_intensity: np.ndarray
+    eu_scope_factor: np.ndarray
+    state: np.ndarray
+    vessel_index: np.ndarray
+    vessel_ids: List[str] = field(default_factory=list)
+    event_ids: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_fleet(cls, fleet: Fleet) -> "FleetArrays":
+        energy, ghg, scope, state, vessel_index, event_ids = [], [], [], [], [], []
+        for i, vessel in enumerate(fleet.vessels):
+            for e in vessel.events:
+                energy.append(e.energy_mj)
+                ghg.append(e.ghg_intensity)
+                scope.append(e.eu_scope_factor)
+                state.append(STATE_CODES[e.state])
+                vessel_index.append(i)
+                event_ids.append(e.id)
+        return cls(
+            energy_mj=np.asarray(energy, dtype=np.float64),
+            ghg_intensity=np.asarray(ghg, dtype=np.float64),
+            eu_scope_factor=np.asarray(scope, dtype=np.float64),
+            state=np.asarray(state, dtype=np.int8),
+            vessel_index=np.asarray(vessel_index, dtype=np.int32),
+            vessel_ids=[v.id for v in fleet.vessels],
+            event_ids=event_ids
+        )
+
+    def __len__(self):
+        return len(self.energy_mj)
+
+    @property
+    def vessel_count(self) -> int:
+        return len(self.vessel_ids)
+
+    @property
+    def emissions_g(self) -> np.ndarray:
+        """gCO2e pro Event (energy_mj * ghg_intensity)."""
+        return self.energy_mj * self.ghg_intensity
+
+    def state_mask(self, *states: State) -> Optional[np.ndarray]:
+        """Bool-Maske für die angegebenen States (keine States = alle Events -> None)."""
+        if not states:
+            return None
+        return np.isin(self.state, [STATE_CODES[s] for s in states])
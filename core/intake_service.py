@@ -15,6 +15,7 @@ import re
 from datetime import datetime, timezone
 from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
 from uuid import uuid4
+from core.engine_service import apply_eligibility_change, derive_reporting_year, ensure_reporting_year
 
 
 # ------------------------------------------------------------------------------
@@ -339,7 +340,8 @@ class IntakeService:
                     reviewed_by TEXT,
                     reviewed_role TEXT,
                     reviewed_at TEXT,
-                    governance_comment TEXT
+                    governance_comment TEXT,
+                    reporting_year INTEGER
                 )
             ''')
 
@@ -348,6 +350,8 @@ class IntakeService:
                 cursor.execute("ALTER TABLE telemetry_reports ADD COLUMN canonical_base TEXT")
             if "engine_input" not in columns:
                 cursor.execute("ALTER TABLE telemetry_reports ADD COLUMN engine_input TEXT")
+            # Abgeleitetes Berichtsjahr + Index (Backfill beim ersten Start)
+            ensure_reporting_year(conn)
 
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS certified_receipts (
@@ -366,8 +370,8 @@ class IntakeService:
         with sqlite3.connect(self.db_path) as conn:
             conn.execute('''
                 INSERT INTO telemetry_reports 
-                (report_id, imo, vessel_name, raw_json, received_at, receipt_hash, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                (report_id, imo, vessel_name, raw_json, received_at, receipt_hash, status, reporting_year)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
                 report_data['report_id'],
                 report_data['imo'],
@@ -375,7 +379,8 @@ class IntakeService:
                 report_data['raw_json'],
                 report_data['received_at'],
                 report_data['receipt_hash'],
-                "RECEIVED"
+                "RECEIVED",
+                derive_reporting_year(None, report_data['received_at'])
             ))
             conn.commit()
         return report_data['report_id']
@@ -421,21 +426,26 @@ class IntakeService:
                     }
 
                 # --- TEIL D: PERSISTIERUNG (NUR BEI NEUEM HASH) ---
+                engine_json = json.dumps(processed_record['engine_input'], default=str)
+                received_at = processed_record['dataset_metadata']['intake_timestamp']
                 conn.execute('''
                     INSERT INTO telemetry_reports 
-                    (report_id, imo, vessel_name, raw_json, canonical_base, engine_input, received_at, receipt_hash, status)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    (report_id, imo, vessel_name, raw_json, canonical_base, engine_input, received_at, receipt_hash, status, reporting_year)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ''', (
                     processed_record['dataset_metadata']['dataset_id'],
                     processed_record['engine_input']['vessel_imo'],
                     f"OVD-Package-{processed_record['engine_input']['vessel_imo']}",
                     json.dumps(raw_data),
                     json.dumps(processed_record['full_audit_payload']['hash_input'], default=str),
-                    json.dumps(processed_record['engine_input'], default=str),
-                    processed_record['dataset_metadata']['intake_timestamp'],
+                    engine_json,
+                    received_at,
                     new_hash,
-                    "ELIGIBLE"
+                    "ELIGIBLE",
+                    derive_reporting_year(engine_json, received_at)
                 ))
+                # Materialisiertes Jahresaggregat in derselben Transaktion fortschreiben
+                apply_eligibility_change(conn, [processed_record['dataset_metadata']['dataset_id']], +1)
                 conn.commit()
 
             return {
@@ -513,6 +523,8 @@ class IntakeService:
                     governance_comment=?, governance_signature=?
                 WHERE report_id=? AND status IN ("RECEIVED", "UNDER_REVIEW", "FLAGGED")
             ''', (new_status, user, role, decision_time, comment, signature, report_id))
+            if res.rowcount > 0 and new_status == "ELIGIBLE":
+                apply_eligibility_change(conn, [report_id], +1)
             conn.commit()
 
         return res.rowcount > 0
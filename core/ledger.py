@@ -1,20 +1,179 @@
+import os
 import sqlite3
 import hashlib
 import json
+from json.encoder import encode_basestring_ascii as _encode_str
+import time
+import bisect
+import threading
+import asyncio
 import nacl.signing
 import nacl.encoding
 import nacl.exceptions
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
+from core.verifier import first_invalid_signature
+from core import merkle
+from core import archive
+from core.write_queue import LedgerWriteQueue
 
 # --- PRODUCTION HARDENING ROADMAP (TODO) ---
 # 🟡 KEY MANAGEMENT: Currently using session-based keys. Move to HSM/Vault for production.
-# 🟡 KEY ROTATION: Implement 'KEY_ROTATION' block type to verify chain across key epochs.
+#    Signing is pluggable (core.signer): pipelined thread-pool / remote signers overlap with hashing.
+# 🟢 KEY ROTATION: 'KEY_ROTATION' blocks switch the verify key at epoch boundaries (rotate_key).
 # 🟡 CONCURRENCY: SQLite is file-locked. Migrate to PostgreSQL (Row-Level Locking) for multi-operator usage.
+#    In-process concurrent writers: route through core.write_queue.LedgerWriteQueue (group commit).
+
+# --- DURABILITY PROFILES ---
+# Applied per connection in _init_db_settings. Journal mode is always WAL.
+#   forensic: fsync on every commit (power-loss safe). Default for all production ledgers.
+#   balanced: fsync only at WAL checkpoints - a power loss may drop the last commits,
+#             never corrupts the chain. Larger page cache + mmap reads.
+#   bench:    no fsync at all. Throwaway bench/test ledgers only.
+DURABILITY_PROFILES = {
+    "forensic": {"synchronous": "FULL",   "wal_autocheckpoint": 1000,  "cache_size": -2000,  "mmap_size": 0,         "temp_store": "DEFAULT"},
+    "balanced": {"synchronous": "NORMAL", "wal_autocheckpoint": 1000,  "cache_size": -16000, "mmap_size": 268435456, "temp_store": "MEMORY"},
+    "bench":    {"synchronous": "OFF",    "wal_autocheckpoint": 10000, "cache_size": -64000, "mmap_size": 268435456, "temp_store": "MEMORY"},
+}
+
+# --- COLD SEGMENTS ---
+# compact_year() moves the payloads of a sealed reporting year into a read-only
+# per-year VLA1 segment (sparse archive). The hot row keeps seq, type, hashes and
+# signature; payload_json becomes '' and segment_offset points into the segment.
+# Chain-structural blocks always stay hot.
+SEGMENT_HOT_TYPES = ("GENESIS", "KEY_ROTATION", "CHECKPOINT", "PERIOD_SEAL")
+
+# --- RESERVED BLOCK TYPES ---
+# Written only by the ledger itself (initialize_genesis, rotate_key, auto-CHECKPOINT).
+# A caller-supplied KEY_ROTATION / CHECKPOINT would break the key epochs or the
+# MMR commitments of every later replay, so add_entries rejects them.
+RESERVED_BLOCK_TYPES = ("GENESIS", "KEY_ROTATION", "CHECKPOINT")
+
+# --- ROW CHECK STAGES (module level, picklable for worker processes) ---
+# Stage order per row is fixed: 1 = Hash, 2 = Chain Link, 3 = Signature.
+# The first failure of a chain is the minimum (seq, stage) - identical for
+# serial and parallel replay.
+STAGE_HASH, STAGE_LINK, STAGE_SIGNATURE = 1, 2, 3
+
+def _canonical_json(data_dict):
+    """Ensures deterministic hashing by sorting keys."""
+    return json.dumps(data_dict, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+def _canonical_payload(payload):
+    """Canonical payload text - byte-identical to its slice inside _canonical_json(body)."""
+    return json.dumps(payload, sort_keys=True, separators=(',', ':'))
+
+def _json_scalar(v):
+    # Scalar columns only: same output as json.dumps, without the encoder setup per call
+    if v.__class__ is str:
+        return _encode_str(v)
+    if v is None:
+        return 'null'
+    if v.__class__ is int:
+        return int.__repr__(v)
+    return json.dumps(v)
+
+def _body_bytes(r):
+    """
+    Rebuilds the exact hashed body bytes of a row.
+    Columns: 0:seq, 1:inst_id, 2:type, 3:year, 4:prev, 5:reg, 6:payload, 7:curr, 8:sig, 9:ts, 10:payload_canonical
+
+    Canonical rows (payload_json stored canonically) are assembled by string
+    concatenation in sorted key order - no json.loads/json.dumps round trip of
+    the payload. Legacy rows take the decode/re-encode compatibility path.
+    """
+    if r[10]:
+        return (
+            '{"block_type":' + _json_scalar(r[2]) +
+            ',"institution_id":' + _json_scalar(r[1]) +
+            ',"payload":' + r[6] +
+            ',"prev_hash":' + _json_scalar(r[4]) +
+            ',"reg_hash":' + _json_scalar(r[5]) +
+            ',"reporting_year":' + _json_scalar(r[3]) +
+            ',"seq":' + _json_scalar(r[0]) + '}'
+        ).encode('utf-8')
+
+    body = {
+        "seq": r[0], 
+        "institution_id": r[1], 
+        "block_type": r[2],
+        "reporting_year": r[3], 
+        "prev_hash": r[4], 
+        "reg_hash": r[5],
+        "payload": json.loads(r[6])
+    }
+    return _canonical_json(body)
+
+def _check_hash(r):
+    recalc_hash = hashlib.sha256(_body_bytes(r)).hexdigest()
+    if recalc_hash != r[7]:
+        raise Exception(f"HASH_MISMATCH at SEQ {r[0]}")
+
+def _check_link(r, expected_prev_hash):
+    if r[4] != expected_prev_hash:
+        raise Exception(f"CHAIN_BREAK at SEQ {r[0]}: PrevHash mismatch. Expected {expected_prev_hash[:8]}... Got {r[4][:8]}...")
+
+def _check_signature(r, v_key):
+    try:
+        v_key.verify(r[7].encode('utf-8'), bytes.fromhex(r[8]))
+    except nacl.exceptions.BadSignatureError:
+        raise Exception(f"INVALID_SIGNATURE at SEQ {r[0]}")
+
+def _check_rows(rows, verify_key_hex, expected_prev_hash=None):
+    """
+    Checks a run of rows: hash and (optionally) link per row, then the
+    signatures of the run (core.verifier). Returns the first failing
+    (seq, stage, exception) in serial order, or None.
+    expected_prev_hash=None skips the link stage (parallel workers).
+    """
+    failure = None
+    items = []
+    for r in rows:
+        try:
+            _check_hash(r)
+        except Exception as e:
+            failure = (r[0], STAGE_HASH, e)
+            break
+        if expected_prev_hash is not None:
+            try:
+                _check_link(r, expected_prev_hash)
+            except Exception as e:
+                failure = (r[0], STAGE_LINK, e)
+                break
+            expected_prev_hash = r[7]
+        try:
+            signature = bytes.fromhex(r[8])
+            if len(signature) != 64:
+                raise nacl.exceptions.ValueError("The signature must be exactly 64 bytes long")
+        except ValueError as e:
+            failure = (r[0], STAGE_SIGNATURE, e)
+            break
+        items.append((r[0], r[7].encode('utf-8'), signature))
+
+    # Signatures of all rows BEFORE the first hash/link failure come first in serial order
+    bad_seq = first_invalid_signature(verify_key_hex, items)
+    if bad_seq is not None:
+        return (bad_seq, STAGE_SIGNATURE, Exception(f"INVALID_SIGNATURE at SEQ {bad_seq}"))
+    return failure
+
+def _verify_chunk(verify_key_hex, rows):
+    """Worker: hash recompute + signature check for a chunk of rows (no links)."""
+    return _check_rows(rows, verify_key_hex)
 
 class VelonautLedger:
-    def __init__(self, institution_id, db_path, public_key_hex):
+    def __init__(self, institution_id, db_path, public_key_hex, durability="forensic", checkpoint_interval=None, segment_dir=None):
+        if durability not in DURABILITY_PROFILES:
+            raise ValueError(f"Unknown durability profile '{durability}'. Valid: {', '.join(DURABILITY_PROFILES)}")
+        if checkpoint_interval is not None and checkpoint_interval < 2:
+            raise ValueError("checkpoint_interval must be >= 2 (or None to disable CHECKPOINT blocks)")
         self.institution_id = institution_id
         self.db_path = db_path
+        self.durability = durability
+        # Every checkpoint_interval-th seq is a CHECKPOINT block (None: off)
+        self.checkpoint_interval = checkpoint_interval
+        # Cold segments of sealed years (default: <db dir>/segments); readers are opened lazily
+        self.segment_dir = segment_dir or os.path.join(os.path.dirname(db_path), "segments")
+        self._segment_readers = {}
         self.__conn = sqlite3.connect(
             db_path, 
             isolation_level=None, 
@@ -23,12 +182,35 @@ class VelonautLedger:
         # Genesis Key Anchor
         self.__initial_verify_key_hex = public_key_hex
         self.__initial_verify_key = nacl.signing.VerifyKey(public_key_hex, encoder=nacl.encoding.HexEncoder)
+        # Chain Tip Cache: (seq, current_hash), validated via PRAGMA data_version
+        self._tip = None
+        self._tip_data_version = None
+        # Last (seq, hash) verified by this instance (in-memory anchor)
+        self._verified = None
+        # Key Epoch Index: _epoch_keys[i] is valid for seq in (_epoch_seqs[i-1], _epoch_seqs[i]]
+        self._epoch_seqs = []
+        self._epoch_keys = [public_key_hex]
+        self._verify_keys = {}
+        # One transaction per connection at a time (shared instance across threads).
+        # Read API queries take it as well: a shared connection would otherwise
+        # serve rows of another thread's open, not yet committed transaction.
+        self._write_lock = threading.RLock()
+        # Writer thread behind async_add_entry (one per ledger, started lazily)
+        self._async_queue = None
+        self._closed = False
         self._init_db_settings()
+        # Migration: chains written before the MMR existed get their leaves backfilled once
+        self._sync_mmr()
 
     def _init_db_settings(self):
         c = self.__conn.cursor()
         c.execute("PRAGMA journal_mode = WAL")
-        c.execute("PRAGMA synchronous = FULL")
+        profile = DURABILITY_PROFILES[self.durability]
+        c.execute(f"PRAGMA synchronous = {profile['synchronous']}")
+        c.execute(f"PRAGMA wal_autocheckpoint = {int(profile['wal_autocheckpoint'])}")
+        c.execute(f"PRAGMA cache_size = {int(profile['cache_size'])}")
+        c.execute(f"PRAGMA mmap_size = {int(profile['mmap_size'])}")
+        c.execute(f"PRAGMA temp_store = {profile['temp_store']}")
         
         # Schema Definition
         c.execute("""
@@ -42,19 +224,119 @@ class VelonautLedger:
                 payload_json TEXT NOT NULL,
                 current_hash TEXT NOT NULL,
                 signature TEXT NOT NULL,
-                timestamp_utc TEXT NOT NULL
+                timestamp_utc TEXT NOT NULL,
+                payload_canonical INTEGER NOT NULL DEFAULT 0,
+                segment_offset INTEGER
+            )
+        """)
+
+        # Migration: payload_canonical = 1 marks rows whose payload_json is stored
+        # in canonical form (hash body rebuildable without a decode/encode round trip)
+        columns = [info[1] for info in c.execute("PRAGMA table_info(ledger_entries)").fetchall()]
+        if "payload_canonical" not in columns:
+            c.execute("ALTER TABLE ledger_entries ADD COLUMN payload_canonical INTEGER NOT NULL DEFAULT 0")
+        # Migration: segment_offset != NULL marks rows whose payload lives in a cold segment
+        if "segment_offset" not in columns:
+            c.execute("ALTER TABLE ledger_entries ADD COLUMN segment_offset INTEGER")
+
+        # Read Indexes: typed range reads (iter_entries, key epochs) and
+        # per-year lookups resolve via index instead of a full table scan.
+        # The per-year index carries current_hash, so the period-seal checks
+        # (COUNT / EXISTS / last hash per block_type + reporting_year) are index-only.
+        # Hot query plans are pinned by check_query_plans.py.
+        c.execute("CREATE INDEX IF NOT EXISTS idx_ledger_type_seq ON ledger_entries (block_type, seq)")
+        c.execute("DROP INDEX IF EXISTS idx_ledger_type_year_seq")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_ledger_type_year_seq_hash ON ledger_entries (block_type, reporting_year, seq, current_hash)")
+
+        # Merkle Mountain Range over block hashes (see core/merkle.py).
+        # Append-only node store, written in the same transaction as the blocks.
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS ledger_mmr_nodes (
+                height INTEGER NOT NULL,
+                idx INTEGER NOT NULL,
+                hash BLOB NOT NULL,
+                PRIMARY KEY (height, idx)
+            ) WITHOUT ROWID
+        """)
+
+        # Cold Segments: one read-only VLA1 file per sealed reporting year
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS ledger_segments (
+                reporting_year INTEGER PRIMARY KEY,
+                path TEXT NOT NULL,
+                seal_seq INTEGER NOT NULL,
+                block_count INTEGER NOT NULL,
+                first_seq INTEGER NOT NULL,
+                last_seq INTEGER NOT NULL,
+                tip_hash TEXT NOT NULL,
+                bytes INTEGER NOT NULL,
+                created_utc TEXT NOT NULL
+            )
+        """)
+
+        # Verification Checkpoints: last verified (seq, hash), signed by the ledger key
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS ledger_checkpoints (
+                checkpoint_id INTEGER PRIMARY KEY,
+                verified_seq INTEGER NOT NULL,
+                verified_hash TEXT NOT NULL,
+                verified_at_utc TEXT NOT NULL,
+                checkpoint_hash TEXT NOT NULL,
+                signature TEXT NOT NULL
             )
         """)
 
     def _canonical_json(self, data_dict):
         """Ensures deterministic hashing by sorting keys."""
-        return json.dumps(data_dict, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        return _canonical_json(data_dict)
+
+    # Shared with check_query_plans.py (EXPLAIN guard against full table scans)
+    _TIP_SQL = "SELECT seq, current_hash FROM ledger_entries ORDER BY seq DESC LIMIT 1"
+    _ENTRY_SQL = "SELECT * FROM ledger_entries WHERE seq = ?"
+    _KEY_EPOCHS_SQL = (
+        "SELECT seq, payload_json FROM ledger_entries "
+        "WHERE block_type = 'KEY_ROTATION' AND seq > ? ORDER BY seq ASC"
+    )
+
+    def _get_tip(self):
+        """
+        Returns (seq, current_hash) of the last block, or None before Genesis.
+        Served from memory as long as PRAGMA data_version shows that no other
+        connection has committed since; otherwise re-read via the seq primary
+        key (O(log n)), never via a table scan.
+        """
+        with self._write_lock:
+            c = self.__conn.cursor()
+            data_version = c.execute("PRAGMA data_version").fetchone()[0]
+            if self._tip is not None and data_version == self._tip_data_version:
+                return self._tip
+
+            c.execute(self._TIP_SQL)
+            row = c.fetchone()
+            self._tip = (row[0], row[1]) if row else None
+            self._tip_data_version = data_version
+            return self._tip
+
+    def _set_tip(self, seq, current_hash):
+        """Advances the cache after an own commit (own writes do not bump data_version)."""
+        with self._write_lock:
+            self._tip = (seq, current_hash)
+            self._tip_data_version = self.__conn.execute("PRAGMA data_version").fetchone()[0]
 
     def is_initialized(self):
         """Checks if Genesis block exists."""
-        c = self.__conn.cursor()
-        c.execute("SELECT COUNT(*) FROM ledger_entries")
-        return c.fetchone()[0] > 0
+        return self._get_tip() is not None
+
+    def open_reader(self):
+        """
+        Second instance on the same ledger (same keys and settings), with its own
+        connection - for long replays off the UI thread (core.background_verify).
+        """
+        return VelonautLedger(
+            self.institution_id, self.db_path, self.__initial_verify_key_hex,
+            durability=self.durability, checkpoint_interval=self.checkpoint_interval,
+            segment_dir=self.segment_dir
+        )
 
     def initialize_genesis(self, signer_func):
         """
@@ -92,39 +374,39 @@ class VelonautLedger:
         signature_hex = signature.hex()
         ts = datetime.now(timezone.utc).isoformat()
 
-        # 4. Commit
-        cursor = self.__conn.cursor()
-        cursor.execute("""
-            INSERT INTO ledger_entries 
-            (institution_id, block_type, reporting_year, prev_hash, reg_hash, payload_json, current_hash, signature, timestamp_utc)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            self.institution_id, "GENESIS", 0, prev_hash, None,
-            json.dumps(genesis_payload), block_hash, signature_hex, ts
-        ))
+        # 4. Commit (block + MMR leaf, atomic)
+        with self._write_lock:
+            cursor = self.__conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.execute(self._INSERT_SQL, (
+                    1, self.institution_id, "GENESIS", 0, prev_hash, None,
+                    _canonical_payload(genesis_payload), block_hash, signature_hex, ts, 1
+                ))
+                mmr = self._mmr_open(cursor, 0)
+                mmr.push(1, block_hash)
+                self._mmr_flush(cursor, mmr)
+                cursor.execute("COMMIT")
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            self._set_tip(1, block_hash)
         return True
 
-    def add_entry(self, block_type, payload, reporting_year, signer_func=None):
+    _INSERT_SQL = """
+        INSERT INTO ledger_entries 
+        (seq, institution_id, block_type, reporting_year, prev_hash, reg_hash, payload_json, current_hash, signature, timestamp_utc, payload_canonical)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    def _hash_block(self, seq, prev_hash, block_type, payload, reporting_year):
         """
-        Core Write Method. Calculates Hash, PrevHash and Signature.
+        Chains and hashes a single block in memory (no signature yet).
+        Returns the row tuple in _INSERT_SQL column order, signature = None.
         """
-        if not self.is_initialized():
-            raise Exception("Ledger not initialized. Genesis block missing.")
-
-        cursor = self.__conn.cursor()
-        
-        # 1. Get Prev Hash
-        cursor.execute("SELECT seq, current_hash FROM ledger_entries ORDER BY seq DESC LIMIT 1")
-        last_row = cursor.fetchone()
-        
-        if not last_row:
-            raise Exception("CRITICAL: Integrity Check Failed. No previous block found but Genesis check passed.")
-            
-        prev_hash = last_row[1]
-
-        # 2. Prepare Body
+        # 1. Prepare Body
         body_for_hash = {
-            "seq": last_row[0] + 1,
+            "seq": seq,
             "institution_id": self.institution_id,
             "block_type": block_type,
             "reporting_year": reporting_year,
@@ -132,34 +414,664 @@ class VelonautLedger:
             "reg_hash": None, # Null for internal/custody blocks
             "payload": payload
         }
-        
-        # 3. Hash
+
+        # 2. Hash
         block_hash = hashlib.sha256(self._canonical_json(body_for_hash)).hexdigest()
-        
-        # 4. Sign
+        ts = datetime.now(timezone.utc).isoformat()
+
+        return (
+            seq, self.institution_id, block_type, reporting_year, prev_hash, None,
+            _canonical_payload(payload), block_hash, None, ts, 1
+        )
+
+    @staticmethod
+    def _sign_row(row, signature):
+        return row[:8] + (signature.hex(),) + row[9:]
+
+    def _build_block(self, seq, prev_hash, block_type, payload, reporting_year, signer_func):
+        """Chains, hashes and signs (inline) a single block in memory."""
+        row = self._hash_block(seq, prev_hash, block_type, payload, reporting_year)
+        # 3. Sign
+        return self._sign_row(row, signer_func(row[7].encode('utf-8')))
+
+    def add_entry(self, block_type, payload, reporting_year, signer_func=None):
+        """
+        Core Write Method. Calculates Hash, PrevHash and Signature.
+        """
+        return self.add_entries([(block_type, payload, reporting_year)], signer_func)[0]
+
+    async def async_add_entry(self, block_type, payload, reporting_year, signer_func):
+        """
+        asyncio-friendly add_entry: returns the seq without blocking the event loop.
+        Concurrent calls are group-committed by the ledger's single writer thread
+        (LedgerWriteQueue, signer passed per entry); with a pipelined signer
+        (core.signer) the group's signatures run concurrently while later blocks
+        are hashed. Commit order is seq order. close() stops the writer.
+        """
         if not signer_func:
             raise ValueError("Cryptographic Signing Function Required")
-        
-        signature = signer_func(block_hash.encode('utf-8'))
-        signature_hex = signature.hex()
-        
-        # 5. Commit
-        ts = datetime.now(timezone.utc).isoformat()
-        
-        cursor.execute("""
-            INSERT INTO ledger_entries 
-            (institution_id, block_type, reporting_year, prev_hash, reg_hash, payload_json, current_hash, signature, timestamp_utc)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            self.institution_id, block_type, reporting_year, prev_hash, None,
-            json.dumps(payload), block_hash, signature_hex, ts
-        ))
-        return cursor.lastrowid
+        with self._write_lock:
+            if self._closed:
+                raise RuntimeError("Ledger is closed.")
+            if self._async_queue is None:
+                self._async_queue = LedgerWriteQueue(self)
+            write_queue = self._async_queue
+        return await asyncio.wrap_future(write_queue.submit(block_type, payload, reporting_year, signer_func))
+
+    def add_entries(self, batch, signer_func, _allow_reserved=False):
+        """
+        Bulk Write Method. Chains, hashes and signs N blocks in memory and
+        commits them in ONE transaction (one fsync per batch, not per block).
+
+        batch: iterable of (block_type, payload, reporting_year).
+        Returns the list of assigned seqs. Linking is identical to N separate
+        add_entry() calls; any failure rolls back the whole batch.
+        With checkpoint_interval set, CHECKPOINT blocks are interleaved at every
+        interval-th seq (their seqs are not part of the returned list).
+        RESERVED_BLOCK_TYPES are rejected (_allow_reserved: rotate_key only).
+        """
+        batch = list(batch)
+        if not batch:
+            return []
+
+        if not signer_func:
+            raise ValueError("Cryptographic Signing Function Required")
+
+        if not _allow_reserved:
+            for block_type, _, _ in batch:
+                if block_type in RESERVED_BLOCK_TYPES:
+                    raise ValueError(f"RESERVED_BLOCK_TYPE: {block_type} blocks are written by the ledger itself.")
+
+        with self._write_lock:
+            cursor = self.__conn.cursor()
+            # IMMEDIATE: Write-Lock VOR dem Lesen des Tips, damit keine andere
+            # Connection zwischen Lesen und Insert anhängen kann.
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                # 1. Get Prev Hash (cached tip, re-validated under the write lock)
+                tip = self._get_tip()
+
+                if not tip:
+                    raise Exception("Ledger not initialized. Genesis block missing.")
+
+                seq, prev_hash = tip
+                tip_seq = seq
+                mmr = self._mmr_open(cursor, tip_seq)
+
+                # 2. Chain, Hash & Sign in memory
+                rows, seqs = [], []
+                batch_counts, base_counts = {}, None
+
+                # Pipelined signer (core.signer): signatures resolve in the background
+                # while the following blocks are hashed and chained
+                pipelined = hasattr(signer_func, "submit")
+                signatures = []
+
+                def chain(block_type, payload, reporting_year):
+                    nonlocal seq, prev_hash
+                    seq += 1
+                    if pipelined:
+                        row = self._hash_block(seq, prev_hash, block_type, payload, reporting_year)
+                        signatures.append(signer_func.submit(row[7].encode('utf-8')))
+                    else:
+                        row = self._build_block(seq, prev_hash, block_type, payload, reporting_year, signer_func)
+                    rows.append(row)
+                    mmr.push(seq, row[7])
+                    batch_counts[block_type] = batch_counts.get(block_type, 0) + 1
+                    prev_hash = row[7]
+                    return seq
+
+                for block_type, payload, reporting_year in batch:
+                    # Auto-CHECKPOINT on every checkpoint_interval-th seq
+                    if self.checkpoint_interval and (seq + 1) % self.checkpoint_interval == 0:
+                        if base_counts is None:
+                            base_counts = self._block_counts_at(tip_seq)
+                        counts = dict(base_counts)
+                        for t, n in batch_counts.items():
+                            counts[t] = counts.get(t, 0) + n
+                        chain("CHECKPOINT", self._checkpoint_block_payload(seq, mmr, counts), 0)
+                    seqs.append(chain(block_type, payload, reporting_year))
+
+                if pipelined:
+                    # Strict order: each signature lands on its own seq, nothing
+                    # is written before every signature of the batch resolved
+                    rows = [self._sign_row(row, f.result()) for row, f in zip(rows, signatures)]
+
+                # Signer muss den AKTIVEN Key halten: nach einer KEY_ROTATION ist der
+                # alte Key retired (ein Signer pro Batch -> erste Signatur genügt)
+                first = rows[0]
+                try:
+                    self._verify_key(self.get_current_public_key()).verify(
+                        first[7].encode('utf-8'), bytes.fromhex(first[8])
+                    )
+                except nacl.exceptions.BadSignatureError:
+                    raise Exception(f"SIGNER_KEY_MISMATCH at SEQ {first[0]}: signature does not match the active key epoch.")
+
+                # 3. Commit (all-or-nothing, MMR nodes in the same transaction)
+                cursor.executemany(self._INSERT_SQL, rows)
+                self._mmr_flush(cursor, mmr)
+                cursor.execute("COMMIT")
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+
+            self._set_tip(seq, prev_hash)
+
+        return seqs
     
+    def close(self):
+        """
+        Stops the async writer (pending entries are still committed), then
+        closes segment readers and the connection. The instance is unusable after.
+        """
+        with self._write_lock:
+            if self._closed:
+                return
+            self._closed = True
+            write_queue, self._async_queue = self._async_queue, None
+        # Outside the lock: the writer thread needs it to commit what is pending
+        if write_queue is not None:
+            write_queue.close()
+        with self._write_lock:
+            for reader in self._segment_readers.values():
+                reader.close()
+            self._segment_readers.clear()
+            self.__conn.close()
+
     def get_genesis_public_key(self):
         """Returns the hex string of the Genesis Verification Key."""
         return self.__initial_verify_key_hex
 
+    # --- READ API ---
+    _ENTRY_FIELDS = (
+        "seq", "institution_id", "block_type", "reporting_year", "prev_hash",
+        "reg_hash", "payload_json", "current_hash", "signature", "timestamp_utc"
+    )
+    READ_PAGE_SIZE = 500
+
+    def _row_to_entry(self, r):
+        entry = dict(zip(self._ENTRY_FIELDS, r))
+        # Alias for UI/export code that addresses blocks by 'block_hash'
+        entry["block_hash"] = entry["current_hash"]
+        return entry
+
+    def get_entry(self, seq):
+        """Returns block `seq` as dict, or None. Primary-key lookup."""
+        with self._write_lock:
+            row = self.__conn.execute(self._ENTRY_SQL, (seq,)).fetchone()
+        return self._row_to_entry(self._hydrate([row])[0]) if row else None
+
+    def iter_entries(self, from_seq=1, to_seq=None, block_type=None):
+        """
+        Yields blocks with from_seq <= seq <= to_seq (to_seq=None: up to the tip),
+        optionally filtered by block_type, in seq order.
+        Keyset-paginated like _iter_pages - memory stays at READ_PAGE_SIZE rows.
+        """
+        sql = self._iter_entries_sql(block_type, to_seq)
+        next_seq = from_seq
+        while True:
+            params = [next_seq]
+            if block_type is not None:
+                params.append(block_type)
+            if to_seq is not None:
+                params.append(to_seq)
+            params.append(self.READ_PAGE_SIZE)
+
+            with self._write_lock:
+                page = self.__conn.execute(sql, params).fetchall()
+            for row in self._hydrate(page):
+                yield self._row_to_entry(row)
+            if len(page) < self.READ_PAGE_SIZE:
+                return
+            next_seq = page[-1][0] + 1
+
+    @staticmethod
+    def _iter_entries_sql(block_type=None, to_seq=None):
+        """Page query of iter_entries; params: from_seq[, block_type][, to_seq], limit."""
+        sql = "SELECT * FROM ledger_entries WHERE seq >= ?"
+        if block_type is not None:
+            sql += " AND block_type = ?"
+        if to_seq is not None:
+            sql += " AND seq <= ?"
+        return sql + " ORDER BY seq ASC LIMIT ?"
+
+    def get_all_entries(self):
+        """Full chain as list of dicts. Prefer iter_entries() for large ledgers."""
+        return list(self.iter_entries())
+
+    def get_latest_seq(self):
+        """Seq of the chain tip (0 if the ledger is empty)."""
+        tip = self._get_tip()
+        return tip[0] if tip else 0
+
+    def get_change_token(self):
+        """
+        Cheap cache key for views derived from this database file (UI caches):
+        changes with every own commit (tip seq) and every commit of another
+        connection, e.g. telemetry writes (PRAGMA data_version).
+        """
+        with self._write_lock:
+            data_version = self.__conn.execute("PRAGMA data_version").fetchone()[0]
+            tip = self._get_tip()
+        return (data_version, tip[0] if tip else 0)
+
+    def get_latest_hash(self):
+        """current_hash of the chain tip, or None if the ledger is empty."""
+        tip = self._get_tip()
+        return tip[1] if tip else None
+
+    # --- BINARY ARCHIVE EXPORT ---
+    def export_archive(self, path, from_seq=1, to_seq=None):
+        """
+        Streams blocks from_seq..to_seq into a VLA1 binary archive (core/archive.py),
+        page by page - the chain is never held in memory. The finished file is
+        re-opened via mmap and structurally checked; returns its stats.
+        """
+        with archive.ArchiveWriter(path, self.institution_id, self.__initial_verify_key_hex) as writer:
+            for page in self._iter_pages(from_seq - 1):
+                for row in page:
+                    if to_seq is not None and row[0] > to_seq:
+                        break
+                    writer.write_row(row)
+                if to_seq is not None and page[-1][0] >= to_seq:
+                    break
+        return archive.check_archive(path)
+
+    # --- COLD SEGMENTS ---
+    def compact_year(self, reporting_year):
+        """
+        Moves the payloads of a sealed reporting year (blocks before its
+        PERIOD_SEAL, excluding SEGMENT_HOT_TYPES) into segment_dir/<inst>_<year>.vla.
+        Each row is hash-checked before it is written and again after it is read
+        back from the segment; only then are the hot payloads dropped (one
+        transaction). Returns the segment record; idempotent per year.
+        """
+        existing = self.get_segment(reporting_year)
+        if existing:
+            return existing
+
+        # 1. Seal Gate: only periods closed by a PERIOD_SEAL block
+        with self._write_lock:
+            seal = self.__conn.execute(
+                "SELECT seq FROM ledger_entries WHERE block_type = 'PERIOD_SEAL' AND reporting_year = ? "
+                "ORDER BY seq ASC LIMIT 1", (reporting_year,)
+            ).fetchone()
+        if not seal:
+            raise Exception(f"SEGMENT_NOT_SEALED: reporting year {reporting_year} has no PERIOD_SEAL block")
+        seal_seq = seal[0]
+
+        select_sql = (
+            "SELECT * FROM ledger_entries WHERE reporting_year = ? AND seq > ? AND seq < ? "
+            "AND segment_offset IS NULL AND block_type NOT IN (%s) ORDER BY seq ASC LIMIT ?"
+            % ",".join("?" * len(SEGMENT_HOT_TYPES))
+        )
+
+        def eligible_pages():
+            after_seq = 0
+            while True:
+                with self._write_lock:
+                    page = self.__conn.execute(
+                        select_sql, (reporting_year, after_seq, seal_seq, *SEGMENT_HOT_TYPES, self.VERIFY_PAGE_SIZE)
+                    ).fetchall()
+                if not page:
+                    return
+                yield page
+                after_seq = page[-1][0]
+
+        # 2. Segment schreiben (sealed rows are immutable - lock only per page fetch)
+        os.makedirs(self.segment_dir, exist_ok=True)
+        path = os.path.join(self.segment_dir, f"{self.institution_id}_{reporting_year}.vla")
+        offsets = []
+        with archive.ArchiveWriter(path, self.institution_id, self.__initial_verify_key_hex, sparse=True) as writer:
+            for page in eligible_pages():
+                for r in page:
+                    _check_hash(r)
+                    offsets.append((writer.write_row(r), r[0], r[7]))
+        if not offsets:
+            os.remove(path)
+            raise Exception(f"SEGMENT_EMPTY: no payload blocks before the seal of {reporting_year}")
+        info = archive.check_archive(path)
+
+        # 3. Read-back: every record must rebuild its block hash from the segment alone
+        with archive.ArchiveReader(path) as reader:
+            for offset, seq, current_hash in offsets:
+                r = reader.read_row(offset)
+                if r[0] != seq or r[7] != current_hash:
+                    raise Exception(f"SEGMENT_MISMATCH at SEQ {seq}: read-back differs")
+                _check_hash(r)
+
+        # 4. Atomic switch: hot payloads out, segment registered
+        with self._write_lock:
+            cursor = self.__conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.executemany(
+                    "UPDATE ledger_entries SET payload_json = '', segment_offset = ? "
+                    "WHERE seq = ? AND current_hash = ? AND segment_offset IS NULL",
+                    offsets
+                )
+                if cursor.execute(
+                    "SELECT COUNT(*) FROM ledger_entries WHERE reporting_year = ? AND segment_offset IS NOT NULL",
+                    (reporting_year,)
+                ).fetchone()[0] != len(offsets):
+                    raise Exception(f"SEGMENT_RACE: reporting year {reporting_year} changed during compaction")
+                cursor.execute("""
+                    INSERT INTO ledger_segments
+                    (reporting_year, path, seal_seq, block_count, first_seq, last_seq, tip_hash, bytes, created_utc)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (reporting_year, path, seal_seq, info["record_count"], info["first_seq"], info["last_seq"],
+                      info["tip_hash"], info["bytes"], datetime.now(timezone.utc).isoformat()))
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+        return self.get_segment(reporting_year)
+
+    _SEGMENT_FIELDS = (
+        "reporting_year", "path", "seal_seq", "block_count", "first_seq",
+        "last_seq", "tip_hash", "bytes", "created_utc"
+    )
+
+    def get_segment(self, reporting_year):
+        with self._write_lock:
+            row = self.__conn.execute(
+                "SELECT * FROM ledger_segments WHERE reporting_year = ?", (reporting_year,)
+            ).fetchone()
+        return dict(zip(self._SEGMENT_FIELDS, row)) if row else None
+
+    def get_segments(self):
+        with self._write_lock:
+            rows = self.__conn.execute("SELECT * FROM ledger_segments ORDER BY reporting_year ASC").fetchall()
+        return [dict(zip(self._SEGMENT_FIELDS, r)) for r in rows]
+
+    def _segment_reader(self, reporting_year):
+        """mmap reader for a year's segment; footer must match the registered totals."""
+        reader = self._segment_readers.get(reporting_year)
+        if reader is None:
+            segment = self.get_segment(reporting_year)
+            if not segment:
+                raise Exception(f"SEGMENT_MISSING: no segment registered for {reporting_year}")
+            try:
+                reader = archive.ArchiveReader(segment["path"])
+            except (OSError, archive.ArchiveError) as e:
+                raise Exception(f"SEGMENT_MISSING: {segment['path']} ({e})")
+            footer = reader.footer
+            if (not reader.sparse or footer["record_count"] != segment["block_count"]
+                    or footer["tip_hash"] != segment["tip_hash"]):
+                reader.close()
+                raise Exception(f"SEGMENT_MISMATCH: {segment['path']} does not match the registered segment")
+            self._segment_readers[reporting_year] = reader
+        return reader
+
+    def _hydrate(self, rows):
+        """
+        Replaces compacted rows (segment_offset set) by their full form, payload
+        read from the segment via mmap. Rows without segment pass through as-is.
+        Hash and signature stay those of the hot row - a tampered segment fails
+        the regular hash check.
+        """
+        if all(r[11] is None for r in rows):
+            return rows
+        hydrated = []
+        for r in rows:
+            if r[11] is not None:
+                cold = self._segment_reader(r[3]).read_row(r[11])
+                if cold[0] != r[0]:
+                    raise Exception(f"SEGMENT_MISMATCH at SEQ {r[0]}: segment holds SEQ {cold[0]}")
+                r = r[:6] + (cold[6],) + r[7:10] + (1, r[11])
+            hydrated.append(r)
+        return hydrated
+
+    # --- MERKLE MOUNTAIN RANGE ---
+    def _mmr_node(self, height, idx):
+        with self._write_lock:
+            row = self.__conn.execute(
+                "SELECT hash FROM ledger_mmr_nodes WHERE height = ? AND idx = ?", (height, idx)
+            ).fetchone()
+        if row is None:
+            raise Exception(f"MMR_NODE_MISSING at height {height}, index {idx}")
+        return row[0]
+
+    def _mmr_leaf_count(self):
+        with self._write_lock:
+            row = self.__conn.execute(
+                "SELECT MAX(idx) FROM ledger_mmr_nodes WHERE height = 0"
+            ).fetchone()
+        return 0 if row[0] is None else row[0] + 1
+
+    def _mmr_open(self, cursor, prev_seq):
+        """
+        Inside an open write transaction: MMR append state positioned at prev_seq.
+        If the MMR lags behind the chain (blocks written by a pre-MMR writer),
+        the missing leaves are caught up from ledger_entries first.
+        """
+        leaf_count = self._mmr_leaf_count()
+        if leaf_count > prev_seq:
+            raise Exception(f"MMR_AHEAD at SEQ {prev_seq}: accumulator has {leaf_count} leaves")
+
+        mmr = merkle.MMRAppender(self._mmr_node, leaf_count)
+        if leaf_count < prev_seq:
+            missing = cursor.execute(
+                "SELECT seq, current_hash FROM ledger_entries WHERE seq > ? AND seq <= ? ORDER BY seq ASC",
+                (leaf_count, prev_seq)
+            ).fetchall()
+            for seq, block_hash in missing:
+                mmr.push(seq, block_hash)
+        return mmr
+
+    def _mmr_flush(self, cursor, mmr):
+        cursor.executemany(
+            "INSERT INTO ledger_mmr_nodes (height, idx, hash) VALUES (?, ?, ?)",
+            [(h, i, node) for (h, i), node in mmr.nodes.items()]
+        )
+
+    def _sync_mmr(self):
+        tip = self._get_tip()
+        if not tip or self._mmr_leaf_count() >= tip[0]:
+            return
+        with self._write_lock:
+            cursor = self.__conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                tip = self._get_tip()
+                self._mmr_flush(cursor, self._mmr_open(cursor, tip[0]))
+                cursor.execute("COMMIT")
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+
+    def get_mmr_root(self, leaf_count=None):
+        """MMR root over blocks 1..leaf_count (default: up to the tip)."""
+        leaf_count = self.get_latest_seq() if leaf_count is None else leaf_count
+        peaks = [self._mmr_node(h, j) for h, j in merkle.peak_positions(leaf_count)]
+        return {
+            "version": merkle.MMR_VERSION,
+            "leaf_count": leaf_count,
+            "root": merkle.bag_peaks(peaks, leaf_count).hex()
+        }
+
+    def get_signed_mmr_root(self, signer_func, leaf_count=None):
+        """
+        MMR root over blocks 1..leaf_count, signed by the key epoch active after
+        leaf_count (same rule as verification checkpoints). Certificates carry it
+        next to the inclusion proof: core.merkle.verify_signed_inclusion_proof.
+        """
+        if not signer_func:
+            raise ValueError("Cryptographic Signing Function Required")
+        root = self.get_mmr_root(leaf_count)
+        statement = merkle.root_statement(self.institution_id, root["leaf_count"], root["root"])
+        signature = signer_func(statement)
+
+        self._load_key_epochs()
+        key_hex = self._key_for_seq(root["leaf_count"] + 1)
+        try:
+            self._verify_key(key_hex).verify(statement, signature)
+        except nacl.exceptions.BadSignatureError:
+            raise Exception(f"SIGNER_KEY_MISMATCH at SEQ {root['leaf_count'] + 1}: root signature does not match the key epoch.")
+        return dict(root, institution_id=self.institution_id, public_key=key_hex, signature=signature.hex())
+
+    def get_inclusion_proof(self, seq, leaf_count=None):
+        """
+        O(log n) proof that block `seq` is part of the chain 1..leaf_count
+        (default: up to the tip). Check against get_signed_mmr_root() with
+        core.merkle.verify_signed_inclusion_proof.
+        """
+        leaf_count = self.get_latest_seq() if leaf_count is None else leaf_count
+        entry = self.get_entry(seq)
+        if entry is None:
+            raise ValueError(f"Block SEQ {seq} not found.")
+        return merkle.build_inclusion_proof(self._mmr_node, seq, entry["current_hash"], leaf_count)
+
+    # --- KEY EPOCHS ---
+    def rotate_key(self, signer_func, new_public_key_hex):
+        """
+        Writes a KEY_ROTATION block, signed by the CURRENT key, that certifies
+        new_public_key_hex. All blocks after it must be signed with the new key.
+        """
+        if not signer_func:
+            raise ValueError("Cryptographic Signing Function Required")
+
+        # Validates the hex encoding / key length before anything is written
+        nacl.signing.VerifyKey(new_public_key_hex, encoder=nacl.encoding.HexEncoder)
+
+        current_key_hex = self.get_current_public_key()
+        if new_public_key_hex == current_key_hex:
+            raise ValueError("KEY_ROTATION rejected: new key equals the active key.")
+
+        # Der Signer muss zum aktiven Key gehören, sonst bricht der Rotation-Block die Kette
+        probe = b"VELONAUT_KEY_ROTATION_PROBE"
+        try:
+            self._verify_key(current_key_hex).verify(probe, signer_func(probe))
+        except nacl.exceptions.BadSignatureError:
+            raise Exception("KEY_ROTATION rejected: signer does not hold the active key.")
+
+        payload = {
+            "previous_verify_key": current_key_hex,
+            "new_verify_key": new_public_key_hex,
+            "rotated_at_utc": datetime.now(timezone.utc).isoformat()
+        }
+        seq = self.add_entries([("KEY_ROTATION", payload, 0)], signer_func, _allow_reserved=True)[0]
+        self._load_key_epochs()
+        return seq
+
+    def get_current_public_key(self):
+        """Returns the hex key that must sign the next block."""
+        tip = self._get_tip()
+        self._load_key_epochs()
+        return self._key_for_seq((tip[0] if tip else 0) + 1)
+
+    def _load_key_epochs(self, reset=False):
+        """
+        Extends the precomputed epoch index with KEY_ROTATION blocks beyond the
+        last indexed rotation. Each rotation must name the key it replaces.
+        """
+        with self._write_lock:
+            if reset:
+                self._epoch_seqs = []
+                self._epoch_keys = [self.__initial_verify_key_hex]
+
+            last = self._epoch_seqs[-1] if self._epoch_seqs else 0
+            rows = self.__conn.execute(self._KEY_EPOCHS_SQL, (last,)).fetchall()
+            for seq, payload_json in rows:
+                payload = json.loads(payload_json)
+                if not isinstance(payload, dict) or payload.get("previous_verify_key") != self._epoch_keys[-1]:
+                    raise Exception(f"KEY_EPOCH_BROKEN at SEQ {seq}: previous_verify_key does not match the active key.")
+                try:
+                    self._verify_key(payload["new_verify_key"])
+                except (KeyError, TypeError, ValueError):
+                    raise Exception(f"KEY_EPOCH_BROKEN at SEQ {seq}: new_verify_key is not a valid key.")
+                self._epoch_seqs.append(seq)
+                self._epoch_keys.append(payload["new_verify_key"])
+
+    def _key_for_seq(self, seq):
+        """O(log n): the key epoch of a block. A KEY_ROTATION block itself is signed by the old key."""
+        return self._epoch_keys[bisect.bisect_left(self._epoch_seqs, seq)]
+
+    def _verify_key(self, key_hex):
+        v_key = self._verify_keys.get(key_hex)
+        if v_key is None:
+            v_key = nacl.signing.VerifyKey(key_hex, encoder=nacl.encoding.HexEncoder)
+            self._verify_keys[key_hex] = v_key
+        return v_key
+
+    def _split_by_epoch(self, page):
+        """Splits a page into consecutive (key_hex, rows) runs of the same key epoch."""
+        if any(r[2] == "KEY_ROTATION" and r[0] not in self._epoch_seqs for r in page):
+            self._load_key_epochs()
+        runs = []
+        for r in page:
+            key_hex = self._key_for_seq(r[0])
+            if runs and runs[-1][0] == key_hex:
+                runs[-1][1].append(r)
+            else:
+                runs.append((key_hex, [r]))
+        return runs
+
+    # --- CHECKPOINT BLOCKS ---
+    def _checkpoint_block_payload(self, upto_seq, mmr, counts):
+        """
+        Commits to the state of blocks 1..upto_seq: MMR root + peaks (so light
+        clients can keep extending the accumulator) and cumulative block counts.
+        """
+        return {
+            "upto_seq": upto_seq,
+            "mmr_version": merkle.MMR_VERSION,
+            "mmr_root": mmr.root().hex(),
+            "mmr_peaks": [p.hex() for p in mmr.peaks()],
+            "block_counts": counts,
+            "checkpoint_interval": self.checkpoint_interval
+        }
+
+    def get_latest_checkpoint_block(self, upto_seq=None):
+        """Newest CHECKPOINT block (at or below upto_seq) as entry dict, or None."""
+        sql = "SELECT * FROM ledger_entries WHERE block_type = 'CHECKPOINT'"
+        params = ()
+        if upto_seq is not None:
+            sql += " AND seq <= ?"
+            params = (upto_seq,)
+        with self._write_lock:
+            row = self.__conn.execute(sql + " ORDER BY seq DESC LIMIT 1", params).fetchone()
+        return self._row_to_entry(row) if row else None
+
+    def _block_counts_at(self, upto_seq):
+        """Cumulative block counts per block_type for seq 1..upto_seq."""
+        counts, after_seq = {}, 0
+        checkpoint = self.get_latest_checkpoint_block(upto_seq)
+        if checkpoint:
+            counts = dict(json.loads(checkpoint["payload_json"])["block_counts"])
+            after_seq = checkpoint["seq"] - 1
+        with self._write_lock:
+            rows = self.__conn.execute(
+                "SELECT block_type, COUNT(*) FROM ledger_entries WHERE seq > ? AND seq <= ? GROUP BY block_type",
+                (after_seq, upto_seq)
+            ).fetchall()
+        for block_type, n in rows:
+            counts[block_type] = counts.get(block_type, 0) + n
+        return counts
+
+    def _check_checkpoint_block(self, r, mmr, counts):
+        """CHECKPOINT payload must match the replayed MMR and block counts (mmr at seq - 1)."""
+        payload = json.loads(r[6])
+        if not isinstance(payload, dict) or not all(
+                k in payload for k in ("upto_seq", "mmr_root", "mmr_peaks", "block_counts")):
+            raise Exception(f"CHECKPOINT_INVALID at SEQ {r[0]}: malformed payload")
+        upto_seq = payload["upto_seq"]
+        if upto_seq != r[0] - 1 or mmr.leaf_count != upto_seq:
+            raise Exception(f"CHECKPOINT_INVALID at SEQ {r[0]}: covers up to {upto_seq}")
+
+        if (payload["mmr_peaks"] != [p.hex() for p in mmr.peaks()]
+                or payload["mmr_root"] != mmr.root().hex()):
+            raise Exception(f"CHECKPOINT_MMR_MISMATCH at SEQ {r[0]}")
+
+        if counts != payload["block_counts"]:
+            raise Exception(f"CHECKPOINT_COUNT_MISMATCH at SEQ {r[0]}")
+
+    def _check_mmr_nodes(self, mmr, known):
+        """Stored MMR nodes created by this page must equal the replayed ones."""
+        for (height, idx), node in mmr.nodes.items():
+            if (height, idx) not in known and self._mmr_node(height, idx) != node:
+                raise Exception(f"MMR_MISMATCH at SEQ {(idx + 1) << height}: node ({height}, {idx})")
+
     # --- MODULE 10 INTERFACE ---
     def add_portfolio_event(self, block_type, payload_dict, signer_func):
         """
@@ -177,53 +1089,255 @@ class VelonautLedger:
         )
 
     # --- AUDIT CORE ---
-    def verify_integrity(self):
+    def verify_integrity(self, full=False, signer_func=None, progress_callback=None, workers=None):
         """
-        Re-calculates the entire chain from Genesis to Now.
         Verifies Hashes, Links (PrevHash), and Signatures.
+
+        Default (incremental): starts at the newest verification anchor (signed
+        checkpoint or this instance's last successful run), re-verifies that
+        anchor block and replays only the blocks appended since.
+        full=True: re-calculates the entire chain from Genesis to Now (auditor mode).
+        signer_func: if given, a new signed checkpoint is persisted on success.
+        progress_callback: called after every page as
+            progress_callback(blocks_verified, last_seq, elapsed_seconds).
+        workers: > 1 enables parallel mode. The PrevHash chain is still walked
+            sequentially; hash recompute and signature checks fan out to a
+            process pool. Reports the same first failing SEQ and error as serial.
+        CHECKPOINT blocks in range are checked against the MMR and the
+        replayed cumulative block counts.
+
+        Rows are streamed in pages of VERIFY_PAGE_SIZE, so memory stays flat
+        regardless of chain length.
         """
-        cursor = self.__conn.cursor()
-        cursor.execute("SELECT * FROM ledger_entries ORDER BY seq ASC")
-        rows = cursor.fetchall()
-        
-        if not rows:
+        # Key Epoch Index (auditor mode rebuilds it from scratch)
+        self._load_key_epochs(reset=full)
+
+        # Genesis Anchor Expectation
+        anchor_seq, expected_prev_hash = 0, "0" * 64
+        if not full:
+            anchor = self._resolve_verification_anchor()
+            if anchor:
+                anchor_seq, expected_prev_hash = anchor
+
+        pool = ProcessPoolExecutor(max_workers=workers) if workers and workers > 1 else None
+        started = time.perf_counter()
+        verified = 0
+        last_seq = anchor_seq
+        # Block counts since the anchor; turned cumulative at the first CHECKPOINT
+        counts, tail_counts = None, {}
+        # MMR replay starts from the stored peaks at the anchor (empty in auditor mode)
+        mmr = merkle.MMRAppender(self._mmr_node, anchor_seq)
+        try:
+            for page in self._iter_pages(anchor_seq):
+                runs = self._split_by_epoch(page)
+                if pool:
+                    self._verify_page_parallel(pool, workers, runs, expected_prev_hash)
+                else:
+                    prev_hash = expected_prev_hash
+                    for key_hex, rows in runs:
+                        failure = _check_rows(rows, key_hex, prev_hash)
+                        if failure:
+                            raise failure[2]
+                        prev_hash = rows[-1][7]
+                
+                # Derived state: MMR rebuilt alongside the chain, CHECKPOINT blocks
+                # against MMR root + cumulative counts (counts seeded lazily)
+                mmr.compact()
+                known = set(mmr.nodes)
+                for r in page:
+                    if r[2] == "CHECKPOINT":
+                        if counts is None:
+                            counts = self._block_counts_at(anchor_seq)
+                            for t, n in tail_counts.items():
+                                counts[t] = counts.get(t, 0) + n
+                            tail_counts = counts
+                        self._check_checkpoint_block(r, mmr, tail_counts)
+                    mmr.push(r[0], r[7])
+                    tail_counts[r[2]] = tail_counts.get(r[2], 0) + 1
+                self._check_mmr_nodes(mmr, known)
+
+                # Advance
+                expected_prev_hash = page[-1][7]
+                last_seq = page[-1][0]
+                verified += len(page)
+                if progress_callback:
+                    progress_callback(verified, last_seq, time.perf_counter() - started)
+        finally:
+            if pool:
+                pool.shutdown()
+
+        if last_seq == 0:
             return True # Empty is valid state (pre-genesis)
+
+        self._verified = (last_seq, expected_prev_hash)
+        if signer_func:
+            self._write_checkpoint(last_seq, expected_prev_hash, signer_func)
             
-        # Genesis Anchor Expectation
-        expected_prev_hash = "0" * 64
+        return True
+
+    VERIFY_PAGE_SIZE = 2000
+
+    def _iter_pages(self, after_seq=0, page_size=None):
+        """
+        Streams ledger_entries in seq order as fixed-size pages (keyset
+        pagination on the seq primary key). Each page is a separate short
+        query, so no read transaction is held across the whole replay.
+        """
+        page_size = page_size or self.VERIFY_PAGE_SIZE
+        while True:
+            with self._write_lock:
+                page = self.__conn.execute(
+                    "SELECT * FROM ledger_entries WHERE seq > ? ORDER BY seq ASC LIMIT ?",
+                    (after_seq, page_size)
+                ).fetchall()
+            if not page:
+                return
+            yield self._hydrate(page)
+            if len(page) < page_size:
+                return
+            after_seq = page[-1][0]
+
+    def _verify_row(self, r, expected_prev_hash, v_key):
+        """Hash, chain link and signature check for a single ledger_entries row."""
+        # 1. Verify Hash
+        _check_hash(r)
         
-        # In RC1, we assume the initial key is valid for the whole chain.
-        # Production TODO: Logic to switch `current_v_key` on 'KEY_ROTATION' block type.
-        current_v_key = self.__initial_verify_key 
+        # 2. Verify Chain Link
+        if expected_prev_hash is not None:
+            _check_link(r, expected_prev_hash)
         
-        for r in rows:
-            # Columns: 0:seq, 1:inst_id, 2:type, 3:year, 4:prev, 5:reg, 6:payload, 7:curr, 8:sig, 9:ts
-            body = {
-                "seq": r[0], 
-                "institution_id": r[1], 
-                "block_type": r[2],
-                "reporting_year": r[3], 
-                "prev_hash": r[4], 
-                "reg_hash": r[5],
-                "payload": json.loads(r[6])
-            }
-            
-            # 1. Verify Hash
-            recalc_hash = hashlib.sha256(self._canonical_json(body)).hexdigest()
-            if recalc_hash != r[7]:
-                raise Exception(f"HASH_MISMATCH at SEQ {r[0]}")
-            
-            # 2. Verify Chain Link
-            if r[4] != expected_prev_hash:
-                raise Exception(f"CHAIN_BREAK at SEQ {r[0]}: PrevHash mismatch. Expected {expected_prev_hash[:8]}... Got {r[4][:8]}...")
-            
-            # 3. Verify Signature
+        # 3. Verify Signature
+        _check_signature(r, v_key)
+
+    def _verify_page_parallel(self, pool, workers, runs, expected_prev_hash):
+        """
+        Parallel page check. Links are walked here (cheap, sequential), hash and
+        signature checks run in the pool. The earliest (seq, stage) failure wins,
+        which is exactly the failure the serial loop would raise first.
+        """
+        failures = []
+        for r in (r for _, rows in runs for r in rows):
             try:
-                current_v_key.verify(r[7].encode('utf-8'), bytes.fromhex(r[8]))
-            except nacl.exceptions.BadSignatureError:
-                raise Exception(f"INVALID_SIGNATURE at SEQ {r[0]}")
-            
-            # Advance
+                _check_link(r, expected_prev_hash)
+            except Exception as e:
+                failures.append((r[0], STAGE_LINK, e))
+                break
             expected_prev_hash = r[7]
-            
-        return True
\ No newline at end of file
+
+        keys, chunks = [], []
+        for key_hex, rows in runs:
+            chunk_size = max(1, -(-len(rows) // workers))
+            for i in range(0, len(rows), chunk_size):
+                keys.append(key_hex)
+                chunks.append(rows[i:i + chunk_size])
+        for result in pool.map(_verify_chunk, keys, chunks):
+            if result:
+                failures.append(result)
+
+        if failures:
+            raise min(failures, key=lambda f: (f[0], f[1]))[2]
+
+    # --- VERIFICATION CHECKPOINTS ---
+    def _checkpoint_hash(self, verified_seq, verified_hash, verified_at_utc):
+        body = {
+            "institution_id": self.institution_id,
+            "verified_seq": verified_seq,
+            "verified_hash": verified_hash,
+            "verified_at_utc": verified_at_utc
+        }
+        return hashlib.sha256(self._canonical_json(body)).hexdigest()
+
+    def _write_checkpoint(self, verified_seq, verified_hash, signer_func):
+        """
+        Persists a signed (seq, hash) verification checkpoint. Skipped (latest
+        checkpoint returned) if signer_func does not hold the key epoch the
+        checkpoint is verified against (_key_for_seq(verified_seq + 1)).
+        """
+        latest = self.get_latest_checkpoint()
+        if latest and latest["verified_seq"] >= verified_seq:
+            return latest
+
+        ts = datetime.now(timezone.utc).isoformat()
+        checkpoint_hash = self._checkpoint_hash(verified_seq, verified_hash, ts)
+        signature = signer_func(checkpoint_hash.encode('utf-8'))
+
+        # Gleiche Regel wie SIGNER_KEY_MISMATCH in add_entries: ein Checkpoint mit
+        # retired Key würde jeden späteren inkrementellen Start blockieren
+        self._load_key_epochs()
+        try:
+            self._verify_key(self._key_for_seq(verified_seq + 1)).verify(
+                checkpoint_hash.encode('utf-8'), signature
+            )
+        except nacl.exceptions.BadSignatureError:
+            return latest
+        signature_hex = signature.hex()
+
+        with self._write_lock:
+            self.__conn.execute("""
+                INSERT INTO ledger_checkpoints
+                (verified_seq, verified_hash, verified_at_utc, checkpoint_hash, signature)
+                VALUES (?, ?, ?, ?, ?)
+            """, (verified_seq, verified_hash, ts, checkpoint_hash, signature_hex))
+        return self.get_latest_checkpoint()
+
+    def get_latest_checkpoint(self):
+        """Returns the newest verification checkpoint as dict, or None."""
+        with self._write_lock:
+            row = self.__conn.execute("""
+                SELECT verified_seq, verified_hash, verified_at_utc, checkpoint_hash, signature
+                FROM ledger_checkpoints ORDER BY verified_seq DESC, checkpoint_id DESC LIMIT 1
+            """).fetchone()
+        if not row:
+            return None
+        return {
+            "verified_seq": row[0],
+            "verified_hash": row[1],
+            "verified_at_utc": row[2],
+            "checkpoint_hash": row[3],
+            "signature": row[4]
+        }
+
+    def get_trusted_anchor(self):
+        """
+        Fast startup check: the newest verification anchor (signed checkpoint or
+        this instance's last run), confirmed via checkpoint signature and the
+        anchor block itself - O(1) in chain length. Blocks after it are NOT
+        verified yet. Returns {"seq", "hash"} or None (no anchor yet).
+        """
+        self._load_key_epochs()
+        anchor = self._resolve_verification_anchor()
+        return {"seq": anchor[0], "hash": anchor[1]} if anchor else None
+
+    def _resolve_verification_anchor(self):
+        """
+        Picks the newest trusted (seq, hash) anchor and confirms it cheaply:
+        checkpoint signature + the anchor block's own hash and signature.
+        Returns None if no anchor exists (full replay from Genesis).
+        """
+        anchor = self._verified
+        checkpoint = self.get_latest_checkpoint()
+
+        if checkpoint and (not anchor or checkpoint["verified_seq"] > anchor[0]):
+            recalc = self._checkpoint_hash(
+                checkpoint["verified_seq"], checkpoint["verified_hash"], checkpoint["verified_at_utc"]
+            )
+            if recalc != checkpoint["checkpoint_hash"]:
+                raise Exception(f"CHECKPOINT_TAMPERED at SEQ {checkpoint['verified_seq']}")
+            # Checkpoints are signed by the key active AFTER the verified block
+            v_key = self._verify_key(self._key_for_seq(checkpoint["verified_seq"] + 1))
+            try:
+                v_key.verify(recalc.encode('utf-8'), bytes.fromhex(checkpoint["signature"]))
+            except nacl.exceptions.BadSignatureError:
+                raise Exception(f"INVALID_CHECKPOINT_SIGNATURE at SEQ {checkpoint['verified_seq']}")
+            anchor = (checkpoint["verified_seq"], checkpoint["verified_hash"])
+
+        if not anchor:
+            return None
+
+        with self._write_lock:
+            row = self.__conn.execute(self._ENTRY_SQL, (anchor[0],)).fetchone()
+        if not row or row[7] != anchor[1]:
+            raise Exception(f"CHECKPOINT_ANCHOR_MISMATCH at SEQ {anchor[0]}")
+        row = self._hydrate([row])[0]
+        self._verify_row(row, None, self._verify_key(self._key_for_seq(anchor[0])))
+        return anchor
@@ -0,0 +1,82 @@
+import os
+import threading
+from core.ledger import VelonautLedger
+from core.background_verify import BackgroundVerifier
+
+
+class LedgerRegistry:
+    """
+    Process-wide registry: one VelonautLedger (one SQLite connection, one write
+    lock) and one BackgroundVerifier per database file, shared by all sessions.
+
+    All in-process writers of a ledger go through the same instance, so its
+    write lock serializes them; other processes are serialized by SQLite
+    (BEGIN IMMEDIATE). In the Streamlit app the registry itself is held via
+    st.cache_resource.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ledgers = {}
+        self._verifiers = {}
+
+    @staticmethod
+    def _key(db_path):
+        return os.path.abspath(db_path)
+
+    def get_ledger(self, institution_id, db_path, public_key_hex, genesis_signer=None, **options):
+        """
+        Shared ledger for db_path (created on first use; options are passed to
+        VelonautLedger). genesis_signer: mints Genesis if the ledger is empty -
+        exactly once per process, even with concurrent first sessions.
+        """
+        key = self._key(db_path)
+        with self._lock:
+            ledger = self._ledgers.get(key)
+            if ledger is None:
+                ledger = VelonautLedger(institution_id, db_path, public_key_hex, **options)
+                self._ledgers[key] = ledger
+            else:
+                conflicts = self._conflicts(ledger, institution_id, db_path, public_key_hex, options)
+                if conflicts:
+                    raise ValueError(
+                        f"LEDGER_REGISTRY_CONFLICT: {db_path} is already open for "
+                        f"{ledger.institution_id} with a different {', '.join(conflicts)}"
+                    )
+            if genesis_signer and not ledger.is_initialized():
+                ledger.initialize_genesis(genesis_signer)
+            return ledger
+
+    @staticmethod
+    def _conflicts(ledger, institution_id, db_path, public_key_hex, options):
+        """Settings of the shared instance that differ from this request (VelonautLedger defaults applied)."""
+        segment_dir = options.get("segment_dir") or os.path.join(os.path.dirname(db_path), "segments")
+        requested = {
+            "institution": (ledger.institution_id, institution_id),
+            "genesis key": (ledger.get_genesis_public_key(), public_key_hex),
+            "durability": (ledger.durability, options.get("durability", "forensic")),
+            "checkpoint_interval": (ledger.checkpoint_interval, options.get("checkpoint_interval")),
+            "segment_dir": (os.path.abspath(ledger.segment_dir), os.path.abspath(segment_dir)),
+        }
+        return [name for name, (current, wanted) in requested.items() if current != wanted]
+
+    def get_verifier(self, ledger, signer_func=None, full=True):
+        """
+        Shared background verification for a registered ledger. The first call
+        starts the replay; later sessions read the same status (one replay per
+        chain and process, not per session).
+        """
+        key = self._key(ledger.db_path)
+        with self._lock:
+            if self._ledgers.get(key) is not ledger:
+                raise ValueError(f"LEDGER_NOT_REGISTERED: {ledger.db_path}")
+            verifier = self._verifiers.get(key)
+            if verifier is None:
+                verifier = BackgroundVerifier(ledger, signer_func=signer_func)
+                verifier.start(full=full)
+                self._verifiers[key] = verifier
+            return verifier
+
+    def ledgers(self):
+        with self._lock:
+            return dict(self._ledgers)
@@ -0,0 +1,212 @@
+import hashlib
+import json
+import nacl.signing
+import nacl.encoding
+import nacl.exceptions
+
+# Merkle Mountain Range over ledger blocks.
+#
+# Leaf i (0-based) commits to block seq = i + 1. A node (height h, index j)
+# covers leaves [j * 2^h, (j + 1) * 2^h). Nodes are append-only: once written
+# they never change, so every historic root stays reproducible from the table.
+#
+# Domain separation: 0x00 leaf, 0x01 inner node, 0x02 root (binds leaf_count).
+# This module is self-contained (hashlib + PyNaCl) - banks can verify inclusion
+# proofs without the ledger or its database: verify_signed_inclusion_proof()
+# checks the proof against a root signed by the ledger's key epoch
+# (VelonautLedger.get_signed_mmr_root). A bare proof only shows self-consistency.
+
+MMR_VERSION = "MMR-SHA256-v1"
+
+def leaf_hash(seq, block_hash_hex):
+    return hashlib.sha256(b"\x00" + seq.to_bytes(8, "big") + bytes.fromhex(block_hash_hex)).digest()
+
+def node_hash(left, right):
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+def peak_positions(leaf_count):
+    """(height, index) of every peak for a range of leaf_count leaves, left to right."""
+    peaks, offset = [], 0
+    for height in range(leaf_count.bit_length() - 1, -1, -1):
+        if leaf_count & (1 << height):
+            peaks.append((height, offset >> height))
+            offset += 1 << height
+    return peaks
+
+def bag_peaks(peaks, leaf_count):
+    """Root over the peak hashes (left to right), bound to leaf_count."""
+    if not peaks:
+        return hashlib.sha256(b"\x02" + (0).to_bytes(8, "big")).digest()
+    bag = peaks[-1]
+    for peak in reversed(peaks[:-1]):
+        bag = node_hash(peak, bag)
+    return hashlib.sha256(b"\x02" + leaf_count.to_bytes(8, "big") + bag).digest()
+
+def append_leaves(get_node, leaf_count, leaves):
+    """
+    Appends leaves [(seq, block_hash_hex), ...] to an MMR of leaf_count leaves.
+    get_node(height, index) -> bytes must return existing peaks.
+    Returns the new nodes [(height, index, hash_bytes), ...] - O(log n) per leaf.
+    """
+    created = {}
+    def lookup(height, index):
+        node = created.get((height, index))
+        return node if node is not None else get_node(height, index)
+
+    for seq, block_hash_hex in leaves:
+        if seq != leaf_count + 1:
+            raise ValueError(f"MMR_GAP: leaf seq {seq} does not follow leaf_count {leaf_count}")
+        height, index = 0, leaf_count
+        node = leaf_hash(seq, block_hash_hex)
+        created[(height, index)] = node
+        # Carry: merge with the left sibling while this node is a right child
+        while index & 1:
+            node = node_hash(lookup(height, index - 1), node)
+            height, index = height + 1, index >> 1
+            created[(height, index)] = node
+        leaf_count += 1
+
+    return [(h, i, node) for (h, i), node in created.items()]
+
+class MMRAppender:
+    """
+    In-memory append state on top of an MMR of leaf_count leaves. Only the
+    current peaks are read through get_node; new nodes collect in .nodes.
+    """
+
+    def __init__(self, get_node, leaf_count):
+        self._get_node = get_node
+        self.leaf_count = leaf_count
+        self.nodes = {}
+
+    @classmethod
+    def from_peaks(cls, peaks_hex, leaf_count):
+        """Resumes from a trusted peak list (e.g. a CHECKPOINT payload)."""
+        positions = peak_positions(leaf_count)
+        if len(peaks_hex) != len(positions):
+            raise ValueError(f"MMR_PEAKS_INVALID: {len(peaks_hex)} peaks for leaf_count {leaf_count}")
+        known = {pos: bytes.fromhex(p) for pos, p in zip(positions, peaks_hex)}
+        return cls(lambda height, index: known[(height, index)], leaf_count)
+
+    def _lookup(self, height, index):
+        node = self.nodes.get((height, index))
+        return node if node is not None else self._get_node(height, index)
+
+    def push(self, seq, block_hash_hex):
+        for height, index, node in append_leaves(self._lookup, self.leaf_count, [(seq, block_hash_hex)]):
+            self.nodes[(height, index)] = node
+        self.leaf_count += 1
+
+    def peaks(self):
+        return [self._lookup(h, j) for h, j in peak_positions(self.leaf_count)]
+
+    def compact(self):
+        """Drops every collected node except the current peaks (all that later appends read)."""
+        self.nodes = {pos: self._lookup(*pos) for pos in peak_positions(self.leaf_count)}
+
+    def root(self):
+        return bag_peaks(self.peaks(), self.leaf_count)
+
+def build_inclusion_proof(get_node, seq, block_hash_hex, leaf_count):
+    """Inclusion proof of block `seq` in the MMR of the first leaf_count blocks."""
+    if not 1 <= seq <= leaf_count:
+        raise ValueError(f"MMR_OUT_OF_RANGE: seq {seq} not in 1..{leaf_count}")
+
+    leaf_index = seq - 1
+    peaks = peak_positions(leaf_count)
+    peak_index = next(
+        k for k, (h, j) in enumerate(peaks) if j == leaf_index >> h
+    )
+    path = [
+        get_node(height, (leaf_index >> height) ^ 1).hex()
+        for height in range(peaks[peak_index][0])
+    ]
+    peak_hashes = [get_node(h, j) for h, j in peaks]
+
+    return {
+        "version": MMR_VERSION,
+        "seq": seq,
+        "block_hash": block_hash_hex,
+        "leaf_count": leaf_count,
+        "path": path,
+        "peaks": [p.hex() for p in peak_hashes],
+        "root": bag_peaks(peak_hashes, leaf_count).hex()
+    }
+
+def root_statement(institution_id, leaf_count, root_hex):
+    """The bytes a ledger key signs to vouch for an MMR root."""
+    return json.dumps({
+        "institution_id": institution_id,
+        "version": MMR_VERSION,
+        "leaf_count": leaf_count,
+        "root": root_hex
+    }, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+def verify_signed_root(signed_root, trusted_public_key_hex=None):
+    """
+    Checks the root signature with signed_root["public_key"]. With
+    trusted_public_key_hex (published by the institution) that key must match.
+    Returns True/False.
+    """
+    try:
+        if signed_root.get("version") != MMR_VERSION:
+            return False
+        if trusted_public_key_hex is not None and signed_root["public_key"] != trusted_public_key_hex:
+            return False
+        v_key = nacl.signing.VerifyKey(signed_root["public_key"], encoder=nacl.encoding.HexEncoder)
+        v_key.verify(
+            root_statement(signed_root["institution_id"], int(signed_root["leaf_count"]), signed_root["root"]),
+            bytes.fromhex(signed_root["signature"])
+        )
+        return True
+    except (KeyError, TypeError, ValueError, AttributeError, nacl.exceptions.BadSignatureError):
+        return False
+
+def verify_signed_inclusion_proof(proof, signed_root, trusted_public_key_hex=None):
+    """Inclusion proof against a signed root of the same leaf_count. Returns True/False."""
+    try:
+        if int(proof["leaf_count"]) != int(signed_root["leaf_count"]):
+            return False
+    except (KeyError, TypeError, ValueError):
+        return False
+    return (verify_signed_root(signed_root, trusted_public_key_hex)
+            and verify_inclusion_proof(proof, expected_root=signed_root["root"]))
+
+def verify_inclusion_proof(proof, expected_root=None):
+    """
+    Recomputes the peak from leaf + path, re-bags all peaks and compares with
+    the proof root (and expected_root, if given). Without a trusted
+    expected_root this only shows the proof is self-consistent - use
+    verify_signed_inclusion_proof for certificates. Returns True/False.
+    """
+    try:
+        seq, leaf_count = int(proof["seq"]), int(proof["leaf_count"])
+        if proof.get("version") != MMR_VERSION or not 1 <= seq <= leaf_count:
+            return False
+
+        leaf_index = seq - 1
+        positions = peak_positions(leaf_count)
+        peak_index = next(k for k, (h, j) in enumerate(positions) if j == leaf_index >> h)
+        height = positions[peak_index][0]
+        if len(proof["path"]) != height or len(proof["peaks"]) != len(positions):
+            return False
+
+        # Side of each sibling follows from the leaf index - never from the proof
+        node = leaf_hash(seq, proof["block_hash"])
+        for level, sibling_hex in enumerate(proof["path"]):
+            sibling = bytes.fromhex(sibling_hex)
+            if (leaf_index >> level) & 1:
+                node = node_hash(sibling, node)
+            else:
+                node = node_hash(node, sibling)
+
+        peaks = [bytes.fromhex(p) for p in proof["peaks"]]
+        if peaks[peak_index] != node:
+            return False
+
+        root = bag_peaks(peaks, leaf_count).hex()
+        if root != proof["root"]:
+            return False
+        return expected_root is None or root == expected_root
+    except (KeyError, TypeError, ValueError, StopIteration):
+        return False
@@ -30,6 +30,11 @@ class EnergyEvent:
     state: State = State.RAW
     created_at: datetime = field(default_factory=datetime.utcnow)
 
+    @property
+    def emissions_tonnes(self) -> float:
+        # gCO2e/MJ * MJ -> t (Basis für ETSEngine.calculate_cost)
+        return self.energy_mj * self.ghg_intensity / 1_000_000
+
 @dataclass
 class Vessel:
     id: str
@@ -0,0 +1,86 @@
+from dataclasses import dataclass
+from typing import List
+import numpy as np
+from core.models import StrategyMode
+from core.fleet_arrays import FleetArrays
+from core.engine_vector import VectorFuelEUEngine, VectorETSEngine
+from core.additionality import AdditionalityEngine
+from core.config import DEFAULT_EUA_PRICE
+
+# Batch-Szenarien: Jahre x StrategyMode x EUA-Preise in EINER vektorisierten
+# Berechnung (FuelEU-Bilanz -> Additionality-Puffer -> Marktwert / ETS-Kosten).
+# Flotten-Summen werden einmal pro Engine gebildet, nicht pro Szenario-Punkt.
+
+
+@dataclass
+class ScenarioCube:
+    """
+    Dichter Ergebnis-Würfel. Achsen: years (Y), modes (M), eua_prices (P).
+    market_value_eur folgt der App-Logik: nur bei positiver Bilanz (Überschuss)
+    hat das Asset einen Wert, sonst 0.
+    """
+    years: np.ndarray
+    modes: List[StrategyMode]
+    eua_prices: np.ndarray
+    fleet_intensity: float
+    target_intensity: np.ndarray     # (Y)    gCO2e/MJ
+    compliance_balance_t: np.ndarray  # (Y)    tCO2e
+    risk_buffer_t: np.ndarray         # (Y, M) tCO2e
+    net_surplus_t: np.ndarray         # (Y, M) tCO2e
+    market_value_eur: np.ndarray      # (Y, M, P)
+    ets_cost_eur: np.ndarray          # (Y, P)
+    net_position_eur: np.ndarray      # (Y, M, P) Marktwert - ETS-Kosten
+
+    @property
+    def shape(self):
+        return len(self.years), len(self.modes), len(self.eua_prices)
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape))
+
+    def at(self, year: int, mode: StrategyMode, eua_price: float) -> dict:
+        """Einzelner Szenario-Punkt (Werte wie die Einzel-Engines)."""
+        y = int(np.flatnonzero(self.years == year)[0])
+        m = self.modes.index(mode)
+        p = int(np.flatnonzero(self.eua_prices == eua_price)[0])
+        return {
+            "year": year, "mode": mode, "eua_price": eua_price,
+            "compliance_balance_t": float(self.compliance_balance_t[y]),
+            "net_surplus_t": float(self.net_surplus_t[y, m]),
+            "market_value_eur": float(self.market_value_eur[y, m, p]),
+            "ets_cost_eur": float(self.ets_cost_eur[y, p]),
+            "net_position_eur": float(self.net_position_eur[y, m, p]),
+        }
+
+
+def evaluate_scenarios(arrays: FleetArrays, years, modes=None, eua_prices=(DEFAULT_EUA_PRICE,), mask=None) -> ScenarioCube:
+    """
+    Wertet das volle Gitter years x modes x eua_prices für eine Flotte aus.
+    modes: Default alle StrategyModes. mask: optionale Event-Maske (FleetArrays.state_mask).
+    """
+    years = np.atleast_1d(np.asarray(years, dtype=np.int64))
+    modes = list(StrategyMode) if modes is None else list(modes)
+    prices = np.atleast_1d(np.asarray(eua_prices, dtype=np.float64))
+
+    fueleu = VectorFuelEUEngine(years)
+    balance = fueleu.get_compliance_balance(arrays, mask)                          # (Y)
+    _, risk_buffer, net = AdditionalityEngine.calculate_surplus_batch(balance, modes)  # (Y, M)
+
+    tradable = np.where(balance > 0, 1.0, 0.0)[:, None, None]
+    market_value = tradable * net[:, :, None] * prices[None, None, :]               # (Y, M, P)
+    ets_cost = VectorETSEngine(years).calculate_costs(arrays, prices, mask)         # (Y, P)
+
+    return ScenarioCube(
+        years=years,
+        modes=modes,
+        eua_prices=prices,
+        fleet_intensity=fueleu.calculate_fleet_intensity(arrays, mask),
+        target_intensity=fueleu.targets,
+        compliance_balance_t=balance,
+        risk_buffer_t=risk_buffer,
+        net_surplus_t=net,
+        market_value_eur=market_value,
+        ets_cost_eur=ets_cost,
+        net_position_eur=market_value - ets_cost[:, None, :]
+    )
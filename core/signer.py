@@ -0,0 +1,65 @@
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Signer(ABC):
+    """
+    Signing backend for ledger writes. Instances are drop-in signer_funcs
+    (signer(message) -> signature bytes); submit(message) -> Future lets
+    add_entries() hash and chain later blocks while earlier ones are signed.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def submit(self, message):
+        """Starts signing message, returns a Future of the signature bytes."""
+
+    def __call__(self, message):
+        return self.submit(message).result()
+
+    def close(self):
+        pass
+
+
+class ThreadPoolSigner(Signer):
+    """Runs a plain signer_func in a thread pool (PyNaCl releases the GIL while signing)."""
+
+    name = "thread-pool"
+
+    def __init__(self, signer_func, max_workers=4):
+        self._sign = signer_func
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ledger-signer")
+
+    def submit(self, message):
+        return self._pool.submit(self._sign, message)
+
+    def close(self):
+        self._pool.shutdown()
+
+
+class RemoteSignerStub(ThreadPoolSigner):
+    """
+    Stand-in for an HSM / Vault signer: fixed round-trip latency per signature,
+    many requests in flight. Signs locally after the simulated round trip.
+    """
+
+    name = "remote-stub"
+
+    def __init__(self, signer_func, latency=0.005, max_workers=16):
+        super().__init__(signer_func, max_workers=max_workers)
+        self.latency = latency
+
+    def submit(self, message):
+        return self._pool.submit(self._remote_sign, message)
+
+    def _remote_sign(self, message):
+        time.sleep(self.latency)
+        return self._sign(message)
+
+
+SIGNER_BACKENDS = {
+    ThreadPoolSigner.name: ThreadPoolSigner,
+    RemoteSignerStub.name: RemoteSignerStub,
+}
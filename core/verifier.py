@@ -0,0 +1,31 @@
+import nacl.signing
+import nacl.encoding
+import nacl.exceptions
+
+# Signatur-Check für Ledger-Replay und Archiv-Verifikation: ein PyNaCl verify()
+# pro Block. (Batch-Verifikation über eigene Curve-Arithmetik war langsamer als
+# libsodium single verify und wurde verworfen.)
+
+_VERIFY_KEYS = {}
+
+
+def _verify_key(verify_key_hex):
+    v_key = _VERIFY_KEYS.get(verify_key_hex)
+    if v_key is None:
+        v_key = nacl.signing.VerifyKey(verify_key_hex, encoder=nacl.encoding.HexEncoder)
+        _VERIFY_KEYS[verify_key_hex] = v_key
+    return v_key
+
+
+def first_invalid_signature(verify_key_hex, items):
+    """
+    items: list of (seq, message_bytes, signature_bytes), in seq order.
+    Returns the seq of the first invalid signature, or None.
+    """
+    v_key = _verify_key(verify_key_hex)
+    for seq, message, signature in items:
+        try:
+            v_key.verify(message, signature)
+        except nacl.exceptions.BadSignatureError:
+            return seq
+    return None
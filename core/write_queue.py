@@ -0,0 +1,103 @@
+import queue
+import threading
+from concurrent.futures import Future
+
+
+class LedgerWriteQueue:
+    """
+    Single-writer group commit for one VelonautLedger.
+
+    Any number of threads submit (block_type, payload, reporting_year) and get a
+    Future back. One writer thread drains everything pending and appends it via
+    add_entries() - one BEGIN IMMEDIATE, one chain walk, one fsync per group.
+    The future resolves to the assigned seq once the group is committed.
+
+    A failing group is retried entry by entry, so one bad payload only fails
+    its own future.
+
+    signer_func is the default signer; submit() may pass its own per entry.
+    Consecutive entries with the same signer share one add_entries() call, so
+    one queue (one writer thread) serves every signer of the ledger.
+    """
+
+    _STOP = object()
+
+    def __init__(self, ledger, signer_func=None, max_batch=500):
+        self.ledger = ledger
+        self.signer_func = signer_func
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._writer = threading.Thread(target=self._run, name="ledger-writer", daemon=True)
+        self._writer.start()
+
+    def submit(self, block_type, payload, reporting_year, signer_func=None):
+        signer_func = signer_func or self.signer_func
+        if not signer_func:
+            raise ValueError("Cryptographic Signing Function Required")
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("LedgerWriteQueue is closed.")
+            self._queue.put(((block_type, payload, reporting_year), signer_func, future))
+        return future
+
+    def close(self, wait=True):
+        """Stops accepting entries; pending entries are still committed."""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(self._STOP)
+        if wait:
+            self._writer.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # --- WRITER THREAD ---
+
+    def _run(self):
+        stop = False
+        while not stop:
+            group = [self._queue.get()]
+            # Group Commit: everything that queued up while the last fsync ran
+            while len(group) < self.max_batch:
+                try:
+                    group.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if self._STOP in group:
+                stop = True
+                group = [item for item in group if item is not self._STOP]
+
+            # Consecutive runs of the same signer, in submit order (= seq order)
+            runs = []
+            for entry, signer_func, future in group:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                if runs and runs[-1][0] is signer_func:
+                    runs[-1][1].append((entry, future))
+                else:
+                    runs.append((signer_func, [(entry, future)]))
+            for signer_func, pending in runs:
+                self._commit(pending, signer_func)
+
+    def _commit(self, pending, signer_func):
+        try:
+            seqs = self.ledger.add_entries([entry for entry, _ in pending], signer_func)
+        except BaseException as e:
+            if len(pending) == 1:
+                pending[0][1].set_exception(e)
+                return
+            # Whole group rolled back - isolate the failing entry
+            for item in pending:
+                self._commit([item], signer_func)
+            return
+
+        for (_, future), seq in zip(pending, seqs):
+            future.set_result(seq)
@@ -3,69 +3,220 @@ import json
 import hashlib
 import nacl.signing
 import nacl.encoding
+import nacl.exceptions
 import os
+import sys
+import time
+from core import merkle
+from core import archive
 
 # --- CONFIG ---
 DB_PATH = "data/velonaut_main.sqlite"
 KEY_PATH = "data/velonaut_signing.key"
+GENESIS_KEY_PATH = "data/velonaut_genesis.pub"
+PAGE_SIZE = 2000
 
-def verify_ledger():
-    print(f"--- Velonaut Public Verifier v0.1 ---")
-    
-    # 1. Key-Handling: Wir lesen den 'Salat' ein und extrahieren den Public Key
+def iter_rows(cursor, after_seq=0):
+    """Streamt die Blöcke seitenweise (fetchmany) statt fetchall()."""
+    cursor.execute("SELECT * FROM ledger_entries WHERE seq > ? ORDER BY seq ASC", (after_seq,))
+    while True:
+        page = cursor.fetchmany(PAGE_SIZE)
+        if not page:
+            return
+        yield from page
+
+def hydrate(conn, r, readers):
+    """Ausgelagerte Blöcke (segment_offset gesetzt): Payload aus dem Cold Segment des Jahres (mmap)."""
+    if len(r) < 12 or r[11] is None:
+        return r
+    reader = readers.get(r[3])
+    if reader is None:
+        segment = conn.execute("SELECT path FROM ledger_segments WHERE reporting_year = ?", (r[3],)).fetchone()
+        if not segment:
+            raise Exception(f"SEGMENT MISSING bei SEQ {r[0]}")
+        reader = readers[r[3]] = archive.ArchiveReader(segment[0])
+    cold = reader.read_row(r[11])
+    if cold[0] != r[0]:
+        raise Exception(f"SEGMENT MISMATCH bei SEQ {r[0]}")
+    # Hash + Signatur bleiben die der Hot-Zeile, nur der Payload kommt aus dem Segment
+    return r[:6] + (cold[6],) + r[7:]
+
+def check_block(r, verify_key):
+    """Hash + Signatur eines Blocks. Liefert eine Fehlermeldung oder None."""
+    # Body rekonstruieren (exakt wie im Ledger)
+    body = {
+        "seq": r[0], "institution_id": r[1], "block_type": r[2],
+        "reporting_year": r[3], "prev_hash": r[4], "reg_hash": r[5],
+        "payload": json.loads(r[6])
+    }
+
+    # Determinismus sicherstellen (Canonical JSON)
+    canonical = json.dumps(body, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+    # A. Hash-Check
+    recalc_hash = hashlib.sha256(canonical).hexdigest()
+    if recalc_hash != r[7]:
+        return f"HASH ERROR bei SEQ {r[0]}"
+
+    # B. Signatur-Check (signiert wird der Hex-Hash, exakt wie im Ledger)
+    try:
+        verify_key.verify(r[7].encode('utf-8'), bytes.fromhex(r[8]))
+    except (nacl.exceptions.BadSignatureError, ValueError):
+        return f"SIGNATURE ERROR bei SEQ {r[0]}"
+    return None
+
+def check_checkpoint(r, mmr, counts):
+    """CHECKPOINT-Block gegen den nachgerechneten MMR-Stand und die Blockzähler."""
+    payload = json.loads(r[6])
+    if payload.get("upto_seq") != r[0] - 1 or mmr.leaf_count != r[0] - 1:
+        return f"CHECKPOINT INVALID bei SEQ {r[0]}"
+    if payload.get("mmr_root") != mmr.root().hex():
+        return f"CHECKPOINT MMR MISMATCH bei SEQ {r[0]}"
+    if payload.get("block_counts") != counts:
+        return f"CHECKPOINT COUNT MISMATCH bei SEQ {r[0]}"
+    return None
+
+def load_public_key():
+    # Key-Handling: Nach einer Key-Rotation ist der Genesis-Anker in
+    # GENESIS_KEY_PATH abgelegt, sonst lesen wir den 'Salat' aus KEY_PATH
+    if os.path.exists(GENESIS_KEY_PATH):
+        with open(GENESIS_KEY_PATH, "r") as f:
+            return f.read().strip()
     if not os.path.exists(KEY_PATH):
         print(f"❌ Fehler: {KEY_PATH} nicht gefunden.")
-        return
-        
+        return None
     with open(KEY_PATH, "rb") as f:
         signing_key = nacl.signing.SigningKey(f.read())
-        verify_key = signing_key.verify_key
-        public_key_hex = verify_key.encode(nacl.encoding.HexEncoder).decode()
-        print(f"Verwende Public Key: {public_key_hex[:16]}...")
+        return signing_key.verify_key.encode(nacl.encoding.HexEncoder).decode()
+
+def resolve_checkpoint(cursor, public_key_hex, trusted_hash=None):
+    """
+    Light-Client Start: lädt den neuesten (oder den vertrauenswürdigen) CHECKPOINT-Block,
+    leitet den dort gültigen Key über die KEY_ROTATION-Blöcke davor ab und prüft ihn.
+    Liefert (row, public_key_hex) oder (None, Fehlermeldung).
+    """
+    if trusted_hash:
+        cursor.execute(
+            "SELECT * FROM ledger_entries WHERE block_type = 'CHECKPOINT' AND current_hash = ?",
+            (trusted_hash,)
+        )
+    else:
+        cursor.execute("SELECT * FROM ledger_entries WHERE block_type = 'CHECKPOINT' ORDER BY seq DESC LIMIT 1")
+    checkpoint = cursor.fetchone()
+    if not checkpoint:
+        return None, "Kein (vertrauenswürdiger) CHECKPOINT-Block gefunden."
+
+    # Key-Epochen bis zum Checkpoint: nur die Rotationsblöcke selbst werden geprüft
+    cursor.execute(
+        "SELECT * FROM ledger_entries WHERE block_type = 'KEY_ROTATION' AND seq < ? ORDER BY seq ASC",
+        (checkpoint[0],)
+    )
+    rotations = cursor.fetchall()
+    for r in rotations:
+        error = check_block(r, nacl.signing.VerifyKey(public_key_hex, encoder=nacl.encoding.HexEncoder))
+        rotation = json.loads(r[6])
+        if error or rotation.get("previous_verify_key") != public_key_hex:
+            return None, error or f"KEY EPOCH BREAK bei SEQ {r[0]}"
+        public_key_hex = rotation["new_verify_key"]
+
+    # Der Checkpoint bestätigt die Anzahl der Rotationen (keine versteckte Epoche)
+    payload = json.loads(checkpoint[6])
+    if payload.get("block_counts", {}).get("KEY_ROTATION", 0) != len(rotations):
+        return None, f"KEY EPOCH BREAK bei SEQ {checkpoint[0]}: Rotationen fehlen"
+
+    error = check_block(checkpoint, nacl.signing.VerifyKey(public_key_hex, encoder=nacl.encoding.HexEncoder))
+    if error:
+        return None, error
+    return checkpoint, public_key_hex
+
+def verify_ledger(from_checkpoint=False, trusted_hash=None):
+    print(f"--- Velonaut Public Verifier v0.2 ---")
+
+    # 1. Genesis-Anker
+    public_key_hex = load_public_key()
+    if not public_key_hex:
+        return
+    print(f"Verwende Genesis Public Key: {public_key_hex[:16]}...")
 
     # 2. Datenbank-Verbindung
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
-    
+
     try:
-        cursor.execute("SELECT * FROM ledger_entries ORDER BY seq ASC")
-        rows = cursor.fetchall()
         expected_prev_hash = "0" * 64
-        
-        print(f"Prüfe {len(rows)} Blöcke...")
-        
-        for r in rows:
-            # Body rekonstruieren (exakt wie im Ledger)
-            body = {
-                "seq": r[0], "institution_id": r[1], "block_type": r[2],
-                "reporting_year": r[3], "prev_hash": r[4], "reg_hash": r[5],
-                "payload": json.loads(r[6])
-            }
-            
-            # Determinismus sicherstellen (Canonical JSON)
-            canonical = json.dumps(body, sort_keys=True, separators=(',', ':')).encode('utf-8')
-            
-            # A. Hash-Check
-            recalc_hash = hashlib.sha256(canonical).hexdigest()
-            if recalc_hash != r[7]:
-                print(f"❌ HASH ERROR bei SEQ {r[0]}")
+        after_seq = 0
+        mmr = merkle.MMRAppender(None, 0)
+        counts = {}
+        segment_readers = {}
+
+        # 3. Light-Client: Start am signierten CHECKPOINT, nur der Rest wird nachgespielt
+        if from_checkpoint:
+            checkpoint, result = resolve_checkpoint(cursor, public_key_hex, trusted_hash)
+            if not checkpoint:
+                print(f"❌ {result}")
                 return
+            public_key_hex = result
+            payload = json.loads(checkpoint[6])
+            mmr = merkle.MMRAppender.from_peaks(payload["mmr_peaks"], payload["upto_seq"])
+            if mmr.root().hex() != payload["mmr_root"]:
+                print(f"❌ CHECKPOINT MMR MISMATCH bei SEQ {checkpoint[0]}")
+                return
+            mmr.push(checkpoint[0], checkpoint[7])
+            counts = dict(payload["block_counts"])
+            counts["CHECKPOINT"] = counts.get("CHECKPOINT", 0) + 1
+            expected_prev_hash = checkpoint[7]
+            after_seq = checkpoint[0]
+            print(f"  [CP] Start ab CHECKPOINT SEQ {after_seq} ({checkpoint[7][:16]}...)")
+
+        verify_key = nacl.signing.VerifyKey(public_key_hex, encoder=nacl.encoding.HexEncoder)
+        count = 0
+        started = time.perf_counter()
 
-            # B. Signatur-Check
-            try:
-                verify_key.verify(hashlib.sha256(canonical).digest(), bytes.fromhex(r[8]))
-            except:
-                print(f"❌ SIGNATURE ERROR bei SEQ {r[0]}")
+        print(f"Prüfe Blöcke (Streaming, Seitengröße {PAGE_SIZE})...")
+
+        for r in iter_rows(cursor, after_seq):
+            r = hydrate(conn, r, segment_readers)
+
+            # A + B. Hash & Signatur
+            error = check_block(r, verify_key)
+            if error:
+                print(f"❌ {error}")
                 return
 
             # C. Chain-Check
             if r[4] != expected_prev_hash:
                 print(f"❌ CHAIN BREAK bei SEQ {r[0]}")
                 return
-            
+
+            # D. Key Epoch: ab dem nächsten Block gilt der rotierte Key
+            if r[2] == "KEY_ROTATION":
+                rotation = json.loads(r[6])
+                if rotation.get("previous_verify_key") != public_key_hex:
+                    print(f"❌ KEY EPOCH BREAK bei SEQ {r[0]}")
+                    return
+                public_key_hex = rotation["new_verify_key"]
+                verify_key = nacl.signing.VerifyKey(public_key_hex, encoder=nacl.encoding.HexEncoder)
+                print(f"  [KEY] Rotation bei SEQ {r[0]} -> {public_key_hex[:16]}...")
+
+            # E. CHECKPOINT: MMR-Root und kumulierte Blockzähler
+            if r[2] == "CHECKPOINT":
+                error = check_checkpoint(r, mmr, counts)
+                if error:
+                    print(f"❌ {error}")
+                    return
+            mmr.push(r[0], r[7])
+            counts[r[2]] = counts.get(r[2], 0) + 1
+
             expected_prev_hash = r[7]
-            print(f"  [OK] Block {r[0]} ({r[2]})")
+            count += 1
+            if count % PAGE_SIZE == 0:
+                mmr.compact()
+                elapsed = time.perf_counter() - started
+                print(f"  [OK] {count} Blöcke bis SEQ {r[0]} ({count / elapsed:.0f} Blöcke/Sekunde)")
 
+        elapsed = time.perf_counter() - started
+        print(f"  [OK] {count} Blöcke geprüft in {elapsed:.2f} Sekunden.")
+        print(f"  [OK] MMR Root bei SEQ {mmr.leaf_count}: {mmr.root().hex()}")
         print(f"--- ✅ INTEGRITÄT GARANTIERT ---")
 
     except Exception as e:
@@ -73,5 +224,58 @@ def verify_ledger():
     finally:
         conn.close()
 
+def verify_archive_file(path, public_key_hex=None):
+    """
+    Offline-Modus für Auditoren: prüft ein exportiertes VLA1-Archiv direkt per mmap,
+    ohne Betreiber-Datenbank (Hash, Kette, Signatur, Key-Epochen, CHECKPOINTs).
+    """
+    print(f"--- Velonaut Public Verifier v0.2 (Archiv) ---")
+
+    # 1. Genesis-Anker: explizit übergeben > lokale Key-Datei > Archiv-Header (nur mit Warnung)
+    with archive.ArchiveReader(path) as reader:
+        header_key_hex = reader.genesis_key_hex
+        print(f"Archiv: {path} ({reader.institution_id}, {reader.footer['record_count']} Blöcke, "
+              f"SEQ {reader.footer['first_seq']}-{reader.footer['last_seq']})")
+    if not public_key_hex and (os.path.exists(GENESIS_KEY_PATH) or os.path.exists(KEY_PATH)):
+        public_key_hex = load_public_key()
+    if not public_key_hex:
+        public_key_hex = header_key_hex
+        print("  [!] Genesis Key aus dem Archiv-Header - nicht unabhängig verankert.")
+    elif public_key_hex != header_key_hex:
+        print(f"❌ GENESIS KEY MISMATCH: Archiv wurde für {header_key_hex[:16]}... exportiert")
+        return False
+    print(f"Verwende Genesis Public Key: {public_key_hex[:16]}...")
+
+    # 2. Replay auf dem Mapping, Fortschritt pro Seite
+    def progress(stats):
+        print(f"  [OK] {stats['record_count']} Blöcke bis SEQ {stats['last_seq']} "
+              f"({stats['blocks_per_second']:.0f} Blöcke/Sekunde, {stats['mib_per_second']:.1f} MiB/s)")
+
+    print(f"Prüfe Blöcke (mmap, Seitengröße {PAGE_SIZE})...")
+    try:
+        stats = archive.verify_archive(path, public_key_hex, page_size=PAGE_SIZE, progress=progress)
+    except Exception as e:
+        print(f"❌ {e}")
+        return False
+
+    print(f"  [OK] {stats['record_count']} Blöcke geprüft in {stats['seconds']:.2f} Sekunden "
+          f"({stats['blocks_per_second']:.0f} Blöcke/Sekunde, {stats['bytes'] / 2**20:.1f} MiB).")
+    if stats["mmr_root"]:
+        print(f"  [OK] MMR Root bei SEQ {stats['last_seq']}: {stats['mmr_root']}")
+    else:
+        print(f"  [!] Teilarchiv ab SEQ {stats['first_seq']}: CHECKPOINT/MMR-Prüfung übersprungen.")
+    print(f"  [OK] Tip Hash: {stats['tip_hash']}")
+    print(f"--- ✅ INTEGRITÄT GARANTIERT ---")
+    return True
+
 if __name__ == "__main__":
-    verify_ledger()
\ No newline at end of file
+    # Aufruf: python verify_ledger.py [--from-checkpoint [VERTRAUTER_CHECKPOINT_HASH]]
+    #         python verify_ledger.py --archive <export.vla> [GENESIS_PUBLIC_KEY_HEX]
+    args = sys.argv[1:]
+    if args and args[0] == "--from-checkpoint":
+        verify_ledger(from_checkpoint=True, trusted_hash=args[1] if len(args) > 1 else None)
+    elif len(args) > 1 and args[0] == "--archive":
+        ok = verify_archive_file(args[1], args[2] if len(args) > 2 else None)
+        sys.exit(0 if ok else 1)
+    else:
+        verify_ledger()
\ No newline at end of file
@@ -0,0 +1,46 @@
+import sys
+import json
+from core.merkle import verify_signed_root, verify_signed_inclusion_proof
+
+# Prüft den Merkle-Inklusionsbeweis eines Zertifikats (JSON-Zwilling) ohne Datenbank.
+# Aufruf: python verify_proof.py <zertifikat.json> <vertrauenswürdiger_public_key>
+# Der Beweis muss zum signierten MMR Root des Zertifikats passen, und der Root muss vom
+# veröffentlichten Key der Institution signiert sein - ein Key aus dem Dokument selbst
+# beweist nichts (ein Fälscher signiert mit seinem eigenen).
+
+def extract_proof(document):
+    """JSON-Zwilling: (ledger_proof.inclusion_proof, ledger_proof.signed_root)."""
+    ledger_proof = document.get("ledger_proof") or {}
+    return ledger_proof.get("inclusion_proof"), ledger_proof.get("signed_root")
+
+def verify_proof(path, trusted_public_key):
+    print(f"--- Velonaut Proof Verifier v0.2 ---")
+    with open(path, "r") as f:
+        proof, signed_root = extract_proof(json.load(f))
+
+    if not proof:
+        print("❌ Kein Inklusionsbeweis im Dokument gefunden.")
+        return False
+    if not signed_root:
+        print("❌ Kein signierter MMR Root im Dokument - Beweis nicht prüfbar.")
+        return False
+
+    if not verify_signed_root(signed_root, trusted_public_key):
+        print("❌ ROOT-SIGNATUR UNGÜLTIG (oder Key nicht der vertrauenswürdige Key)")
+        return False
+    print(f"  [OK] MMR Root {signed_root['root'][:16]}... signiert von {signed_root['public_key']}")
+
+    if not verify_signed_inclusion_proof(proof, signed_root, trusted_public_key):
+        print(f"❌ BEWEIS UNGÜLTIG für SEQ {proof.get('seq')}")
+        return False
+
+    print(f"  [OK] Block {proof['block_hash'][:16]}... ist SEQ {proof['seq']} von {proof['leaf_count']}")
+    print(f"--- ✅ INKLUSION BEWIESEN ---")
+    return True
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Aufruf: python verify_proof.py <zertifikat.json> <vertrauenswürdiger_public_key>")
+        sys.exit(2)
+    ok = verify_proof(sys.argv[1], sys.argv[2])
+    sys.exit(0 if ok else 1)